@@ -0,0 +1,4 @@
+"""Benchmarks of the CLI, creators, operations, transformations and summarizer.
+
+Run them with `python -m benchmarks`; the results are written to JSON.
+"""
@@ -0,0 +1,78 @@
+import argparse
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from benchmarks import bench_cli, bench_creators, bench_operations, bench_summarizer, bench_transformations  # noqa: F401
+from benchmarks.compare import compare_app
+from benchmarks.harness import DEFAULT_REPEAT, DEFAULT_WARMUP, Result, get_benchmarks, run, write_results
+
+DEFAULT_OUTPUT_PATH = Path("benchmarks/results/latest.json")
+
+console = Console()
+
+
+def format_memory(peak_memory: int | None) -> str:
+    if peak_memory is None:
+        return "-"
+
+    return f"{peak_memory / 1024:,.0f} KiB"
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+
+    # The benchmarks only take options, so a first argument of "compare" is always the command
+    if argv[:1] == ["compare"]:
+        compare_app(args=argv, prog_name="python -m benchmarks")
+
+        return
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the django-new benchmarks.")
+    parser.add_argument("-k", "--filter", help="Only run the benchmarks whose name matches this regular expression.")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT_PATH, help="Where to write the results.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="How many samples to take.")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="How many untimed runs to do first.")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks without running them.")
+
+    args = parser.parse_args(argv)
+    benchmarks = get_benchmarks(args.filter)
+
+    if args.list:
+        for benchmark in benchmarks:
+            console.print(escape(benchmark.name))
+
+        return
+
+    table = Table()
+    table.add_column("Benchmark", overflow="fold", min_width=30)
+    table.add_column("Median", justify="right", no_wrap=True)
+    table.add_column("p95", justify="right", no_wrap=True)
+    table.add_column("Peak memory", justify="right", no_wrap=True)
+    table.add_column("Parses")
+
+    def add_row(result: Result) -> None:
+        parses = ", ".join(f"{name} {count}" for name, count in result.parse_counts.items() if count)
+
+        table.add_row(
+            escape(result.name),
+            f"{result.median * 1000:.2f}ms",
+            f"{result.p95 * 1000:.2f}ms",
+            format_memory(result.peak_memory),
+            parses or "-",
+        )
+
+    with console.status("Running benchmarks...", spinner="dots"):
+        results = run(benchmarks, repeat=args.repeat, warmup=args.warmup, on_result=add_row)
+
+    write_results(results, args.output)
+
+    console.print(table)
+    console.print(f"Results written to [blue]{args.output}[/blue]")
+
+
+if __name__ == "__main__":
+    main()
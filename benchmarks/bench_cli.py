@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from benchmarks.harness import benchmark
+
+# Runs the command in a fresh interpreter, like the `django-new` script does
+CLI_MODULE = "django_new.cli"
+
+
+def run_cli(*args: str) -> None:
+    subprocess.run(  # noqa: S603
+        [sys.executable, "-m", CLI_MODULE, *args],
+        capture_output=True,
+        check=True,
+    )
+
+
+@benchmark("cli", profile=False, repeat=10)
+def version(timer):
+    with timer:
+        run_cli("--version")
+
+
+@benchmark("cli", profile=False, repeat=10)
+def help(timer):  # noqa: A001
+    with timer:
+        run_cli("--help")
@@ -0,0 +1,54 @@
+import contextlib
+import io
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+from benchmarks.harness import benchmark
+from django_new.creators.app import ApiAppCreator, AppCreator, DataAppCreator, WebAppCreator, WorkerAppCreator
+from django_new.creators.project import ClassicProjectCreator, MinimalProjectCreator
+
+# Every kind of app, by the name of its default app
+APP_CREATORS = {
+    "app": AppCreator,
+    "api": ApiAppCreator,
+    "data": DataAppCreator,
+    "web": WebAppCreator,
+    "worker": WorkerAppCreator,
+}
+
+
+@contextlib.contextmanager
+def quiet_folder() -> Iterator[Path]:
+    """A temporary folder to create a project in, without printing what gets created."""
+
+    with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+        yield Path(folder)
+
+
+@contextlib.contextmanager
+def classic_project() -> Iterator[Path]:
+    """A classic project to create an app in."""
+
+    with quiet_folder() as folder:
+        ClassicProjectCreator(folder=folder).create(display_name="project")
+
+        yield folder
+
+
+@benchmark("creators")
+def classic(timer):
+    with quiet_folder() as folder, timer:
+        ClassicProjectCreator(folder=folder).create(display_name="project")
+
+
+@benchmark("creators")
+def minimal(timer):
+    with quiet_folder() as folder, timer:
+        MinimalProjectCreator(name="project", folder=folder).create()
+
+
+@benchmark("creators", params=tuple(APP_CREATORS))
+def app(timer, app_name):
+    with classic_project() as folder, timer:
+        APP_CREATORS[app_name](app_name=app_name, folder=folder).create()
@@ -0,0 +1,86 @@
+import functools
+from collections.abc import Callable
+
+from benchmarks.generators import LINE_COUNTS, generate_pyproject, generate_settings
+from benchmarks.harness import Timer, benchmark
+from django_new.transformer.operations import Operation, python, toml
+
+# Each Python operation, with arguments that apply to the generated settings
+PYTHON_OPERATIONS: dict[str, Callable[[], Operation]] = {
+    "append_to_list": lambda: python.AppendToList(name="INSTALLED_APPS", value='"whitenoise.runserver_nostatic"'),
+    "remove_from_list": lambda: python.RemoveFromList(name="INSTALLED_APPS", value='"django.contrib.admin"'),
+    "assign_variable": lambda: python.AssignVariable(name="DEBUG", value=False),
+    "remove_variable": lambda: python.RemoveVariable(name="STATIC_URL"),
+    "merge_dict": lambda: python.MergeDict(
+        name="STORAGES",
+        value={"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}},
+    ),
+    "unmerge_dict": lambda: python.UnmergeDict(
+        name="STORAGES",
+        value={"default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}},
+    ),
+}
+
+# Each TOML operation, with arguments that apply to the generated `pyproject.toml`
+TOML_OPERATIONS: dict[str, Callable[[], Operation]] = {
+    "add_key_value": lambda: toml.AddKeyValue(name="project", key="description", value="Example"),
+    "remove_key": lambda: toml.RemoveKey(table_path="project", key="requires-python"),
+    "append_to_list": lambda: toml.AppendToList(name="project.dependencies", value="whitenoise"),
+    "remove_from_list": lambda: toml.RemoveFromList(name="project.dependencies", value="django-environ"),
+    "add_dependency": lambda: toml.AddDependency("whitenoise==6.6.0"),
+    "upgrade_dependency": lambda: toml.UpgradeDependency("django>=5.2"),
+    "remove_dependency": lambda: toml.RemoveDependency("django-environ"),
+}
+
+# TOML operations that are applied together in one session; each one applies after the ones before it
+SESSION_OPERATION_NAMES = ("add_key_value", "remove_key", "add_dependency", "upgrade_dependency", "remove_dependency")
+
+
+def apply_operation(
+    get_content: Callable[[int], str], get_operation: Callable[[], Operation], timer: Timer, line_count: int
+) -> None:
+    content = get_content(line_count)
+    operation = get_operation()
+
+    with timer:
+        operation.apply(content)
+
+
+for operation_name, get_operation in PYTHON_OPERATIONS.items():
+    benchmark("operations.python", name=operation_name, params=LINE_COUNTS)(
+        functools.partial(apply_operation, generate_settings, get_operation)
+    )
+
+for operation_name, get_operation in TOML_OPERATIONS.items():
+    benchmark("operations.toml", name=operation_name, params=LINE_COUNTS)(
+        functools.partial(apply_operation, generate_pyproject, get_operation)
+    )
+
+
+@benchmark("operations.python", name="get_variable", params=LINE_COUNTS)
+def get_python_variable(timer, line_count):
+    content = generate_settings(line_count)
+
+    with timer:
+        python.GetVariable(name="MIDDLEWARE").get_value(content)
+
+
+@benchmark("operations.toml", name="get_variable", params=LINE_COUNTS)
+def get_toml_variable(timer, line_count):
+    content = generate_pyproject(line_count)
+
+    with timer:
+        toml.GetVariable(name="project.dependencies").get_value(content)
+
+
+@benchmark("operations.toml", params=LINE_COUNTS)
+def session(timer, line_count):
+    content = generate_pyproject(line_count)
+
+    with timer:
+        toml_session = toml.TomlSession(content)
+
+        for operation_name in SESSION_OPERATION_NAMES:
+            toml_session.apply(TOML_OPERATIONS[operation_name]())
+
+        toml_session.dumps()
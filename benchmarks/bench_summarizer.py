@@ -0,0 +1,45 @@
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.generators import FILE_COUNTS, write_tree
+from benchmarks.harness import benchmark
+from django_new.summarizer import Summarizer
+from django_new.walker import build_tree, build_tree_from_paths, render_plain
+
+# How many earlier summaries the project has when `summary.html` gets written
+SUMMARY_COUNTS = (10, 100)
+
+
+@benchmark("summarizer", params=FILE_COUNTS)
+def build_tree_walk(timer, file_count):
+    with tempfile.TemporaryDirectory() as folder:
+        write_tree(Path(folder), file_count)
+
+        with timer:
+            render_plain(build_tree(Path(folder)))
+
+
+@benchmark("summarizer", params=FILE_COUNTS)
+def build_tree_manifest(timer, file_count):
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_tree(Path(folder), file_count)
+
+        with timer:
+            render_plain(build_tree_from_paths(Path(folder), paths))
+
+
+@benchmark("summarizer", params=SUMMARY_COUNTS)
+def write_summary_html(timer, summary_count):
+    with tempfile.TemporaryDirectory() as folder:
+        md_dir = Path(folder) / "django_new" / "md"
+        md_dir.mkdir(parents=True)
+
+        for idx in range(summary_count):
+            name = f"2025-01-01T00:{idx // 60:02d}:{idx % 60:02d}"
+            (md_dir / f"{name}.md").write_text(f"---\ndate: {name}\n---\n\n# `project_{idx}`\n\n- Created: {name}\n")
+
+        ctx = SimpleNamespace(obj={"folder_path": Path(folder), "project_already_existed": False}, params={})
+
+        with timer:
+            Summarizer(ctx=ctx).write_summary_html()
@@ -0,0 +1,26 @@
+import tempfile
+from pathlib import Path
+
+from benchmarks.generators import LINE_COUNTS, write_project
+from benchmarks.harness import benchmark
+from django_new.transformer import Runner
+from django_new.transformer.transformations.whitenoise import WhitenoiseTransformation
+
+
+@benchmark("transformations.whitenoise", params=LINE_COUNTS)
+def forwards(timer, line_count):
+    with tempfile.TemporaryDirectory() as folder:
+        write_project(Path(folder), line_count)
+
+        with timer:
+            Runner(path=Path(folder)).install(WhitenoiseTransformation(root_path=Path(folder)))
+
+
+@benchmark("transformations.whitenoise", params=LINE_COUNTS)
+def backwards(timer, line_count):
+    with tempfile.TemporaryDirectory() as folder:
+        write_project(Path(folder), line_count)
+        Runner(path=Path(folder)).install(WhitenoiseTransformation(root_path=Path(folder)))
+
+        with timer:
+            Runner(path=Path(folder)).uninstall(WhitenoiseTransformation(root_path=Path(folder)))
@@ -0,0 +1,313 @@
+import json
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+from rich.markup import escape
+from rich.table import Table
+
+from django_new.utils import console, stderr
+
+# Bump when the results change shape, so old results are not compared with new ones
+RESULTS_VERSION = 1
+
+# Time differences below this are never significant, however quiet the samples are
+MIN_TIME_THRESHOLD = 0.05
+
+# How many times the noise of the samples a time difference has to be to be significant
+NOISE_FACTOR = 3.0
+
+# Scales the median absolute deviation to the standard deviation of normally distributed samples
+MAD_SCALE = 1.4826
+
+# Peak memory is measured with `tracemalloc`, which is nearly deterministic, so a small margin is enough
+MEMORY_THRESHOLD = 0.10
+MEMORY_SLACK = 64 * 1024
+
+# Groups of benchmarks whose time regressions fail the comparison
+DEFAULT_GATED_GROUPS = ("cli",)
+
+compare_app = typer.Typer(help="Work with the results of the django-new benchmarks.")
+
+
+@dataclass
+class Comparison:
+    """How a benchmark changed between the baseline and the current results."""
+
+    name: str
+    group: str
+
+    # Relative differences of the times, e.g. 0.1 when the current time is 10% slower
+    median_delta: float
+    p95_delta: float
+
+    # Relative time difference that is significant for the noise of the samples
+    threshold: float
+
+    # Relative difference of the peak memory, if both results have it
+    memory_delta: float | None = None
+
+    # Parser -> how many more times it was called
+    parse_deltas: dict[str, int] = field(default_factory=dict)
+
+    # Why the comparison fails, e.g. "time +12.0%" or "libcst parses +1"
+    regressions: list[str] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        if self.regressions:
+            return "regression"
+
+        if self.median_delta > self.threshold:
+            return "slower"
+
+        if self.median_delta < -self.threshold:
+            return "faster"
+
+        return "unchanged"
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Get a percentile of the samples, interpolating between the closest ones."""
+
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def get_noise(samples: list[float]) -> float:
+    """Get how much the samples vary, relative to their median; the median absolute deviation is not thrown off by
+    one slow sample."""
+
+    median = statistics.median(samples)
+
+    if median <= 0:
+        return 0.0
+
+    deviation = statistics.median(abs(sample - median) for sample in samples)
+
+    return deviation * MAD_SCALE / median
+
+
+def get_threshold(
+    baseline_samples: list[float],
+    current_samples: list[float],
+    min_threshold: float = MIN_TIME_THRESHOLD,
+    noise_factor: float = NOISE_FACTOR,
+) -> float:
+    """Get the relative time difference that is significant for a benchmark, based on the noise of both samples."""
+
+    noise = max(get_noise(baseline_samples), get_noise(current_samples))
+
+    return max(min_threshold, noise * noise_factor)
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """Load benchmark results.
+
+    Raises:
+        ValueError: If the file is not results of a version that can be compared.
+    """
+
+    try:
+        results = json.loads(Path(path).read_text())
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid benchmark results in {path}: {e}") from e
+
+    if not isinstance(results, dict) or results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results in {path}")
+
+    return results
+
+
+def get_machine_profile(results: dict[str, Any]) -> dict[str, Any]:
+    """Get the machine that results are from, without the version of django-new that was measured."""
+
+    return {key: value for key, value in (results.get("machine") or {}).items() if key != "django_new"}
+
+
+def is_gated(group: str, gated_groups: tuple[str, ...]) -> bool:
+    return any(group == gated_group or group.startswith(f"{gated_group}.") for gated_group in gated_groups)
+
+
+def compare_benchmark(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    gated_groups: tuple[str, ...] = DEFAULT_GATED_GROUPS,
+    min_threshold: float = MIN_TIME_THRESHOLD,
+    noise_factor: float = NOISE_FACTOR,
+) -> Comparison:
+    """Compare the results of one benchmark."""
+
+    baseline_median = statistics.median(baseline["samples"])
+    current_median = statistics.median(current["samples"])
+    baseline_p95 = percentile(baseline["samples"], 95)
+    current_p95 = percentile(current["samples"], 95)
+
+    comparison = Comparison(
+        name=current["name"],
+        group=current["group"],
+        median_delta=current_median / baseline_median - 1 if baseline_median else 0.0,
+        p95_delta=current_p95 / baseline_p95 - 1 if baseline_p95 else 0.0,
+        threshold=get_threshold(baseline["samples"], current["samples"], min_threshold, noise_factor),
+    )
+
+    if comparison.median_delta > comparison.threshold and is_gated(comparison.group, gated_groups):
+        comparison.regressions.append(f"time {comparison.median_delta:+.1%}")
+
+    baseline_memory = baseline.get("peak_memory")
+    current_memory = current.get("peak_memory")
+
+    if baseline_memory and current_memory is not None:
+        comparison.memory_delta = current_memory / baseline_memory - 1
+
+        if comparison.memory_delta > MEMORY_THRESHOLD and current_memory - baseline_memory > MEMORY_SLACK:
+            comparison.regressions.append(f"peak memory {comparison.memory_delta:+.1%}")
+
+    baseline_parse_counts = baseline.get("parse_counts") or {}
+
+    for parser, count in (current.get("parse_counts") or {}).items():
+        delta = count - baseline_parse_counts.get(parser, 0)
+
+        if delta:
+            comparison.parse_deltas[parser] = delta
+
+        # Parse counts are deterministic, so any increase is a regression
+        if delta > 0:
+            comparison.regressions.append(f"{parser} parses {delta:+d}")
+
+    return comparison
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    gated_groups: tuple[str, ...] = DEFAULT_GATED_GROUPS,
+    min_threshold: float = MIN_TIME_THRESHOLD,
+    noise_factor: float = NOISE_FACTOR,
+) -> tuple[list[Comparison], list[str], list[str]]:
+    """Compare the benchmarks that are in both results.
+
+    Returns:
+        The comparisons, the names of the benchmarks that are only in the baseline, and the names of the benchmarks
+        that are only in the current results.
+    """
+
+    baseline_benchmarks = {benchmark["name"]: benchmark for benchmark in baseline["benchmarks"]}
+    current_benchmarks = {benchmark["name"]: benchmark for benchmark in current["benchmarks"]}
+
+    comparisons = [
+        compare_benchmark(baseline_benchmarks[name], benchmark, gated_groups, min_threshold, noise_factor)
+        for name, benchmark in current_benchmarks.items()
+        if name in baseline_benchmarks
+    ]
+    removed = [name for name in baseline_benchmarks if name not in current_benchmarks]
+    added = [name for name in current_benchmarks if name not in baseline_benchmarks]
+
+    return (comparisons, removed, added)
+
+
+def format_delta(delta: float | None, threshold: float | None = None) -> str:
+    if delta is None:
+        return "-"
+
+    text = f"{delta:+.1%}"
+
+    if threshold is not None and delta > threshold:
+        return f"[red]{text}[/red]"
+
+    if threshold is not None and delta < -threshold:
+        return f"[green]{text}[/green]"
+
+    return text
+
+
+@compare_app.callback()
+def callback():
+    """Work with the results of the django-new benchmarks."""
+
+
+@compare_app.command()
+def compare(
+    baseline_path: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Results to compare against.")],
+    current_path: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Results to check.")],
+    gate: list[str] = typer.Option(  # noqa: B008
+        list(DEFAULT_GATED_GROUPS),
+        "--gate",
+        help="Group of benchmarks whose time regressions fail the comparison, e.g. 'cli' or 'operations.python'.",
+    ),
+    min_threshold: float = typer.Option(
+        MIN_TIME_THRESHOLD, "--min-threshold", help="Smallest relative time difference that is significant."
+    ),
+    noise_factor: float = typer.Option(
+        NOISE_FACTOR, "--noise-factor", help="How many times the noise of the samples a time difference has to be."
+    ),
+):
+    """Compare benchmark results with a baseline, and fail on significant regressions.
+
+    Regressions in the startup time, or the time of any other gated group, in peak memory, and in parse counts fail
+    the comparison.
+    """
+
+    try:
+        baseline = load_results(baseline_path)
+        current = load_results(current_path)
+    except ValueError as e:
+        stderr(str(e))
+
+        raise typer.Exit(2) from e
+
+    if get_machine_profile(baseline) != get_machine_profile(current):
+        console.print("[yellow]The results are from different machines, so the times might not be comparable.[/yellow]")
+
+    comparisons, removed, added = compare_results(
+        baseline, current, gated_groups=tuple(gate), min_threshold=min_threshold, noise_factor=noise_factor
+    )
+
+    table = Table()
+    table.add_column("Benchmark", overflow="fold", min_width=30)
+    table.add_column("Median", justify="right", no_wrap=True)
+    table.add_column("p95", justify="right", no_wrap=True)
+    table.add_column("Threshold", justify="right", no_wrap=True)
+    table.add_column("Peak memory", justify="right", no_wrap=True)
+    table.add_column("Parses")
+    table.add_column("Status")
+
+    for comparison in comparisons:
+        parses = ", ".join(f"{parser} {delta:+d}" for parser, delta in comparison.parse_deltas.items())
+        status = comparison.status
+
+        if comparison.regressions:
+            status = f"[red]{escape(', '.join(comparison.regressions))}[/red]"
+
+        table.add_row(
+            escape(comparison.name),
+            format_delta(comparison.median_delta, comparison.threshold),
+            format_delta(comparison.p95_delta),
+            f"±{comparison.threshold:.1%}",
+            format_delta(comparison.memory_delta, MEMORY_THRESHOLD),
+            parses or "-",
+            status,
+        )
+
+    console.print(table)
+
+    for name in removed:
+        console.print(f" · [cyan]{escape(name)}[/cyan] is only in the baseline")
+
+    for name in added:
+        console.print(f" · [cyan]{escape(name)}[/cyan] is not in the baseline")
+
+    regressions = [comparison for comparison in comparisons if comparison.regressions]
+
+    if regressions:
+        stderr(f"{len(regressions)} of {len(comparisons)} benchmarks regressed")
+
+        raise typer.Exit(1)
+
+    console.print(f"No regressions in {len(comparisons)} benchmarks")
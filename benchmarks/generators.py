@@ -0,0 +1,146 @@
+import functools
+from pathlib import Path
+
+# Sizes of the generated settings and `pyproject.toml` files, in lines
+LINE_COUNTS = (100, 1_000, 5_000)
+
+# Sizes of the generated project trees, in files
+FILE_COUNTS = (100, 1_000, 5_000)
+
+SETTINGS_HEADER = '''"""Generated settings."""
+
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+DEBUG = True
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+}
+
+STATIC_URL = "static/"
+'''
+
+PYPROJECT_HEADER = """[project]
+name = "example"
+version = "0.1.0"
+requires-python = ">=3.10"
+dependencies = [
+    "django>=5",
+    "django-environ",
+]
+
+[dependency-groups]
+dev = [
+    "pytest",
+]
+"""
+
+
+@functools.cache
+def generate_settings(line_count: int) -> str:
+    """Generate a settings module with the usual settings, padded with more settings to about `line_count` lines."""
+
+    lines = SETTINGS_HEADER.splitlines()
+
+    while len(lines) < line_count:
+        idx = len(lines)
+        lines.extend(
+            [
+                "",
+                f"SETTING_{idx} = [",
+                f'    "app_{idx}.apps.AppConfig",  # comment',
+                f'    "app_{idx}.middleware.Middleware",',
+                "]",
+                f'OPTION_{idx} = {{"default": {{"BACKEND": "backend_{idx}", "TIMEOUT": {idx}}}}}',
+            ]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+@functools.cache
+def generate_pyproject(line_count: int) -> str:
+    """Generate a `pyproject.toml` with a project and its dependencies, padded with tool tables to about `line_count`
+    lines."""
+
+    lines = PYPROJECT_HEADER.splitlines()
+
+    while len(lines) < line_count:
+        idx = len(lines)
+        lines.extend(
+            [
+                "",
+                f"[tool.example_{idx}]",
+                f'option = "value_{idx}"',
+                f"numbers = [{idx}, {idx + 1}, {idx + 2}]",
+                f"enabled = {'true' if idx % 2 else 'false'}  # comment",
+            ]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def write_project(folder: Path, line_count: int = 100) -> None:
+    """Write a project with a `config/settings.py` and a `pyproject.toml` of about `line_count` lines each."""
+
+    (folder / "config").mkdir(parents=True, exist_ok=True)
+    (folder / "config" / "settings.py").write_text(generate_settings(line_count))
+    (folder / "pyproject.toml").write_text(generate_pyproject(line_count))
+    (folder / "manage.py").write_text("")
+
+
+def write_tree(folder: Path, file_count: int) -> list[Path]:
+    """Write a project tree of `file_count` files, spread over apps with a few levels of directories each.
+
+    Returns:
+        The paths of the files.
+    """
+
+    paths = []
+    idx = 0
+
+    while len(paths) < file_count:
+        app_path = folder / f"app_{idx}"
+
+        for directory in ("", "migrations", "templates/app", "static/app/css", "tests"):
+            directory_path = app_path / directory
+            directory_path.mkdir(parents=True, exist_ok=True)
+
+            for file_idx in range(4):
+                if len(paths) == file_count:
+                    break
+
+                path = directory_path / f"file_{file_idx}.py"
+                path.write_text("")
+                paths.append(path)
+
+        idx += 1
+
+    # Generated directories that the walker skips
+    (folder / "node_modules" / "package").mkdir(parents=True, exist_ok=True)
+    (folder / "node_modules" / "package" / "index.js").write_text("")
+
+    return paths
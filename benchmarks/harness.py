@@ -0,0 +1,282 @@
+import ast
+import contextlib
+import gc
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+import libcst
+import tomlkit
+
+from benchmarks.compare import RESULTS_VERSION, percentile
+
+logger = logging.getLogger(__name__)
+
+# How many timed samples to take of each benchmark
+DEFAULT_REPEAT = 5
+
+# How many untimed runs before the samples, e.g. to import modules
+DEFAULT_WARMUP = 1
+
+
+class Timer:
+    """Times the block that a benchmark measures; the rest of the benchmark is setup and is not measured.
+
+    When profiling, the peak memory and the parser calls of the block are measured instead. Profiling slows the block
+    down, so its time is not used.
+    """
+
+    def __init__(self, *, profile: bool = False):
+        self.profile = profile
+
+        self.elapsed: float | None = None
+        self.peak_memory: int | None = None
+        self.parse_counts: dict[str, int] = {}
+
+        self._stack = contextlib.ExitStack()
+
+    def __enter__(self) -> "Timer":
+        if self.profile:
+            self.parse_counts = self._stack.enter_context(count_parses())
+
+            tracemalloc.start()
+            self._stack.callback(tracemalloc.stop)
+
+        self._start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.elapsed = time.perf_counter() - self._start
+
+        if self.profile:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+
+        self._stack.close()
+
+
+@dataclass
+class Benchmark:
+    """A function that measures one thing, e.g. an operation on a settings file of a certain size."""
+
+    name: str
+    group: str
+    func: Callable[..., None]
+
+    # Passed to the function as `param`, e.g. the number of lines in the generated file
+    param: Any = None
+
+    # Whether the memory and parse counts of the function are meaningful, i.e. it does not run a subprocess
+    profile: bool = True
+
+    repeat: int | None = None
+
+    def run(self, *, profile: bool = False) -> Timer:
+        timer = Timer(profile=profile)
+
+        if self.param is None:
+            self.func(timer)
+        else:
+            self.func(timer, self.param)
+
+        if timer.elapsed is None:
+            raise ValueError(f"Benchmark '{self.name}' did not use the timer")
+
+        return timer
+
+
+@dataclass
+class Result:
+    """The samples of a benchmark and their statistics; times are in seconds and memory is in bytes."""
+
+    name: str
+    group: str
+    param: Any
+    samples: list[float]
+    median: float
+    p95: float
+    min: float
+    max: float
+    stdev: float
+
+    # Peak memory that Python allocated during one run
+    peak_memory: int | None = None
+
+    # How many times Python and TOML were parsed during one run
+    parse_counts: dict[str, int] = field(default_factory=dict)
+
+
+_benchmarks: list[Benchmark] = []
+
+
+def benchmark(
+    group: str,
+    *,
+    name: str | None = None,
+    params: tuple[Any, ...] = (),
+    profile: bool = True,
+    repeat: int | None = None,
+) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Register a benchmark function; it gets a `Timer` to time the part it measures, and a param if there are any.
+
+    Benchmarks are named like `group.function`, or `group.name` when a name is given. With `params`, a benchmark is
+    registered for each of them, named like `group.function[param]`.
+    """
+
+    def decorator(func: Callable[..., None]) -> Callable[..., None]:
+        full_name = f"{group}.{name or func.__name__}"
+
+        if params:
+            _benchmarks.extend(
+                Benchmark(
+                    name=f"{full_name}[{param}]", group=group, func=func, param=param, profile=profile, repeat=repeat
+                )
+                for param in params
+            )
+        else:
+            _benchmarks.append(Benchmark(name=full_name, group=group, func=func, profile=profile, repeat=repeat))
+
+        return func
+
+    return decorator
+
+
+def get_benchmarks(pattern: str | None = None) -> list[Benchmark]:
+    """Get the registered benchmarks, optionally only the ones whose name matches a regular expression."""
+
+    if pattern is None:
+        return list(_benchmarks)
+
+    regex = re.compile(pattern)
+
+    return [benchmark for benchmark in _benchmarks if regex.search(benchmark.name)]
+
+
+@contextlib.contextmanager
+def count_parses() -> Iterator[dict[str, int]]:
+    """Count the calls to the Python and TOML parsers within the block."""
+
+    counts = {"libcst": 0, "ast": 0, "tomlkit": 0}
+    originals = {
+        "libcst": (libcst, "parse_module", libcst.parse_module),
+        "ast": (ast, "parse", ast.parse),
+        "tomlkit": (tomlkit, "parse", tomlkit.parse),
+    }
+
+    def counting(key: str, original: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            counts[key] += 1
+
+            return original(*args, **kwargs)
+
+        return wrapper
+
+    for key, (module, attribute, original) in originals.items():
+        setattr(module, attribute, counting(key, original))
+
+    try:
+        yield counts
+    finally:
+        for module, attribute, original in originals.values():
+            setattr(module, attribute, original)
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP) -> Result:
+    """Take the timed samples of a benchmark, and then profile one more run for its memory and parse counts."""
+
+    for _ in range(warmup):
+        benchmark.run()
+
+    samples = []
+
+    for _ in range(benchmark.repeat or repeat):
+        gc.collect()
+
+        samples.append(benchmark.run().elapsed)
+
+    result = Result(
+        name=benchmark.name,
+        group=benchmark.group,
+        param=benchmark.param,
+        samples=samples,
+        median=statistics.median(samples),
+        p95=percentile(samples, 95),
+        min=min(samples),
+        max=max(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    )
+
+    if benchmark.profile:
+        gc.collect()
+
+        timer = benchmark.run(profile=True)
+        result.peak_memory = timer.peak_memory
+        result.parse_counts = timer.parse_counts
+
+    return result
+
+
+def get_machine() -> dict[str, Any]:
+    """Describe the machine the benchmarks ran on, so results from different machines are not mixed up."""
+
+    try:
+        django_new_version = version("django-new")
+    except PackageNotFoundError:
+        django_new_version = None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "django_new": django_new_version,
+    }
+
+
+def run(
+    benchmarks: list[Benchmark],
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+    on_result: Callable[[Result], None] | None = None,
+) -> dict[str, Any]:
+    """Run benchmarks and get their results as JSON-serialisable data."""
+
+    results = []
+
+    for benchmark in benchmarks:
+        logger.debug(f"Run {benchmark.name}")
+
+        result = run_benchmark(benchmark, repeat=repeat, warmup=warmup)
+        results.append(result)
+
+        if on_result is not None:
+            on_result(result)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(tz=timezone.utc).isoformat(),  # noqa: UP017
+        "machine": get_machine(),
+        "benchmarks": [asdict(result) for result in results],
+    }
+
+
+def write_results(results: dict[str, Any], path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temporary_path = path.with_suffix(".tmp")
+    temporary_path.write_text(json.dumps(results, indent=2) + "\n")
+    temporary_path.replace(path)
@@ -0,0 +1,275 @@
+"""Profile the memory of operations and transformations with `tracemalloc`.
+
+Run with `python -m benchmarks.memory`; the peak and retained memory of each operation and transformation is printed
+with the source lines that allocated the retained memory.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import re
+import tempfile
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+import django_new
+from benchmarks.bench_operations import PYTHON_OPERATIONS, TOML_OPERATIONS
+from benchmarks.generators import LINE_COUNTS, generate_pyproject, generate_settings, write_project
+from django_new.transformer import Runner
+from django_new.transformer.transformations.whitenoise import WhitenoiseTransformation
+
+# How many frames to keep of each allocation; enough to reach the django-new code that calls into libcst or tomlkit
+TRACEBACK_LIMIT = 30
+
+# How many source lines to show for each profile
+TOP_SITES = 5
+
+# Allocations of the profiler itself
+PROFILER_FILTERS = (
+    tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+    tracemalloc.Filter(inclusive=False, filename_pattern="<frozen importlib._bootstrap*>"),
+    tracemalloc.Filter(inclusive=False, filename_pattern=__file__),
+)
+
+# Where the django-new code is, to find the caller of allocations in libraries
+DJANGO_NEW_PATH = str(Path(django_new.__file__).parent)
+
+console = Console()
+
+
+@dataclass(frozen=True)
+class Site:
+    """A source line that allocated memory that was still allocated after the run."""
+
+    # The line that allocated the memory
+    location: str
+
+    # The innermost line of django-new that led to the allocation, if it was not allocated by django-new itself
+    caller: str | None
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryProfile:
+    """The memory of one run, in bytes."""
+
+    name: str
+
+    # The most memory that was allocated at once during the run, above what was allocated before it
+    peak: int
+
+    # Memory that was still allocated after the run and a garbage collection, e.g. in caches
+    retained: int
+
+    sites: list[Site] = field(default_factory=list)
+
+
+def profile(name: str, func: Callable[[], object], top: int = TOP_SITES) -> MemoryProfile:
+    """Profile one run of a function; the result of the function is not kept, so it does not count as retained."""
+
+    gc.collect()
+    tracemalloc.start(TRACEBACK_LIMIT)
+
+    try:
+        before = tracemalloc.take_snapshot()
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        func()
+
+        peak = tracemalloc.get_traced_memory()[1] - start
+
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - start
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    return MemoryProfile(name=name, peak=peak, retained=retained, sites=get_top_sites(before, after, top=top))
+
+
+def get_top_sites(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int = TOP_SITES) -> list[Site]:
+    """Get the source lines that allocated the most memory between two snapshots."""
+
+    differences = after.filter_traces(PROFILER_FILTERS).compare_to(before.filter_traces(PROFILER_FILTERS), "traceback")
+    sites: dict[tuple[str, str | None], list[int]] = {}
+
+    for difference in differences:
+        # The most recent frame is last
+        frames = list(reversed(difference.traceback))
+        location = f"{frames[0].filename}:{frames[0].lineno}"
+        caller = next(
+            (f"{frame.filename}:{frame.lineno}" for frame in frames if DJANGO_NEW_PATH in frame.filename),
+            None,
+        )
+
+        if caller == location:
+            caller = None
+
+        size_and_count = sites.setdefault((location, caller), [0, 0])
+        size_and_count[0] += difference.size_diff
+        size_and_count[1] += difference.count_diff
+
+    ordered = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+
+    return [
+        Site(location=location, caller=caller, size=size, count=count)
+        for (location, caller), (size, count) in ordered[:top]
+        if size > 0
+    ]
+
+
+def measure_growth(func: Callable[[], object], runs: int = 10, rounds: int = 3, warmup: int = 5) -> float:
+    """Get how much memory each run of a function retains on average, once the caches are warm.
+
+    Caches are bounded, so in a long-running process any growth that does not level off is a leak. The runs are
+    measured in rounds and the smallest growth is returned, because one-off allocations, e.g. when the interpreter
+    resizes its table of interned strings, only show up in one round while a leak shows up in all of them.
+    """
+
+    for _ in range(warmup):
+        func()
+
+    growths = []
+    tracemalloc.start()
+
+    try:
+        for _ in range(rounds):
+            gc.collect()
+            before = tracemalloc.take_snapshot().filter_traces(PROFILER_FILTERS)
+
+            for _ in range(runs):
+                func()
+
+            gc.collect()
+            after = tracemalloc.take_snapshot().filter_traces(PROFILER_FILTERS)
+            growths.append(sum(difference.size_diff for difference in after.compare_to(before, "filename")) / runs)
+    finally:
+        tracemalloc.stop()
+
+    return min(growths)
+
+
+@contextlib.contextmanager
+def project(line_count: int) -> Iterator[Path]:
+    """A temporary project with settings and `pyproject.toml` files of about `line_count` lines each."""
+
+    with tempfile.TemporaryDirectory() as folder:
+        write_project(Path(folder), line_count)
+
+        yield Path(folder)
+
+
+def install_direct(folder: Path) -> None:
+    """Install whitenoise with every operation written to the file at once, like the creators do."""
+
+    transformation = WhitenoiseTransformation(root_path=folder)
+    transformation.forwards()
+    transformation.commit_changes()
+
+
+def install_batch(folder: Path) -> None:
+    """Install whitenoise with the operations planned and written in one batch, like `--install` does."""
+
+    Runner(path=folder).install(WhitenoiseTransformation(root_path=folder))
+
+
+# The ways of installing a transformation, by name
+MODES: dict[str, Callable[[Path], None]] = {
+    "direct": install_direct,
+    "batch": install_batch,
+}
+
+
+def run_in_project(line_count: int, install: Callable[[Path], None]) -> Callable[[], None]:
+    """Get a function that installs whitenoise in a new project every time it is called."""
+
+    def run() -> None:
+        with project(line_count) as folder:
+            install(folder)
+
+    return run
+
+
+def get_profiles(pattern: str | None = None, top: int = TOP_SITES) -> Iterator[MemoryProfile]:
+    """Profile every operation and transformation for each input size."""
+
+    runs: list[tuple[str, Callable[[], object]]] = []
+
+    for line_count in LINE_COUNTS:
+        for operation_name, get_operation in PYTHON_OPERATIONS.items():
+            content = generate_settings(line_count)
+            runs.append(
+                (f"operations.python.{operation_name}[{line_count}]", lambda o=get_operation, c=content: o().apply(c))
+            )
+
+        for operation_name, get_operation in TOML_OPERATIONS.items():
+            content = generate_pyproject(line_count)
+            runs.append(
+                (f"operations.toml.{operation_name}[{line_count}]", lambda o=get_operation, c=content: o().apply(c))
+            )
+
+        for mode, install in MODES.items():
+            runs.append((f"transformations.whitenoise.{mode}[{line_count}]", run_in_project(line_count, install)))
+
+    regex = re.compile(pattern) if pattern else None
+
+    for name, func in runs:
+        if regex is None or regex.search(name):
+            # The transformations print what they do
+            with contextlib.redirect_stdout(io.StringIO()):
+                memory_profile = profile(name, func, top=top)
+
+            yield memory_profile
+
+
+def format_size(size: float) -> str:
+    return f"{size / 1024:,.0f} KiB"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory", description="Profile the memory of operations and transformations."
+    )
+    parser.add_argument("-k", "--filter", help="Only profile the runs whose name matches this regular expression.")
+    parser.add_argument("--top", type=int, default=TOP_SITES, help="How many source lines to show for each run.")
+    parser.add_argument("--leaks", action="store_true", help="Check repeated runs for leaks instead.")
+
+    args = parser.parse_args(argv)
+
+    if args.leaks:
+        table = Table("Mode", "Retained per run")
+
+        for mode, install in MODES.items():
+            with contextlib.redirect_stdout(io.StringIO()):
+                growth = measure_growth(run_in_project(LINE_COUNTS[0], install))
+
+            table.add_row(mode, format_size(growth))
+
+        console.print(table)
+
+        return
+
+    for memory_profile in get_profiles(args.filter, top=args.top):
+        console.print(
+            f"[bold]{escape(memory_profile.name)}[/bold]: peak {format_size(memory_profile.peak)}, "
+            f"retained {format_size(memory_profile.retained)}"
+        )
+
+        for site in memory_profile.sites:
+            console.print(f"  {format_size(site.size):>12} {site.count:>8,} blocks  {escape(site.location)}")
+
+            if site.caller:
+                console.print(f"  {'':>12} {'':>8}   called from {escape(site.caller)}")
+
+
+if __name__ == "__main__":
+    main()
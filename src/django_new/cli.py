@@ -21,8 +21,12 @@ from django_new.creators.project import (
     MinimalProjectCreator,
     TemplateProjectCreator,
 )
+from django_new.manifest import Manifest
 from django_new.summarizer import Summarizer
-from django_new.transformer import Runner, resolve_transformation
+from django_new.summary_worker import start_summary_worker, write_summary
+from django_new.transformer import Runner, Transformation, resolve_transformation
+from django_new.transformer.journal import Journal
+from django_new.transformer.planner import Planner
 from django_new.utils import console, stderr
 
 try:
@@ -126,11 +130,30 @@ def create_project(
         "--install",
         help="Install a Django package.",
     ),
+    dry_run: bool = typer.Option(  # noqa: FBT001
+        False, "--dry-run", help="Show the changes that --install would make without writing them."
+    ),
+    background_summary: bool = typer.Option(  # noqa: FBT001
+        False,
+        "--background-summary",
+        help="Print the next steps at once and write the summary files in the background.",
+    ),
+    recover: bool = typer.Option(  # noqa: FBT001
+        False,
+        "--recover",
+        help="Restore the files that an interrupted run was modifying, in the folder or the current directory.",
+    ),
 ):
     """Create a new Django project."""
 
     configure_logging(ctx)
 
+    if recover:
+        # The folder is the only argument, so it is parsed as the name
+        recover_files(Path(folder or name or ".").resolve())
+
+        return
+
     # Check for multiple flags at once that don't make sense being used together
     if sum([project, app, api, data, web, worker, template is not None]) > 1:
         stderr(
@@ -154,11 +177,18 @@ def create_project(
             folder = name
             name = None
 
-    if django_new_type == DjangoNewType.INSTALL:
-        console.print(Markdown("# Preparing to install packages ✨", style="green4"))
-    else:
-        console.print(Markdown(f"# Preparing to create a Django {django_new_type.value} ✨", style="green4"))
-    typer.echo()
+    if dry_run and django_new_type != DjangoNewType.INSTALL:
+        stderr("--dry-run can only be used with --install in an existing project")
+
+        raise typer.Exit(1)
+
+    # Only output the diff in dry-run mode so it can be piped
+    if not dry_run:
+        if django_new_type == DjangoNewType.INSTALL:
+            console.print(Markdown("# Preparing to install packages ✨", style="green4"))
+        else:
+            console.print(Markdown(f"# Preparing to create a Django {django_new_type.value} ✨", style="green4"))
+        typer.echo()
 
     # Prompt for name
     if name is None and django_new_type != DjangoNewType.INSTALL:
@@ -218,93 +248,173 @@ def create_project(
     ctx.obj["project_name"] = project_name
     ctx.obj["app_name"] = app_name
 
-    console.print("Tasks\n", style="bold underline")
+    if dry_run:
+        show_install_diff(folder_path=folder_path, install=install)
 
-    try:
-        # Create project
-        if not app and django_new_type != DjangoNewType.INSTALL:
-            if project_already_existed:
-                logger.debug("Project already exists")
+        return
 
-                if minimal:
-                    stderr("Project already exists, so cannot make a minimal project")
+    # Record every path that gets created or modified, so the summary only describes those
+    manifest = Manifest(folder_path)
+    ctx.obj["manifest"] = manifest
 
-                    raise typer.Exit(1)
-                elif project:
-                    stderr("Project already exists, so cannot make a project")
+    with manifest:
+        console.print("Tasks\n", style="bold underline")
 
-                    raise typer.Exit(1)
+        try:
+            # Create project
+            if not app and django_new_type != DjangoNewType.INSTALL:
+                if project_already_existed:
+                    logger.debug("Project already exists")
+
+                    if minimal:
+                        stderr("Project already exists, so cannot make a minimal project")
+
+                        raise typer.Exit(1)
+                    elif project:
+                        stderr("Project already exists, so cannot make a project")
+
+                        raise typer.Exit(1)
+                    elif template:
+                        stderr("Project already exists, so cannot use a template")
+
+                        raise typer.Exit(1)
+                elif minimal:
+                    with console.status("Setting up your minimal project...", spinner="dots"):
+                        logger.debug("Project doesn't exist; make minimal")
+                        MinimalProjectCreator(name=app_name, folder=folder_path).create(
+                            python_version=python_version, django_version=django_version
+                        )
                 elif template:
-                    stderr("Project already exists, so cannot use a template")
-
-                    raise typer.Exit(1)
-            elif minimal:
-                with console.status("Setting up your minimal project...", spinner="dots"):
-                    logger.debug("Project doesn't exist; make minimal")
-                    MinimalProjectCreator(name=app_name, folder=folder_path).create(
-                        python_version=python_version, django_version=django_version
-                    )
-            elif template:
-                with console.status("Setting up your project with starter kit...", spinner="dots"):
-                    logger.debug("Project doesn't exist; make with starter kit")
-                    TemplateProjectCreator(name=project_name, folder=folder_path).create(
-                        project_template=template, python_version=python_version, django_version=django_version
-                    )
-            else:
-                with console.status("Setting up your project...", spinner="dots"):
-                    logger.debug("Project doesn't exist; make classic")
-                    ClassicProjectCreator(folder=folder_path).create(
-                        display_name=project_name, python_version=python_version, django_version=django_version
-                    )
-
-        # Create app
-        if not project and not minimal and not template and django_new_type != DjangoNewType.INSTALL:
-            subclassed_app_name = app_name
-
-            if not project_already_existed:
-                # Set this to `None` which will use the default app name for each subclass
-                subclassed_app_name = None
-
-            with console.status("Setting up your app...", spinner="dots"):
-                if api:
-                    ApiAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
-                elif data:
-                    DataAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
-                elif web:
-                    WebAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
-                elif worker:
-                    WorkerAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
+                    with console.status("Setting up your project with starter kit...", spinner="dots"):
+                        logger.debug("Project doesn't exist; make with starter kit")
+                        TemplateProjectCreator(name=project_name, folder=folder_path).create(
+                            project_template=template, python_version=python_version, django_version=django_version
+                        )
                 else:
-                    # Always pass in the actual name for default apps
-                    AppCreator(app_name=app_name, folder=folder_path).create()
-
-        # Install transformation if requested
-        if install:
-            for transformation_name in install:
-                with console.status(f"Installing {transformation_name}...", spinner="dots"):
+                    with console.status("Setting up your project...", spinner="dots"):
+                        logger.debug("Project doesn't exist; make classic")
+                        ClassicProjectCreator(folder=folder_path).create(
+                            display_name=project_name, python_version=python_version, django_version=django_version
+                        )
+
+            # Create app
+            if not project and not minimal and not template and django_new_type != DjangoNewType.INSTALL:
+                subclassed_app_name = app_name
+
+                if not project_already_existed:
+                    # Set this to `None` which will use the default app name for each subclass
+                    subclassed_app_name = None
+
+                with console.status("Setting up your app...", spinner="dots"):
+                    if api:
+                        ApiAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
+                    elif data:
+                        DataAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
+                    elif web:
+                        WebAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
+                    elif worker:
+                        WorkerAppCreator(app_name=subclassed_app_name, folder=folder_path).create()
+                    else:
+                        # Always pass in the actual name for default apps
+                        AppCreator(app_name=app_name, folder=folder_path).create()
+
+            # Install transformation if requested
+            if install:
+                install_names = ", ".join(install)
+
+                with console.status(f"Installing {install_names}...", spinner="dots"):
                     try:
-                        transformation_cls = resolve_transformation(transformation_name)
-                        transformation = transformation_cls(root_path=folder_path)
+                        # All transformations are planned and written together in one batch
+                        transformation_classes = Planner(*install).resolve()
+                        transformations = [cls(root_path=folder_path) for cls in transformation_classes]
 
                         runner = Runner(path=folder_path)
-                        runner.install(transformation)
-                        console.print(f" · Installed [cyan]{transformation_name}[/cyan] package")
+                        runner.install(*transformations)
                     except Exception as e:
-                        raise CommandError(f"Failed to install {transformation_name}: {e}") from e
-    except CommandError as e:
-        cmd_error = str(e)
-        stderr(cmd_error)
+                        raise CommandError(f"Failed to install {install_names}: {e}") from e
 
-        raise typer.Exit(1) from e
+                transformation_names = get_transformation_names(install, transformation_classes)
+
+                for transformation, transformation_name in zip(transformations, transformation_names, strict=True):
+                    if transformation in runner.skipped:
+                        console.print(f" · [cyan]{transformation_name}[/cyan] already applied, files unchanged")
+                    else:
+                        console.print(f" · Installed [cyan]{transformation_name}[/cyan] package")
+        except CommandError as e:
+            cmd_error = str(e)
+            stderr(cmd_error)
+
+            raise typer.Exit(1) from e
 
     typer.echo()
 
     summarizer = Summarizer(ctx=ctx)
-    summarizer.write_summary_markdown()
-    summarizer.write_summary_html()
+
+    if background_summary:
+        # Fall back to writing the summary now if the worker cannot be started
+        if start_summary_worker(ctx) is None:
+            write_summary(ctx)
+
+        summarizer.write_to_console(console=console, show_tree=False)
+
+        return
+
+    write_summary(ctx)
     summarizer.write_to_console(console=console)
 
 
+def recover_files(folder_path: Path) -> None:
+    """Restore files from the journal of an unfinished run."""
+
+    journal = Journal(folder_path)
+
+    if not journal.exists():
+        console.print(f"Nothing to recover in [blue]{folder_path}[/blue].")
+
+        return
+
+    for path in journal.replay():
+        console.print(f" · [blue][link file://{path}]{get_display_path(path, folder_path)}[/blue] restored")
+
+
+def get_display_path(path: Path, folder_path: Path) -> Path:
+    """Get a path relative to the project folder, or the whole path when it is outside of the folder."""
+
+    try:
+        return path.relative_to(folder_path)
+    except ValueError:
+        return path
+
+
+def show_install_diff(folder_path: Path, install: list[str]) -> None:
+    """Print a unified diff of the changes that installing the transformations would make."""
+
+    runner = Runner(path=folder_path, dry_run=True)
+
+    try:
+        transformations = [cls(root_path=folder_path) for cls in Planner(*install).resolve()]
+        runner.install(*transformations)
+    except Exception as e:
+        stderr(f"Failed to plan the installation of {', '.join(install)}: {e}")
+
+        raise typer.Exit(1) from e
+
+    diff = runner.get_diff()
+
+    if diff:
+        typer.echo(diff, nl=False)
+    else:
+        typer.echo("No changes.")
+
+
+def get_transformation_names(install: list[str], transformation_classes: list[type[Transformation]]) -> list[str]:
+    """Get the names of the planned transformations, using the name that was requested where there is one."""
+
+    requested_names = {resolve_transformation(name): name for name in install}
+
+    return [requested_names.get(cls, cls.get_name()) for cls in transformation_classes]
+
+
 def configure_logging(ctx: typer.Context) -> None:
     """Configure logging based on verbose flag."""
 
@@ -432,8 +542,8 @@ def main():
     typer_app()
 
 
-# Register the command
+# Register the commands
 typer_app.command()(create_project)
 
 if __name__ == "__main__":
-    typer_app()
+    main()
@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+from django_new.manifest import record_created, record_created_tree, record_removed
 from django_new.parser import get_class_name
 from django_new.templater.django_template import TemplateFile, create_file
 from django_new.transformer import Transformation
@@ -34,15 +35,18 @@ class AppCreator:
         (self.folder / self.app_name).mkdir(parents=True, exist_ok=True)
 
         call_command("startapp", self.app_name, self.folder / self.app_name)
+        record_created_tree(self.folder / self.app_name)
         stdout(f" · [blue][link file://{self.folder / self.app_name}]{self.app_name}/[/blue] directory created")
 
         # Remove tests.py in lieu of a root directory named tests
         (self.folder / self.app_name / "tests.py").unlink(missing_ok=True)
+        record_removed(self.folder / self.app_name / "tests.py")
 
         # Create tests directory with __init__.py
         tests_dir = self.folder / "tests" / self.app_name
         tests_dir.mkdir(parents=True, exist_ok=True)
         (tests_dir / "__init__.py").touch(exist_ok=True)
+        record_created(tests_dir / "__init__.py")
         logger.debug(f"Created tests directory at {tests_dir}")
         stdout(f" · [blue][link file://{tests_dir}]tests/{self.app_name}/[/blue] directory created")
 
@@ -69,6 +73,7 @@ class AppCreator:
                 transformer = Transformation(root_path=self.folder)
                 operation = AppendToList(name="INSTALLED_APPS", value=f'"{fully_qualified_app_config_name}"')
                 transformer.modify_file(path=settings_path, operation=operation)
+                transformer.commit_changes()
 
                 stdout(
                     f" · [cyan]{fully_qualified_app_config_name}[/cyan] added to [cyan]INSTALLED_APPS[/cyan] in [blue][link file://{settings_path}]{settings_path.name}[/blue]"
@@ -98,6 +103,7 @@ class DataAppCreator(AppCreator):
 
         # Remove default views.py
         (self.folder / self.app_name / "views.py").unlink(missing_ok=True)
+        record_removed(self.folder / self.app_name / "views.py")
 
 
 class WebAppCreator(AppCreator):
@@ -111,6 +117,7 @@ class WebAppCreator(AppCreator):
             (self.folder / "static/css").mkdir(parents=True, exist_ok=True)
             (self.folder / "static/js").mkdir(parents=True, exist_ok=True)
             (self.folder / "static/img").mkdir(parents=True, exist_ok=True)
+            record_created_tree(self.folder / "static")
 
         # Create urls.py
         urls_template_file = TemplateFile(self.folder / self.app_name / "urls.py", {"app_name": self.app_name})
@@ -118,6 +125,7 @@ class WebAppCreator(AppCreator):
 
         # Create folder for templates
         (self.folder / self.app_name / "templates" / self.app_name).mkdir(parents=True, exist_ok=True)
+        record_created(self.folder / self.app_name / "templates" / self.app_name)
         urls_template_file = TemplateFile(
             self.folder / self.app_name / "templates" / self.app_name / "index.html",
             {"app_name": self.app_name},
@@ -127,6 +135,7 @@ class WebAppCreator(AppCreator):
         # Create folder for templatetags
         (self.folder / self.app_name / "templatetags").mkdir(parents=True, exist_ok=True)
         (self.folder / self.app_name / "templatetags" / "__init__.py").touch(exist_ok=True)
+        record_created(self.folder / self.app_name / "templatetags" / "__init__.py")
 
 
 class WorkerAppCreator(AppCreator):
@@ -140,3 +149,4 @@ class WorkerAppCreator(AppCreator):
 
         # Remove default views.py
         (self.folder / self.app_name / "views.py").unlink(missing_ok=True)
+        record_removed(self.folder / self.app_name / "views.py")
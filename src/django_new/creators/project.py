@@ -3,6 +3,7 @@ from pathlib import Path
 from shutil import rmtree
 
 from django_new.creators.app import CLASSIC_CONFIGURATION_PATH_NAME, AppCreator
+from django_new.manifest import record_created, record_created_tree, record_moved, record_removed
 from django_new.templater.django_template import TemplateFile, create_file
 from django_new.utils import call_command, stderr, stdout
 
@@ -24,6 +25,8 @@ class ProjectCreator:
         """
 
         call_command("startproject", self.name, self.folder)
+        record_created(self.folder / "manage.py")
+        record_created_tree(self.folder / self.name)
         stdout(
             f" · Project created at [blue][link file://{self.folder}]{self.folder}/[/blue] with configuration files in [blue][link file://{self.folder / self.name}]{self.name}/[/blue]"
         )
@@ -31,6 +34,7 @@ class ProjectCreator:
         # Create `tests` directory and basic test configuration
         (self.folder / "tests").mkdir(exist_ok=True)
         (self.folder / "tests" / "__init__.py").write_text("")
+        record_created(self.folder / "tests" / "__init__.py")
         stdout(f" · [blue][link file://{self.folder / 'tests'}]tests/[/blue] directory created")
 
         # Create additional files for new Django projects that are not included with `startproject`
@@ -81,7 +85,17 @@ class TemplateProjectCreator(ProjectCreator):
             python_version: Python version requirement string (e.g., '>=3.10')
             django_version: Django version requirement string (e.g., '>=5')
         """
+        folder_had_files = Path(self.folder).exists() and any(Path(self.folder).iterdir())
+
         call_command("startproject", self.name, self.folder, f"--template={project_template}")
+
+        # Templates can create any files, so everything in a new folder was created
+        if folder_had_files:
+            record_created(Path(self.folder) / "manage.py")
+            record_created_tree(Path(self.folder) / self.name)
+        else:
+            record_created_tree(self.folder)
+
         stdout(" · Project created from template")
 
         # Create additional files
@@ -134,7 +148,9 @@ class MinimalProjectCreator(ProjectCreator):
             if not target.exists():
                 logger.debug(f"Move {item} -> {target}")
                 item.replace(target)
+                record_moved(item, target)
 
         logger.debug("Remove temporary app directory")
         rmtree(self.folder / self.name / self.name, ignore_errors=True)
+        record_removed(self.folder / self.name / self.name)
         logger.debug("Finished cleaning up temporary app directory")
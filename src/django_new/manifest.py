@@ -0,0 +1,140 @@
+import contextvars
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar["Manifest | None"] = contextvars.ContextVar("manifest", default=None)
+
+
+class Manifest:
+    """The paths that django-new created or modified during a run.
+
+    Used as a context manager, the manifest is the current one for the run, so code that creates or modifies files can
+    record them with `record_created` and `record_modified` without passing the manifest around.
+    """
+
+    def __init__(self, root_path: Path):
+        self.root_path = Path(root_path)
+
+        # Insertion-ordered sets of the created and modified paths
+        self.created: dict[Path, None] = {}
+        self.modified: dict[Path, None] = {}
+
+        self._token: contextvars.Token | None = None
+
+    def __enter__(self) -> "Manifest":
+        self._token = _current.set(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _current.reset(self._token)
+        self._token = None
+
+    @property
+    def paths(self) -> list[Path]:
+        """Every created and modified path."""
+
+        return [*self.created, *(path for path in self.modified if path not in self.created)]
+
+    def add_created(self, path: Path) -> None:
+        path = Path(path)
+
+        self.created[path] = None
+        self.modified.pop(path, None)
+
+    def add_modified(self, path: Path) -> None:
+        path = Path(path)
+
+        # A file that was created in this run is still new, even if it was modified afterwards
+        if path not in self.created:
+            self.modified[path] = None
+
+    def add_created_tree(self, directory: Path) -> None:
+        """Add a directory that was created, along with everything in it."""
+
+        directory = Path(directory)
+
+        if not directory.exists():
+            return
+
+        self.add_created(directory)
+
+        for dirpath, dirnames, filenames in os.walk(directory):
+            for name in [*dirnames, *filenames]:
+                self.add_created(Path(dirpath) / name)
+
+    def discard(self, path: Path) -> None:
+        """Forget a path, and anything in it, e.g. because it was removed again."""
+
+        path = Path(path)
+
+        for paths in (self.created, self.modified):
+            for recorded_path in list(paths):
+                if recorded_path == path or recorded_path.is_relative_to(path):
+                    del paths[recorded_path]
+
+    def move(self, source: Path, target: Path) -> None:
+        """Update the paths in a directory or file that was moved."""
+
+        source = Path(source)
+        target = Path(target)
+
+        for paths in (self.created, self.modified):
+            for recorded_path in list(paths):
+                if recorded_path == source or recorded_path.is_relative_to(source):
+                    del paths[recorded_path]
+                    paths[target / recorded_path.relative_to(source)] = None
+
+
+def get_current() -> Manifest | None:
+    """Get the manifest of the current run, if there is one."""
+
+    return _current.get()
+
+
+def record_created(path: Path) -> None:
+    """Record a path that was created in the current run."""
+
+    manifest = get_current()
+
+    if manifest is not None:
+        manifest.add_created(path)
+
+
+def record_created_tree(directory: Path) -> None:
+    """Record a directory that was created in the current run, along with everything in it."""
+
+    manifest = get_current()
+
+    if manifest is not None:
+        manifest.add_created_tree(directory)
+
+
+def record_modified(path: Path) -> None:
+    """Record a file that was modified in the current run."""
+
+    manifest = get_current()
+
+    if manifest is not None:
+        manifest.add_modified(path)
+
+
+def record_removed(path: Path) -> None:
+    """Forget a path that was created in the current run and then removed again."""
+
+    manifest = get_current()
+
+    if manifest is not None:
+        manifest.discard(path)
+
+
+def record_moved(source: Path, target: Path) -> None:
+    """Update the paths that were created in the current run and then moved."""
+
+    manifest = get_current()
+
+    if manifest is not None:
+        manifest.move(source, target)
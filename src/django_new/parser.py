@@ -1,25 +1,82 @@
+import ast
+import io
+import re
+import tokenize
+from dataclasses import dataclass
 from pathlib import Path
 
-import libcst as cst
+# Line endings that the Python tokenizer recognises
+NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+
+# A comment up to the end of the line
+COMMENT_RE = re.compile(r"#[^\r\n]*")
+
+# Whitespace, line continuations and comments that can appear between an expression and its closing parentheses
+SKIP_RE = re.compile(r"(?:[ \t\f\r\n\\]|#[^\r\n]*)+")
+
+# Tokens of f-strings that span their content on Python 3.12+
+FSTRING_TOKEN_TYPES = {
+    getattr(tokenize, name) for name in ("FSTRING_START", "FSTRING_MIDDLE", "FSTRING_END") if hasattr(tokenize, name)
+}
+
+# How many parsed modules to keep around for re-use during a run
+PARSED_MODULES_CACHE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class Assignment:
+    """The value assigned to a variable."""
+
+    # The parsed value
+    node: ast.expr
+
+    # Source code of the value, exactly as it is written in the file
+    code: str
+
+
+def parse(src: str) -> ast.Module:
+    """Parse Python code into an `ast` tree, re-using the tree when the same code was recently parsed in the current
+    run.
+
+    `ast` trees are much cheaper to build than `libcst` trees, so they are used for read-only queries. The trees are
+    shared, so they must not be modified.
+    """
+
+    # Imported here because the transformer package imports this module
+    from django_new.transformer.operations.cache import get_cache  # noqa: PLC0415
+
+    cache = get_cache("ast_modules", PARSED_MODULES_CACHE_SIZE)
+    module = cache.get(src) if cache is not None else None
+
+    if module is None:
+        module = ast.parse(src)
+
+        if cache is not None:
+            cache.set(src, module)
+
+    return module
 
 
 def get_class_name(path: Path, base_class_name: str) -> str | None:
     src = path.read_text()
-    module = cst.parse_module(src)
+    module = parse(src)
 
-    def dotted_name(expr: cst.BaseExpression) -> str | None:
-        if isinstance(expr, cst.Name):
-            return expr.value
+    def dotted_name(expr: ast.expr) -> str | None:
+        if isinstance(expr, ast.Starred):
+            expr = expr.value
+
+        if isinstance(expr, ast.Name):
+            return expr.id
 
         parts: list[str] = []
-        cur: cst.BaseExpression | None = expr
+        cur: ast.expr | None = expr
 
-        while isinstance(cur, cst.Attribute):
-            parts.append(cur.attr.value)
+        while isinstance(cur, ast.Attribute):
+            parts.append(cur.attr)
             cur = cur.value
 
-        if isinstance(cur, cst.Name):
-            parts.append(cur.value)
+        if isinstance(cur, ast.Name):
+            parts.append(cur.id)
 
         if not parts:
             return None
@@ -27,11 +84,133 @@ def get_class_name(path: Path, base_class_name: str) -> str | None:
         return ".".join(reversed(parts))
 
     for stmt in module.body:
-        if isinstance(stmt, cst.ClassDef):
-            for arg in stmt.bases:
-                base = dotted_name(arg.value)
+        if isinstance(stmt, ast.ClassDef):
+            for base_expr in stmt.bases:
+                base = dotted_name(base_expr)
 
                 if base and (base == base_class_name or base.endswith(f".{base_class_name}")):
-                    return stmt.name.value
+                    return stmt.name
 
     return None
+
+
+def find_assignment(src: str, name: str) -> Assignment | None:
+    """Find the value of the last assignment to a variable.
+
+    The name can be a module-level variable (e.g. "INSTALLED_APPS") or use dot notation for a class attribute (e.g.
+    "Settings.INSTALLED_APPS").
+    """
+
+    finder = _AssignmentFinder(name)
+    finder.visit(parse(src))
+
+    if finder.node is None:
+        return None
+
+    return Assignment(node=finder.node.value, code=_get_value_code(src, finder.node))
+
+
+class _AssignmentFinder(ast.NodeVisitor):
+    """Uses the same dotted names as `SettingsIndex`."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.node: ast.Assign | None = None
+        self.class_names: list[str] = []
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.class_names.append(node.name)
+        self.generic_visit(node)
+        self.class_names.pop()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        target = node.targets[0]
+        parts = []
+
+        while isinstance(target, ast.Attribute):
+            parts.append(target.attr)
+            target = target.value
+
+        if not isinstance(target, ast.Name):
+            return
+
+        parts.append(target.id)
+        parts.reverse()
+
+        # Names are relative to the enclosing classes, attributes are already qualified
+        if len(parts) == 1:
+            parts = [*self.class_names, *parts]
+
+        if ".".join(parts) == self.name:
+            self.node = node
+
+
+def _get_value_code(src: str, node: ast.Assign) -> str:
+    """Get the source code of an assigned value, including any parentheses around it.
+
+    `ast` does not include redundant parentheses in the position of an expression, so they are found by looking at
+    the code between the last `=` and the value.
+    """
+
+    line_starts = [0, *(match.end() for match in NEWLINE_RE.finditer(src))]
+
+    def get_offset(lineno: int, col_offset: int) -> int:
+        start = line_starts[lineno - 1]
+        line = src[start : line_starts[lineno]] if lineno < len(line_starts) else src[start:]
+
+        # Column offsets are in UTF-8 bytes
+        return start + len(line.encode()[:col_offset].decode())
+
+    target = node.targets[-1]
+    target_end = get_offset(target.end_lineno, target.end_col_offset)
+    start = get_offset(node.value.lineno, node.value.col_offset)
+    end = get_offset(node.value.end_lineno, node.value.end_col_offset)
+
+    # Only whitespace can be between the last target and the `=`, but comments can be after it
+    prefix_start = src.index("=", target_end) + 1
+    prefix = src[prefix_start:start]
+    paren_count = COMMENT_RE.sub("", prefix).count("(")
+
+    if paren_count:
+        start = prefix_start + prefix.index("(")
+
+        for _ in range(paren_count):
+            match = SKIP_RE.match(src, end)
+
+            if match:
+                end = match.end()
+
+            end += 1  # The closing parenthesis
+
+    code = src[start:end]
+
+    # Continuation lines are relative to the indentation of the statement, like they are in libcst
+    line = src[line_starts[node.lineno - 1] :]
+    indent = line[: len(line) - len(line.lstrip(" \t\f"))]
+
+    if indent and ("\n" in code or "\r" in code):
+        code = _dedent_continuation_lines(code, indent)
+
+    return code
+
+
+def _dedent_continuation_lines(code: str, indent: str) -> str:
+    """Remove the indentation from every line after the first one, except for lines inside a string."""
+
+    string_rows: set[int] = set()
+
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            if token.type == tokenize.STRING or token.type in FSTRING_TOKEN_TYPES:
+                string_rows.update(range(token.start[0] + 1, token.end[0] + 1))
+    except (tokenize.TokenError, SyntaxError):
+        return code
+
+    lines = NEWLINE_RE.split(code)
+    separators = NEWLINE_RE.findall(code)
+
+    for idx in range(1, len(lines)):
+        if idx + 1 not in string_rows and lines[idx].startswith(indent):
+            lines[idx] = lines[idx][len(indent) :]
+
+    return "".join(line + separator for line, separator in zip(lines, [*separators, ""], strict=True))
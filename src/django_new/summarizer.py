@@ -1,5 +1,9 @@
+import functools
+import hashlib
+import logging
+import os
 from datetime import datetime
-from io import StringIO
+from html import escape as html_escape
 from pathlib import Path
 
 import typer
@@ -11,7 +15,18 @@ from rich.markup import escape
 from rich.text import Text
 from rich.tree import Tree
 
-from django_new.transformer import resolve_transformation
+from django_new.summary_archive import ARCHIVE_PATH_NAME, SummaryArchive, compact_summaries
+from django_new.transformer import Transformation
+from django_new.transformer.planner import Planner
+from django_new.walker import TreeNode, build_tree, build_tree_from_paths, render_plain
+
+logger = logging.getLogger(__name__)
+
+# Rendered HTML of each markdown summary, named by the hash of the markdown; hidden so it is not in the project tree
+FRAGMENTS_PATH_NAME = "django_new/.fragments"
+
+# Bump when the markdown gets rendered differently, so the cached fragments are rendered again
+FRAGMENTS_VERSION = "1"
 
 
 class Summarizer:
@@ -20,17 +35,45 @@ class Summarizer:
         self.project_already_existed = self.ctx.obj["project_already_existed"]
         self.folder_path = self.ctx.obj["folder_path"]
 
-    def write_to_console(self, console: Console):
+    @functools.cached_property
+    def tree(self) -> TreeNode:
+        """The tree of the paths that were created or modified; built once and shared by the console and markdown
+        output.
+
+        Without a manifest of the run, the whole project is walked instead.
+        """
+
+        manifest = self.ctx.obj.get("manifest")
+
+        if manifest is None:
+            return build_tree(self.folder_path)
+
+        return build_tree_from_paths(self.folder_path, manifest.paths)
+
+    @functools.cached_property
+    def transformations(self) -> list[Transformation]:
+        """The installed transformations, including the ones they require, in the order they were installed."""
+
+        install = self.ctx.params["install"]
+
+        if not install:
+            return []
+
+        return [cls(root_path=self.folder_path) for cls in Planner(*install).resolve()]
+
+    def write_to_console(self, console: Console, *, show_tree: bool = True):
         if self.project_already_existed:
             console.print(Markdown("# Success! 🚀"))
         else:
             console.print(Markdown("# Your new Django application is ready to go! 🚀"))
 
         # Generate project structure
-        console.print("\nProject Structure\n", style="bold underline")
+        if show_tree:
+            console.print("\nProject Structure\n", style="bold underline")
+
+            tree = get_tree(self.tree)
+            console.print(tree)
 
-        tree = get_tree(self.folder_path)
-        console.print(tree)
         console.print()
 
         console.print(
@@ -61,13 +104,8 @@ class Summarizer:
                 "Run the following command to start the development server: `uv run python manage.py runserver`"
             )
 
-        if self.ctx.params["install"]:
-            for transformation_name in self.ctx.params["install"]:
-                transformation_cls = resolve_transformation(transformation_name)
-                transformation = transformation_cls(root_path=self.folder_path)
-
-                transformation_next_steps = transformation.get_next_steps()
-                next_steps.extend(transformation_next_steps)
+        for transformation in self.transformations:
+            next_steps.extend(transformation.get_next_steps())
 
         for idx, step in enumerate(next_steps):
             next_steps_md += f"{idx + 1}. {step}\n"
@@ -108,13 +146,21 @@ class Summarizer:
 The following files and directories were created:
 """
 
-        tree_markdown = get_tree_markdown(self.folder_path)
+        tree_markdown = get_tree_markdown(self.tree)
         content += f"""
 ```test
 {tree_markdown}
 ```
 """
 
+        manifest = self.ctx.obj.get("manifest")
+
+        if manifest is not None and manifest.modified:
+            content += "\nThe following files were modified:\n\n"
+
+            for path in manifest.modified:
+                content += f"- `{get_relative_path(path, self.folder_path)}`\n"
+
         if self.ctx.params["project"] is False and self.ctx.params["app"] is False:
             content += f"""
 ### Directories
@@ -130,15 +176,11 @@ The following files and directories were created:
 - `pyproject.toml`: Application-level dependencies.
 """
 
-        if self.ctx.params["install"]:
+        if self.transformations:
             content += "\n## Installed Packages\n"
 
-            for transformation_name in self.ctx.params["install"]:
-                transformation_cls = resolve_transformation(transformation_name)
-                transformation = transformation_cls(root_path=self.folder_path)
-
-                summary = transformation.get_summary()
-                content += summary
+            for transformation in self.transformations:
+                content += transformation.get_summary()
 
         next_steps = self.get_next_steps()
 
@@ -150,12 +192,15 @@ The following files and directories were created:
 """
 
         markdown_file = docs_dir / f"{now}.md"
-        markdown_file.write_text(f"""---
+        write_atomically(
+            markdown_file,
+            f"""---
 date: {now}
 ---
 
 {content}
-""")
+""",
+        )
 
     def write_summary_html(self) -> None:
         """Write an HTML file."""
@@ -173,68 +218,142 @@ date: {now}
 <main>
 """
 
-        md = MarkdownIt().use(front_matter_plugin)
+        # Keep the number of summaries that get rendered bounded
+        compact_summaries(self.folder_path)
 
-        for md_file in (self.folder_path / "django_new/md").glob("*.md"):
-            rendered_html = md.render(md_file.read_text())
-            html += rendered_html
+        html += "".join(get_summary_fragments(self.folder_path))
+        html += get_archive_html(self.folder_path)
 
         html += "</main></body></html>"
 
         html_file = docs_dir / "summary.html"
-        html_file.write_text(html)
+        write_atomically(html_file, html)
 
 
-def get_tree(directory: Path) -> str:
-    """Get the tree markdown."""
+def write_atomically(path: Path, content: str) -> None:
+    """Write a file through a temporary file, so a partly written file is never visible.
 
-    tree = Tree(
-        f":open_file_folder: [link file://{directory}]{directory}",
-        guide_style="",
+    The temporary file is named by the process, so summaries that are written in the background at the same time do
+    not write to the same temporary file.
+    """
+
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+    try:
+        temporary_path.write_text(content)
+        temporary_path.replace(path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+
+        raise
+
+
+def get_relative_path(path: Path, folder_path: Path) -> str:
+    try:
+        return Path(path).relative_to(folder_path).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def get_archive_html(folder_path: Path) -> str:
+    """Get the HTML that lists the archived summaries, newest first; only the index of the archive is read."""
+
+    archive = SummaryArchive(folder_path)
+
+    if not archive.summaries:
+        return ""
+
+    items = "".join(
+        f"<li>{html_escape(summary.title)} <small>({html_escape(summary.name)})</small></li>\n"
+        for summary in reversed(archive.summaries)
     )
-    walk_directory(directory, tree)
 
-    return tree
+    return f"""<h2>Archive</h2>
+<p>Older summaries are in <a href="{Path(ARCHIVE_PATH_NAME).name}">{Path(ARCHIVE_PATH_NAME).name}</a>.</p>
+<ul>
+{items}</ul>
+"""
 
 
-def get_tree_markdown(directory: Path) -> str:
-    """Get the tree markdown."""
+def get_summary_fragments(folder_path: Path) -> list[str]:
+    """Get the rendered HTML of every markdown summary, oldest first.
+
+    Each fragment is cached in a file named by the hash of its markdown, so only new or changed summaries get
+    rendered. Cached fragments that no longer belong to a summary are removed.
+    """
+
+    fragments_dir = folder_path / FRAGMENTS_PATH_NAME
+    md = None
+
+    fragments = []
+    fragment_names = set()
+
+    # Summaries are named by their creation time, so sorting the names sorts them chronologically
+    for md_file in sorted((folder_path / "django_new/md").glob("*.md")):
+        content = md_file.read_text()
+        key = hashlib.sha256(f"{FRAGMENTS_VERSION}:{content}".encode()).hexdigest()
+
+        fragment_path = fragments_dir / f"{key}.html"
+        fragment_names.add(fragment_path.name)
+
+        try:
+            fragment = fragment_path.read_text()
+        except FileNotFoundError:
+            if md is None:
+                md = MarkdownIt().use(front_matter_plugin)
 
-    tree = get_tree(directory)
+            fragment = md.render(content)
 
-    # Capture tree output
-    capture_console = Console(file=StringIO(), width=100, force_terminal=False, color_system=None)
-    capture_console.print(tree)
-    tree_content = capture_console.file.getvalue()
+            fragments_dir.mkdir(parents=True, exist_ok=True)
 
-    return tree_content
+            write_atomically(fragment_path, fragment)
 
+            logger.debug(f"Rendered {md_file}")
 
-def walk_directory(directory: Path, tree: Tree) -> None:
-    """Recursively build a Tree with directory contents."""
+        fragments.append(fragment)
 
-    # Sort dirs first then by filename
-    paths = sorted(
-        directory.iterdir(),
-        key=lambda path: (path.is_file(), path.name.lower()),
+    if fragments_dir.exists():
+        for fragment_path in fragments_dir.glob("*.html"):
+            if fragment_path.name not in fragment_names:
+                fragment_path.unlink(missing_ok=True)
+
+    return fragments
+
+
+def get_tree(root: TreeNode) -> Tree:
+    """Get the rich tree to print to the console."""
+
+    tree = Tree(
+        f":open_file_folder: [link file://{root.path}]{root.name}",
+        guide_style="",
     )
+    add_children(root, tree)
 
-    for path in paths:
-        # Remove hidden files
-        if path.name.startswith("."):
-            continue
+    return tree
 
-        if path.is_dir():
-            style = "dim" if path.name.startswith("__") else ""
 
-            branch = tree.add(
-                f":open_file_folder: [link file://{path}]{escape(path.name)}",
+def add_children(node: TreeNode, branch: Tree) -> None:
+    for child in node.children:
+        if child.is_dir:
+            style = "dim" if child.name.startswith("__") else ""
+
+            child_branch = branch.add(
+                f":open_file_folder: [link file://{child.path}]{escape(child.name)}",
                 style=style,
                 guide_style=style,
             )
-            walk_directory(path, branch)
+            add_children(child, child_branch)
         else:
-            text_filename = Text(path.name, "blue")
-            text_filename.stylize(f"link file://{path}")
+            text_filename = Text(child.name, "blue")
+            text_filename.stylize(f"link file://{child.path}")
+
+            branch.add(text_filename)
+
+    if node.more:
+        branch.add(Text(f"… {node.more} more", "dim"))
+
+
+def get_tree_markdown(root: TreeNode) -> str:
+    """Get the tree markdown."""
 
-            tree.add(text_filename)
+    return render_plain(root)
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SUMMARIES_PATH_NAME = "django_new/md"
+ARCHIVE_PATH_NAME = "django_new/archive.md"
+ARCHIVE_INDEX_PATH_NAME = "django_new/archive.json"
+
+# Held by the process that is compacting the summaries, so only one process changes the archive at a time
+ARCHIVE_LOCK_PATH_NAME = "django_new/archive.lock"
+
+# A lock that is older than this was left behind by a process that stopped before it finished
+STALE_LOCK_AGE = timedelta(minutes=10)
+
+# Front matter at the start of a summary
+FRONT_MATTER_RE = re.compile(r"\A---\r?\n.*?\r?\n---\r?\n", re.DOTALL)
+
+# The first top-level heading of a summary
+TITLE_RE = re.compile(r"^# (.+)$", re.MULTILINE)
+
+# The comment that starts each summary in the archive, with the name of the summary
+SUMMARY_START_RE = re.compile(rb"^<!-- (.+?) -->\n", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How many summaries to keep as separate files; older summaries are compacted into the archive."""
+
+    # Keep at most this many summaries; `None` keeps any number
+    max_count: int | None = 50
+
+    # Keep summaries that are at most this old; `None` keeps summaries of any age
+    max_age: timedelta | None = None
+
+
+@dataclass(frozen=True)
+class ArchivedSummary:
+    """A summary in the archive."""
+
+    # File name of the summary without the extension, i.e. when it was created
+    name: str
+
+    # First heading of the summary
+    title: str
+
+    # Where the summary is in the archive, in bytes
+    offset: int
+    length: int
+
+
+class SummaryArchive:
+    """Older summaries, compacted into one markdown file with a JSON index.
+
+    The index lists each summary with its position in the archive, so a summary can be read without reading the
+    whole archive. When the index is missing or cannot be used, it is built again from the archive.
+    """
+
+    def __init__(self, folder_path: Path):
+        self.folder_path = Path(folder_path)
+        self.path = self.folder_path / ARCHIVE_PATH_NAME
+        self.index_path = self.folder_path / ARCHIVE_INDEX_PATH_NAME
+
+        self.summaries, self.size = self._load_index()
+
+    def read(self, summary: ArchivedSummary) -> str:
+        """Read one summary from the archive."""
+
+        with self.path.open("rb") as f:
+            f.seek(summary.offset)
+
+            return f.read(summary.length).decode()
+
+    def add(self, summary_paths: list[Path]) -> None:
+        """Append summaries to the archive and update the index; the summary files are not removed."""
+
+        if not summary_paths:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self.path.open("ab") as f:
+            # Anything after the indexed size was written by a compaction that did not finish; the indexed size is
+            # never more than the size of the archive, so no archived summaries are removed
+            f.truncate(self.size)
+            f.seek(self.size)
+
+            for summary_path in summary_paths:
+                content = FRONT_MATTER_RE.sub("", summary_path.read_text(), count=1).strip()
+
+                data = f"<!-- {summary_path.stem} -->\n{content}\n\n".encode()
+                f.write(data)
+
+                self.summaries.append(
+                    ArchivedSummary(
+                        name=summary_path.stem,
+                        title=get_title(content, summary_path.stem),
+                        offset=self.size,
+                        length=len(data),
+                    )
+                )
+                self.size += len(data)
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._save_index()
+
+    def _load_index(self) -> tuple[list[ArchivedSummary], int]:
+        try:
+            data = json.loads(self.index_path.read_text())
+            summaries = [ArchivedSummary(**summary) for summary in data["summaries"]]
+            size = data["size"]
+        except FileNotFoundError:
+            return self._build_index()
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Rebuilding invalid archive index {self.index_path}: {e}")
+
+            return self._build_index()
+
+        try:
+            archive_size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            archive_size = 0
+
+        # The archive was changed without the index, e.g. replaced by an older copy
+        if not isinstance(size, int) or size > archive_size:
+            logger.debug(f"Rebuilding archive index {self.index_path}: it does not match {self.path}")
+
+            return self._build_index()
+
+        return summaries, size
+
+    def _build_index(self) -> tuple[list[ArchivedSummary], int]:
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return [], 0
+
+        summaries = []
+        matches = list(SUMMARY_START_RE.finditer(data))
+
+        for match, next_match in zip(matches, [*matches[1:], None], strict=True):
+            end = next_match.start() if next_match is not None else len(data)
+            name = match.group(1).decode()
+
+            summaries.append(
+                ArchivedSummary(
+                    name=name,
+                    title=get_title(data[match.end() : end].decode(), name),
+                    offset=match.start(),
+                    length=end - match.start(),
+                )
+            )
+
+        return summaries, len(data)
+
+    def _save_index(self) -> None:
+        data = {
+            "size": self.size,
+            "summaries": [summary.__dict__ for summary in self.summaries],
+        }
+
+        # Named by the process, so indexes that are saved at the same time do not write to the same temporary file
+        temporary_path = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+
+        try:
+            temporary_path.write_text(json.dumps(data, indent=2))
+            temporary_path.replace(self.index_path)
+        except BaseException:
+            temporary_path.unlink(missing_ok=True)
+
+            raise
+
+
+def get_title(content: str, name: str) -> str:
+    """Get the first heading of a summary, or its name when it has no heading."""
+
+    title_match = TITLE_RE.search(content)
+
+    return title_match.group(1).strip() if title_match else name
+
+
+def get_summary_date(summary_path: Path) -> datetime:
+    """Get when a summary was created from its name, or from its modification time."""
+
+    try:
+        return datetime.fromisoformat(summary_path.stem)
+    except ValueError:
+        return datetime.fromtimestamp(summary_path.stat().st_mtime)  # noqa: DTZ006
+
+
+def acquire_lock(lock_path: Path) -> bool:
+    """Create a lock file, unless another process holds the lock.
+
+    A lock file that is older than `STALE_LOCK_AGE` is replaced.
+
+    Returns:
+        Whether the lock was acquired.
+    """
+
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = time.time() - lock_path.stat().st_mtime
+            except FileNotFoundError:
+                # Released in the meantime
+                continue
+
+            if age < STALE_LOCK_AGE.total_seconds():
+                return False
+
+            logger.debug(f"Replacing stale lock {lock_path}")
+            lock_path.unlink(missing_ok=True)
+
+            continue
+
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+
+        return True
+
+    return False
+
+
+def compact_summaries(
+    folder_path: Path, policy: RetentionPolicy | None = None, now: datetime | None = None
+) -> list[Path]:
+    """Move the summaries that the retention policy does not keep into the archive.
+
+    Only one process compacts the summaries at a time; when another process holds the lock, nothing is archived and
+    the summaries are compacted the next time instead.
+
+    Returns:
+        The paths of the summaries that were archived.
+    """
+
+    policy = policy or RetentionPolicy()
+    now = now or datetime.now()  # noqa: DTZ005
+
+    summaries_path = Path(folder_path) / SUMMARIES_PATH_NAME
+
+    if not summaries_path.is_dir():
+        return []
+
+    lock_path = Path(folder_path) / ARCHIVE_LOCK_PATH_NAME
+
+    if not acquire_lock(lock_path):
+        logger.debug(f"Not compacting summaries: {lock_path} is held by another process")
+
+        return []
+
+    try:
+        # Summaries are named by their creation time, so sorting the names sorts them chronologically
+        summary_paths = sorted(summaries_path.glob("*.md"))
+        keep_count = len(summary_paths)
+
+        if policy.max_count is not None:
+            keep_count = min(keep_count, policy.max_count)
+
+        archive_paths = summary_paths[: len(summary_paths) - keep_count]
+
+        if policy.max_age is not None:
+            archive_paths.extend(
+                summary_path
+                for summary_path in summary_paths[len(archive_paths) :]
+                if now - get_summary_date(summary_path) > policy.max_age
+            )
+
+        if not archive_paths:
+            return []
+
+        SummaryArchive(folder_path).add(archive_paths)
+
+        # Only remove the summaries once the archive has them
+        for summary_path in archive_paths:
+            summary_path.unlink(missing_ok=True)
+    finally:
+        lock_path.unlink(missing_ok=True)
+
+    logger.debug(f"Archived {len(archive_paths)} summaries")
+
+    return archive_paths
@@ -0,0 +1,117 @@
+import json
+import logging
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import typer
+
+from django_new.manifest import Manifest
+from django_new.summarizer import Summarizer
+
+logger = logging.getLogger(__name__)
+
+# The parameters of the command that the summary uses
+PARAM_NAMES = ("name", "project", "app", "install")
+
+
+@dataclass
+class SummaryContext:
+    """The parts of the command's context that a `Summarizer` uses, re-created from a payload in the worker."""
+
+    obj: dict[str, Any]
+    params: dict[str, Any]
+
+
+def get_payload(ctx: typer.Context) -> dict[str, Any]:
+    """Get everything the worker needs to write the summary, as JSON-serialisable data."""
+
+    manifest = ctx.obj.get("manifest")
+
+    return {
+        "params": {name: ctx.params.get(name) for name in PARAM_NAMES},
+        "obj": {
+            "folder_path": str(ctx.obj["folder_path"]),
+            "project_already_existed": ctx.obj["project_already_existed"],
+            "project_name": ctx.obj["project_name"],
+            "app_name": ctx.obj["app_name"],
+        },
+        "manifest": None
+        if manifest is None
+        else {
+            "created": [str(path) for path in manifest.created],
+            "modified": [str(path) for path in manifest.modified],
+        },
+    }
+
+
+def load_context(payload: dict[str, Any]) -> SummaryContext:
+    """Re-create the context of the command from a payload."""
+
+    obj = dict(payload["obj"])
+    obj["folder_path"] = Path(obj["folder_path"])
+
+    if payload.get("manifest") is not None:
+        manifest = Manifest(obj["folder_path"])
+
+        for path in payload["manifest"]["created"]:
+            manifest.add_created(Path(path))
+
+        for path in payload["manifest"]["modified"]:
+            manifest.add_modified(Path(path))
+
+        obj["manifest"] = manifest
+
+    return SummaryContext(obj=obj, params=dict(payload["params"]))
+
+
+def write_summary(ctx: typer.Context | SummaryContext) -> None:
+    """Write the markdown summary of the run and re-build `summary.html`."""
+
+    summarizer = Summarizer(ctx=ctx)
+    summarizer.write_summary_markdown()
+    summarizer.write_summary_html()
+
+
+def start_summary_worker(ctx: typer.Context) -> subprocess.Popen | None:
+    """Start a detached process that writes the summary, so the command can return before it is written.
+
+    Returns:
+        The process, or `None` if it could not be started.
+    """
+
+    if sys.platform == "win32":
+        kwargs = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        # A new session keeps the worker running when the terminal sends a signal to the command's process group
+        kwargs = {"start_new_session": True}
+
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "django_new.summary_worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **kwargs,
+        )
+
+        process.stdin.write(json.dumps(get_payload(ctx)).encode())
+        process.stdin.close()
+    except OSError as e:
+        logger.debug(f"Could not start the summary worker: {e}")
+
+        return None
+
+    logger.debug(f"Started the summary worker with pid {process.pid}")
+
+    return process
+
+
+def main() -> None:
+    write_summary(load_context(json.loads(sys.stdin.read())))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ from typing import Any
 
 from django.template import Context, Engine
 
+from django_new.manifest import record_created
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,4 +51,5 @@ def create_file(
         logger.debug(f"Render template content with context {template_file.context}")
 
         template_file.path.write_text(rendered_content)
+        record_created(template_file.path)
         logger.debug(f"Created template file, {template_file.path}")
@@ -1,22 +1,74 @@
+import functools
 import importlib
 import inspect
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
+from django_new.manifest import record_modified
+from django_new.transformer.journal import Journal
 from django_new.transformer.operations import Operation
+from django_new.transformer.operations.cache import RunCache
+from django_new.transformer.operations.instrumentation import apply_operation
 from django_new.transformer.operations.python import GetVariable as PythonGetVariable
+from django_new.transformer.operations.python import contains_name
 from django_new.transformer.operations.toml import GetVariable as TomlGetVariable
+from django_new.transformer.plan import Plan
+from django_new.transformer.registry import get_entry_point
+from django_new.transformer.settings_package import SettingsPackage
+from django_new.transformer.state import State
 
 logger = logging.getLogger(__name__)
 
+# How a transformation edits a setting; only appends to the end of a list give the same result in any order
+APPEND = "append"
+
+# Inserts items at a position that depends on the other items, e.g. after `SecurityMiddleware` in `MIDDLEWARE`
+INSERT = "insert"
+
+# Sets the value of a setting or of one of its keys, e.g. `STORAGES.staticfiles.BACKEND`
+ASSIGN = "assign"
+
 
 class Transformation:
     """Base class for transformations"""
 
+    # Name used in log and error messages; defaults to the name of the module
+    name: str | None = None
+
+    # Transformations (names or classes) that have to be installed before this one
+    requires: tuple[str | type["Transformation"], ...] = ()
+
+    # Transformations (names or classes) that cannot be installed together with this one
+    conflicts_with: tuple[str | type["Transformation"], ...] = ()
+
+    # Settings (or dotted keys of dict settings) that the transformation edits, and how, e.g.
+    # `{"INSTALLED_APPS": APPEND, "STORAGES.staticfiles.BACKEND": ASSIGN}`; transformations that edit the same setting,
+    # other than both appending to it, have to require one another so they are applied in a fixed order
+    settings: ClassVar[dict[str, str]] = {}
+
+    # Bump when the changes the transformation makes are different, so it gets applied again
+    version: str = "1"
+
     def __init__(self, root_path: Path):
         self.root_path = Path(root_path)
-        self._changes = []
+        self.journal = Journal(self.root_path)
+
+        # When set, modifications are queued in the plan instead of being written to disk
+        self.plan: Plan | None = None
+
+        # Files that the transformation modified; hashed in the state file once the changes are written
+        self.modified_paths: set[Path] = set()
+
+        # Data from `get_data()` that was stored in the state file when the transformation was applied; loaded before
+        # `backwards()` runs
+        self.data: dict[str, Any] = {}
+
+    @classmethod
+    def get_name(cls) -> str:
+        """Get the name of the transformation."""
+
+        return cls.name or cls.__module__.rsplit(".", 1)[-1]
 
     def forwards(self):
         """Apply the migration"""
@@ -47,8 +99,19 @@ class Transformation:
 
         return path
 
-    def get_settings_file(self) -> Path:
-        """Get the path to the settings file."""
+    def get_settings_file(self, environment: str | None = None) -> Path:
+        """Get the path to the settings file.
+
+        When the settings are split into a package, e.g. `config/settings/base.py` and `config/settings/production.py`,
+        `environment` selects the module for an environment, e.g. "production" or "local". Settings that are not split
+        are shared by every environment, so the one settings file is returned.
+        """
+
+        if environment is not None:
+            settings_package = self.get_settings_package()
+
+            if settings_package is not None:
+                return settings_package.get_path(environment)
 
         paths = [
             self.root_path / "config/settings.py",
@@ -57,58 +120,129 @@ class Transformation:
             self.root_path / "settings.py",
         ]
 
-        for path in paths:
-            if path.exists():
+        existing_paths = [path for path in paths if path.exists()]
+
+        # Prefer the file that actually configures the apps; checking the text is much cheaper than parsing it
+        for path in existing_paths:
+            if contains_name(path.read_text(), "INSTALLED_APPS"):
                 return path
 
+        if existing_paths:
+            return existing_paths[0]
+
         raise FileNotFoundError("settings file not found")
 
+    def get_settings_package(self) -> SettingsPackage | None:
+        """Get the settings package, or `None` if the settings are not split into modules per environment."""
+
+        return SettingsPackage.find(self.root_path, self.get_settings_file(), read_text=self.read_text)
+
+    def get_setting(self, name: str, environment: str | None = None) -> Any:
+        """Get the value of a setting, following `from .base import *` to the module that defines it.
+
+        Raises:
+            ValueError: If the setting is not defined.
+        """
+
+        settings_package = self.get_settings_package() if environment is not None else None
+
+        if settings_package is None:
+            return self.get_variable(self.get_settings_file(), name)
+
+        path = settings_package.find_definition(environment, name)
+
+        if path is None:
+            raise ValueError(f"Setting '{name}' not found for environment '{environment}'")
+
+        return self.get_variable(path, name)
+
+    def modify_settings(self, operation: Operation, environment: str | None = None):
+        """Apply an operation to the settings file of an environment"""
+
+        self.modify_file(self.get_settings_file(environment=environment), operation)
+
     def get_variable(self, path: str | Path, variable_name: str) -> Any:
-        """Get the value of a variable from a file"""
+        """Get the value of a variable from a file.
+
+        Literal values are returned as Python objects; a Python value that is not a literal is returned as an
+        `Expression`.
+        """
 
         path = self.get_path(path)
 
         # Read current content
-        content = path.read_text()
+        content = self.read_text(path)
 
         for operation_class in [TomlGetVariable, PythonGetVariable]:
             operation = operation_class(name=variable_name)
 
             if operation.can_handle(path=path):
                 try:
-                    return operation.apply(content=content)
+                    return operation.get_value(content=content)
                 except Exception:
                     raise
 
         raise ValueError(f"Variable '{variable_name}' not found in file '{path}'")
 
+    def read_text(self, path: Path) -> str:
+        """Read the current content of a file, including any planned changes"""
+
+        if self.plan is not None:
+            return self.plan.read_text(path)
+
+        return path.read_text()
+
     def modify_file(self, path: str | Path, operation: Operation):
         """Apply an operation to a file"""
 
+        original_path = path
         path = self.get_path(path)
 
         if not operation.can_handle(path):
             raise ValueError(f"Operation {type(operation).__name__} cannot handle file {path}")
 
-        # Read current content
-        content = path.read_text()
+        if self.plan is not None:
+            self.plan.add_operation(path, operation, original_path=original_path)
+            self.modified_paths.add(path)
 
-        # Store original for rollback
-        self._changes.append((path, content))
+            return
+
+        # Read current content
+        content = self.read_text(path)
 
         # Apply operation
-        new_content = operation.apply(content)
+        new_content = apply_operation(operation, content, path=path)
+
+        if new_content == content:
+            logger.debug(f"{operation.description()} did not change {path}")
+
+            return
+
+        # Store original on disk for rollback before the file is touched
+        self.journal.record(path)
 
         # Write new content to file
         path.write_text(new_content)
+        self.modified_paths.add(path)
+        record_modified(path)
 
     def rollback_changes(self):
         """Rollback all changes made during this session"""
 
-        for path, original_content in reversed(self._changes):
-            path.write_text(original_content)
+        self.journal.replay()
 
-        self._changes.clear()
+    def commit_changes(self):
+        """Keep all changes made during this session and discard the rollback journal"""
+
+        self.journal.clear()
+
+    def get_data(self) -> dict[str, Any]:
+        """Get data to store in the state file once the changes are written, e.g. values that `backwards()` restores.
+
+        The data has to be JSON serialisable.
+        """
+
+        return {}
 
     def get_next_steps(self) -> list[str]:
         """Get a list of next steps for the transformation. Each item in the list should be Markdown."""
@@ -121,13 +255,28 @@ class Transformation:
         return ""
 
 
+@functools.cache
 def resolve_transformation(name: str) -> type[Transformation]:
     """
     Resolve a transformation class from a string.
-    The string can be a short name (e.g. "whitenoise") which looks in
-    django_new.transformer.transformations, or a dotted path.
+    The string can be the name of a `django_new.transformations` entry point (e.g. "whitenoise"), a short name which
+    looks in django_new.transformer.transformations, or a dotted path.
+    Resolved classes are memoised, so each transformation is only imported once.
     """
 
+    entry_point = get_entry_point(name)
+
+    if entry_point is not None:
+        try:
+            obj = entry_point.load()
+        except (ImportError, AttributeError) as e:
+            raise ImportError(f"Could not load transformation entry point '{name}': {entry_point.value}") from e
+
+        if not (inspect.isclass(obj) and issubclass(obj, Transformation)):
+            raise ValueError(f"Entry point '{name}' is not a Transformation class: {entry_point.value}")
+
+        return obj
+
     module_path = name
 
     if "." not in name:
@@ -147,72 +296,95 @@ def resolve_transformation(name: str) -> type[Transformation]:
 
 
 class Runner:
-    """Runs transformations."""
+    """Runs transformations.
+
+    The operations of all transformations are queued per file, the files are modified in memory, and then all of them
+    are written together once every transformation succeeded.
+    """
 
     def __init__(self, path: Path, dry_run: bool = False):  # noqa: FBT001, FBT002
         self.path = path
         self.dry_run = dry_run
 
-        # Track operations in dry-run mode
-        self._operations = []
+        self.plan = Plan()
+
+        # Transformations that were skipped because they were already applied and their files are unchanged
+        self.skipped: list[Transformation] = []
 
     def install(self, *transformations: list[Transformation]) -> bool | list[tuple[Path, Operation]]:
         """Run forwards transformations."""
 
-        for transformation in transformations:
-            if self.dry_run:
-                # Intercept operations for dry run
-                original_modify = transformation.modify_file
+        return self._run(transformations, forwards=True)
 
-                def track_operation(path, operation):
-                    self._operations.append((path, operation))
+    def uninstall(self, *transformations: list[Transformation]) -> bool | list[tuple[Path, Operation]]:
+        """Run backwards transformations."""
 
-                transformation.modify_file = track_operation
+        return self._run(transformations, forwards=False)
 
-                try:
-                    transformation.forwards()
+    def get_diff(self) -> str:
+        """Get a unified diff of the changes planned in dry-run mode."""
 
-                    return self._operations
-                finally:
-                    transformation.modify_file = original_modify
-            else:
-                try:
-                    transformation.forwards()
-                except Exception as e:
-                    logger.exception(e)
-                    transformation.rollback_changes()
+        if not self.dry_run:
+            raise ValueError("A diff is only available in dry-run mode")
 
-                    raise
+        return self.plan.get_diff(self.path)
 
-        return True
+    def _run(
+        self, transformations: tuple[Transformation, ...], *, forwards: bool
+    ) -> bool | list[tuple[Path, Operation]]:
+        # Parsed code is shared by the operations of the run, and dropped when the run is over
+        with RunCache():
+            return self._run_transformations(transformations, forwards=forwards)
 
-    def uninstall(self, *transformations: list[Transformation]) -> bool | list[tuple[Path, Operation]]:
-        """Run backwards transformations."""
+    def _run_transformations(
+        self, transformations: tuple[Transformation, ...], *, forwards: bool
+    ) -> bool | list[tuple[Path, Operation]]:
+        if not self.dry_run:
+            self.plan = Plan()
+
+        state = State(self.path)
+        self.skipped = []
 
         for transformation in transformations:
-            if self.dry_run:
-                original_modify = transformation.modify_file
+            if forwards and state.is_applied(transformation):
+                logger.debug(f"{transformation.get_name()} is already applied and its files are unchanged")
+                self.skipped.append(transformation)
 
-                def track_operation(path, operation):
-                    self._operations.append((path, operation))
+                continue
 
-                transformation.modify_file = track_operation
+            transformation.plan = self.plan
 
-                try:
-                    transformation.backwards()
+            if not forwards:
+                transformation.data = state.get_data(transformation)
 
-                    return self._operations
-                finally:
-                    transformation.modify_file = original_modify
-            else:
-                try:
+            try:
+                if forwards:
+                    transformation.forwards()
+                else:
                     transformation.backwards()
+            except Exception as e:
+                logger.exception(e)
 
-                    return True
-                except Exception as e:
-                    logger.exception(e)
-                    transformation.rollback_changes()
+                raise
 
-                    raise
+        self.plan.apply()
+
+        if self.dry_run:
+            return self.plan.operations
+
+        for path in self.plan.commit(Journal(self.path)):
+            record_modified(path)
+
+        for transformation in transformations:
+            if transformation in self.skipped:
+                continue
+
+            if forwards:
+                state.record(transformation)
+            else:
+                state.remove(transformation)
+
+        if len(self.skipped) < len(transformations):
+            state.save()
 
         return True
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+JOURNAL_PATH_NAME = "django_new/.journal"
+INDEX_FILE_NAME = "index.json"
+
+
+class Journal:
+    """On-disk record of the original content of files that are being modified.
+
+    Only the first original of each file is stored, and it is fsync'd before the file is written, so the changes
+    can be rolled back even if the process gets killed part-way through.
+    """
+
+    def __init__(self, root_path: Path):
+        self.root_path = Path(root_path).resolve()
+        self.directory = self.root_path / JOURNAL_PATH_NAME
+        self.index_path = self.directory / INDEX_FILE_NAME
+
+        # Path of the modified file, relative to the root when it is inside of it -> name of the file with its
+        # original content
+        self._entries: dict[str, str] = {}
+
+    @property
+    def paths(self) -> list[Path]:
+        """Paths of the files that have been recorded."""
+
+        return [self.root_path / relative_path for relative_path in self._entries]
+
+    def exists(self) -> bool:
+        """Whether there is a journal on disk."""
+
+        return self.index_path.exists()
+
+    def record(self, path: Path) -> None:
+        """Store the original content of `path` before it gets modified for the first time."""
+
+        relative_path = self._get_key(path)
+
+        if relative_path in self._entries:
+            return
+
+        if not self._entries and self.exists():
+            raise RuntimeError(
+                f"Unfinished changes were found in {self.directory}. Run `django-new --recover` to restore them first."
+            )
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        entry_name = f"{len(self._entries)}.orig"
+        _write_durably(self.directory / entry_name, Path(path).read_bytes())
+
+        self._entries[relative_path] = entry_name
+        self._write_index()
+
+        logger.debug(f"Recorded original of {relative_path} in journal")
+
+    def replay(self) -> list[Path]:
+        """Restore the original content of every file in the journal, then remove the journal.
+
+        Returns:
+            The paths that were restored.
+        """
+
+        if not self._entries and self.exists():
+            self._entries = json.loads(self.index_path.read_text())["files"]
+
+        restored_paths = []
+
+        for relative_path, entry_name in self._entries.items():
+            path = self.root_path / relative_path
+            _write_durably(path, (self.directory / entry_name).read_bytes())
+            restored_paths.append(path)
+
+            logger.debug(f"Restored {relative_path} from journal")
+
+        self.clear()
+
+        return restored_paths
+
+    def clear(self) -> None:
+        """Remove the journal once the changes are final."""
+
+        # Removing the index is the commit point; stray entries without it are never replayed
+        self.index_path.unlink(missing_ok=True)
+
+        for entry_name in self._entries.values():
+            (self.directory / entry_name).unlink(missing_ok=True)
+
+        self._entries.clear()
+
+        if self.directory.exists() and not any(self.directory.iterdir()):
+            self.directory.rmdir()
+
+    def _get_key(self, path: Path) -> str:
+        path = Path(path).resolve()
+
+        try:
+            return path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            # A file outside of the project, e.g. a settings module that is symlinked into it, is restored by its
+            # absolute path
+            return path.as_posix()
+
+    def _write_index(self) -> None:
+        temporary_path = self.index_path.with_suffix(".tmp")
+        _write_durably(temporary_path, json.dumps({"files": self._entries}).encode())
+        temporary_path.replace(self.index_path)
+        _fsync_directory(self.directory)
+
+
+def _write_durably(path: Path, content: bytes) -> None:
+    with path.open("wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fsync_directory(path: Path) -> None:
+    # Directories cannot be opened on Windows
+    if os.name == "nt":
+        return
+
+    fd = os.open(path, os.O_RDONLY)
+
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
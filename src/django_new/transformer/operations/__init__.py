@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 
 
+class TargetNotFound(ValueError):  # noqa: N818
+    """The variable, key or value that an operation targets is not in the file"""
+
+
 class Operation(ABC):
     """Base class for all operations"""
 
@@ -0,0 +1,81 @@
+import contextvars
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+_current: contextvars.ContextVar["RunCache | None"] = contextvars.ContextVar("run_cache", default=None)
+
+
+class LRUCache:
+    """A bounded mapping that drops the least recently used items first."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._items:
+            return default
+
+        self._items.move_to_end(key)
+
+        return self._items[key]
+
+    def discard(self, key: Hashable) -> None:
+        """Remove an item if it is in the cache."""
+
+        self._items.pop(key, None)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+class RunCache:
+    """Parsed code and indexes that operations re-use during one run.
+
+    Used as a context manager, the cache is the current one for the run, so operations can get it with `get_cache`
+    without passing it around. Nothing is cached outside of a run, so no parsed code is kept alive once a run is over.
+    """
+
+    def __init__(self):
+        # Name -> cache, e.g. "modules" for the parsed Python modules
+        self.caches: dict[str, LRUCache] = {}
+
+        self._token: contextvars.Token | None = None
+
+    def __enter__(self) -> "RunCache":
+        self._token = _current.set(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _current.reset(self._token)
+        self._token = None
+        self.caches.clear()
+
+    def get_cache(self, name: str, max_size: int) -> LRUCache:
+        cache = self.caches.get(name)
+
+        if cache is None:
+            cache = self.caches[name] = LRUCache(max_size)
+
+        return cache
+
+
+def get_cache(name: str, max_size: int) -> LRUCache | None:
+    """Get a cache of the current run, or `None` outside of a run."""
+
+    run_cache = _current.get()
+
+    if run_cache is None:
+        return None
+
+    return run_cache.get_cache(name, max_size)
@@ -0,0 +1,224 @@
+from typing import Any
+
+import tomlkit
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+from django_new.transformer.operations import TargetNotFound
+from django_new.transformer.operations.cache import get_cache
+
+# How many indexes to keep around for re-use
+INDEXES_CACHE_SIZE = 8
+
+
+def parse_requirement(requirement: str | Requirement) -> Requirement:
+    """Parse a requirement string, e.g. "whitenoise[brotli]>=6.6; python_version >= '3.10'"."""
+
+    if isinstance(requirement, Requirement):
+        return requirement
+
+    try:
+        return Requirement(requirement)
+    except InvalidRequirement as e:
+        raise ValueError(f"Invalid requirement {requirement!r}: {e}") from e
+
+
+def merge_requirements(existing: Requirement, new: Requirement) -> Requirement:
+    """Merge two requirements for the same package.
+
+    The specifiers are combined so that both have to be satisfied, and the extras are combined. The marker of the new
+    requirement is used when it has one, and the name is spelled like the existing one.
+
+    Raises:
+        ValueError: When the requirements are for different packages, or their specifiers conflict.
+    """
+
+    check_same_package(existing, new)
+
+    specifier = existing.specifier & new.specifier
+
+    # Pinned versions have to satisfy the other specifiers
+    for spec in specifier:
+        if spec.operator in ("==", "===") and not spec.version.endswith(".*"):
+            if not specifier.contains(spec.version, prereleases=True):
+                raise ValueError(f"Cannot merge {str(existing)!r} and {str(new)!r}: the specifiers conflict")
+
+    merged = Requirement(str(new))
+    merged.name = existing.name
+    merged.specifier = specifier
+    merged.extras = existing.extras | new.extras
+    merged.marker = new.marker or existing.marker
+
+    return merged
+
+
+def check_same_package(existing: Requirement, new: Requirement) -> None:
+    """Check that two requirements are for the same package."""
+
+    if canonicalize_name(existing.name) != canonicalize_name(new.name):
+        raise ValueError(f"Cannot combine {str(existing)!r} and {str(new)!r}: they are for different packages")
+
+
+def upgrade_requirement(existing: Requirement, new: Requirement) -> Requirement:
+    """Replace the specifiers of a requirement, keeping its extras and marker unless the new requirement has them."""
+
+    check_same_package(existing, new)
+
+    upgraded = Requirement(str(new))
+    upgraded.name = existing.name
+    upgraded.extras = existing.extras | new.extras
+    upgraded.marker = new.marker or existing.marker
+
+    return upgraded
+
+
+class DependencyList:
+    """A list of requirement strings indexed by their PEP 503 normalised names.
+
+    The index is kept up to date by the methods that change the list, so the items must not be changed directly.
+    """
+
+    def __init__(self, items: list[Any]):
+        self.items = items
+        self.names: dict[str, int] = {}
+
+        self._build()
+
+    def __contains__(self, name: str) -> bool:
+        return canonicalize_name(name) in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> Requirement | None:
+        """Get the requirement for a package."""
+
+        idx = self.names.get(canonicalize_name(name))
+
+        if idx is None:
+            return None
+
+        return parse_requirement(self.items[idx])
+
+    def add(self, requirement: Requirement) -> None:
+        """Append a requirement for a package that is not in the list."""
+
+        self.items.append(str(requirement))
+        self.names[canonicalize_name(requirement.name)] = len(self.items) - 1
+
+    def replace(self, requirement: Requirement) -> None:
+        """Replace the requirement for a package in place."""
+
+        self.items[self.names[canonicalize_name(requirement.name)]] = str(requirement)
+
+    def remove(self, name: str) -> None:
+        """Remove the requirement for a package."""
+
+        del self.items[self.names[canonicalize_name(name)]]
+        self._build()
+
+    def _build(self) -> None:
+        self.names = {}
+
+        for idx, item in enumerate(self.items):
+            # Dependency groups can also contain tables, e.g. `{include-group = "test"}`
+            if not isinstance(item, str):
+                continue
+
+            try:
+                name = canonicalize_name(Requirement(item).name)
+            except InvalidRequirement:
+                continue
+
+            self.names.setdefault(name, idx)
+
+
+class DependencyIndex:
+    """Index of the dependencies in a parsed `pyproject.toml`.
+
+    Covers `project.dependencies`, `project.optional-dependencies` and `dependency-groups`. Each list is only indexed
+    when it is first used.
+    """
+
+    def __init__(self, doc: tomlkit.TOMLDocument):
+        self.doc = doc
+        self.lists: dict[tuple[str, ...], DependencyList] = {}
+
+    @classmethod
+    def from_document(cls, doc: tomlkit.TOMLDocument) -> "DependencyIndex":
+        """Get the index of a document, re-using it when the same document was already indexed during the run."""
+
+        cache = get_cache("dependency_indexes", INDEXES_CACHE_SIZE)
+
+        if cache is None:
+            return cls(doc)
+
+        cached = cache.get(id(doc))
+
+        if cached is not None and cached.doc is doc:
+            return cached
+
+        index = cls(doc)
+        cache.set(id(doc), index)
+
+        return index
+
+    @classmethod
+    def forget(cls, doc: tomlkit.TOMLDocument) -> None:
+        """Drop the index of a document whose lists were changed without it, so it is built again when it is next
+        used."""
+
+        cache = get_cache("dependency_indexes", INDEXES_CACHE_SIZE)
+
+        if cache is not None:
+            cache.discard(id(doc))
+
+    def get_list(self, group: str | None = None, extra: str | None = None, *, create: bool = False) -> DependencyList:
+        """Get the dependencies of the project, a dependency group, or an extra.
+
+        Raises:
+            TargetNotFound: When the list does not exist and `create` is `False`.
+        """
+
+        keys = get_keys(group=group, extra=extra)
+        items = self._get_items(keys, create=create)
+
+        dependency_list = self.lists.get(keys)
+
+        if dependency_list is None or dependency_list.items is not items:
+            dependency_list = DependencyList(items)
+            self.lists[keys] = dependency_list
+
+        return dependency_list
+
+    def _get_items(self, keys: tuple[str, ...], *, create: bool) -> list[Any]:
+        current = self.doc
+
+        for idx, key in enumerate(keys):
+            if key not in current:
+                if not create:
+                    raise TargetNotFound(f"'{'.'.join(keys[: idx + 1])}' not found")
+
+                current[key] = tomlkit.array() if idx == len(keys) - 1 else tomlkit.table()
+
+            current = current[key]
+
+        if not isinstance(current, list):
+            raise ValueError(f"'{'.'.join(keys)}' is not a list")
+
+        return current
+
+
+def get_keys(group: str | None = None, extra: str | None = None) -> tuple[str, ...]:
+    """Get the keys of a list of dependencies in `pyproject.toml`."""
+
+    if group is not None and extra is not None:
+        raise ValueError("Only one of group and extra can be set")
+
+    if group is not None:
+        return ("dependency-groups", group)
+
+    if extra is not None:
+        return ("project", "optional-dependencies", extra)
+
+    return ("project", "dependencies")
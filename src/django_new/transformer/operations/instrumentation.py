@@ -0,0 +1,171 @@
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django_new.transformer.operations import TargetNotFound
+
+if TYPE_CHECKING:
+    from django_new.transformer.operations import Operation
+
+logger = logging.getLogger(__name__)
+
+# Stages of applying an operation
+CHECK = "check"
+PARSE = "parse"
+TRANSFORM = "transform"
+SERIALISE = "serialise"
+
+
+@dataclass
+class OperationEvent:
+    """What happened when an operation was applied."""
+
+    operation: "Operation"
+
+    # The file the operation was applied to, if it was applied by a transformation
+    path: Path | None = None
+
+    # Stage -> seconds, e.g. "check", "parse", "transform" and "serialise"; stages that did not happen are missing
+    timings: dict[str, float] = field(default_factory=dict)
+
+    # Size of the content before and after the operation; `None` when the operation was applied to an already parsed
+    # document, e.g. in a `TomlSession`
+    input_bytes: int | None = None
+    output_bytes: int | None = None
+
+    # The exception the operation raised, if any
+    error: Exception | None = None
+
+    @property
+    def found(self) -> bool:
+        """Whether the operation found what it targets; operations raise `TargetNotFound` when they do not."""
+
+        return not isinstance(self.error, TargetNotFound)
+
+    @property
+    def duration(self) -> float:
+        return sum(self.timings.values())
+
+
+Hook = Callable[[OperationEvent], None]
+
+# Replaced instead of modified, so the hooks can be called without holding the lock
+_hooks: tuple[Hook, ...] = ()
+_hooks_lock = threading.Lock()
+
+_current: contextvars.ContextVar[OperationEvent | None] = contextvars.ContextVar("operation_event", default=None)
+
+
+def add_hook(hook: Hook) -> Hook:
+    """Call `hook` with an `OperationEvent` every time an operation is applied.
+
+    Returns the hook, so it can be used as a decorator.
+    """
+
+    global _hooks  # noqa: PLW0603
+
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks = (*_hooks, hook)
+
+    return hook
+
+
+def remove_hook(hook: Hook) -> None:
+    """Stop calling a hook; hooks that were not added are ignored."""
+
+    global _hooks  # noqa: PLW0603
+
+    with _hooks_lock:
+        _hooks = tuple(added_hook for added_hook in _hooks if added_hook != hook)
+
+
+@contextlib.contextmanager
+def hook(func: Hook) -> Iterator[Hook]:
+    """Call `func` for the operations that are applied within the block."""
+
+    add_hook(func)
+
+    try:
+        yield func
+    finally:
+        remove_hook(func)
+
+
+def emit(event: OperationEvent) -> None:
+    """Call every hook with an event; a hook that fails is logged and does not stop the operation."""
+
+    for added_hook in _hooks:
+        try:
+            added_hook(event)
+        except Exception:
+            logger.exception(f"Operation hook {added_hook!r} failed")
+
+
+@contextlib.contextmanager
+def observe(
+    operation: "Operation", path: Path | None = None, content: str | None = None
+) -> Iterator[OperationEvent | None]:
+    """Collect the stages of an operation that is applied within the block, and report them to the hooks.
+
+    Yields `None` when there are no hooks, so nothing is measured.
+    """
+
+    if not _hooks:
+        yield None
+
+        return
+
+    event = OperationEvent(operation=operation, path=path)
+
+    if content is not None:
+        event.input_bytes = len(content.encode())
+
+    token = _current.set(event)
+
+    try:
+        yield event
+    except Exception as e:
+        event.error = e
+
+        raise
+    finally:
+        _current.reset(token)
+        emit(event)
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the operation that is being observed; does nothing when no operation is observed."""
+
+    event = _current.get()
+
+    if event is None:
+        yield
+
+        return
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        event.timings[name] = event.timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def apply_operation(operation: "Operation", content: str, path: Path | None = None) -> str:
+    """Apply an operation to content, and report its stages and the sizes of the content to the hooks."""
+
+    with observe(operation, path=path, content=content) as event:
+        new_content = operation.apply(content)
+
+        if event is not None:
+            event.output_bytes = len(new_content.encode())
+
+    return new_content
@@ -1,230 +1,349 @@
+import ast
+import copy
+import functools
+import hashlib
+import re
+from abc import abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import libcst as cst
 
-from django_new.transformer.operations import Operation
+from django_new.parser import PARSED_MODULES_CACHE_SIZE, Assignment, find_assignment
+from django_new.transformer.operations import Operation, TargetNotFound
+from django_new.transformer.operations.cache import get_cache
+from django_new.transformer.operations.instrumentation import CHECK, PARSE, SERIALISE, TRANSFORM, stage
+from django_new.transformer.operations.settings_index import IndexEntry, SettingsIndex, replace_at_path
+
+# How many variable values to keep around for re-use during a run
+VALUES_CACHE_SIZE = 128
+
+# Quote for new strings when the code has no strings to follow
+DEFAULT_QUOTE = '"'
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Expression:
+    """A value that is not a literal, e.g. `BASE_DIR / "static"`."""
+
+    # Source code of the expression
+    code: str
+
+    @functools.cached_property
+    def node(self) -> cst.BaseExpression:
+        """The parsed expression; only parsed when it is needed."""
+
+        return cst.parse_expression(self.code)
+
+
+@functools.lru_cache(maxsize=128)
+def _get_name_pattern(name: str) -> re.Pattern:
+    return re.compile(rf"(?<!\w){re.escape(name)}(?!\w)")
+
+
+def contains_name(content: str, name: str) -> bool:
+    """Check whether every part of a dotted name appears as an identifier in the code, without parsing it.
+
+    Names inside strings and comments also count, so `True` only means the name might be defined.
+    """
+
+    return all(_get_name_pattern(part).search(content) for part in name.split("."))
+
+
+def parse_module(content: str) -> cst.Module:
+    """Parse Python code, re-using the module when the same code was recently parsed or generated in the current run.
+
+    Modules are immutable, so they are safe to share between operations.
+    """
+
+    cache = get_cache("modules", PARSED_MODULES_CACHE_SIZE)
+    tree = cache.get(content) if cache is not None else None
+
+    if tree is None:
+        tree = cst.parse_module(content)
+
+    cache_module(content, tree)
+
+    return tree
+
+
+def cache_module(content: str, tree: cst.Module) -> None:
+    """Store a module that is known to generate `content` so it does not get parsed again in the current run."""
+
+    cache = get_cache("modules", PARSED_MODULES_CACHE_SIZE)
+
+    if cache is not None:
+        cache.set(content, tree)
 
 
 class PythonOperation(Operation):
     """Base class for all Python operations"""
 
+    # Error when the variable in `self.name` is not in the file, e.g. "List '{name}' not found in file"; when it is
+    # set, `check()` looks for the name in the code before it gets parsed
+    not_found_message: str | None = None
+
     def can_handle(self, path: Path) -> bool:
         return path.suffix.lower() == ".py"
 
+    def apply(self, content: str) -> str:
+        """Transform the parsed content and generate the code of the modified module"""
 
-class AppendToList(PythonOperation):
-    """Append a value to a Python list, supporting nested class traversal"""
+        with stage(CHECK):
+            self.check(content)
 
-    class AddToListTransformer(cst.CSTTransformer):
-        """CST transformer to add items to a list, supporting nested class traversal"""
+        with stage(PARSE):
+            tree = parse_module(content)
 
-        def __init__(self, name: str, value: str, position: int | None, after: str | None):
-            self.name = name.split(".")
-            self.value = value
-            self.position = position
-            self.after = after
-            self.found = False
-            self.current_name = []
+        with stage(TRANSFORM):
+            modified_tree = self.transform(tree)
 
-        def visit_ClassDef(self, node: cst.ClassDef) -> bool | None:  # noqa: N802
-            self.current_name.append(node.name.value)
+        with stage(SERIALISE):
+            # libcst keeps the formatting of every node, so only a changed module has to be generated again
+            new_content = content if modified_tree is tree else modified_tree.code
 
-            return True
+        # The next operation on this file can start from the modified tree
+        cache_module(new_content, modified_tree)
 
-        def leave_ClassDef(self, _: cst.ClassDef, updated_node: cst.CSTNode) -> cst.CSTNode:  # noqa: N802
-            if self.current_name:
-                self.current_name.pop()
+        return new_content
 
-            return updated_node
+    def check(self, content: str) -> None:
+        """Fail fast, before the content gets parsed, when the operation cannot possibly apply.
 
-        def leave_Assign(self, _: cst.Assign, updated_node: cst.Assign) -> cst.CSTNode:  # noqa: N802
-            # Skip if we're not at the right path depth
-            # For nested attributes, the path length should match the current name parts
-            # e.g., for 'Settings.INSTALLED_APPS', we want to match when current_name is ['Settings']
-            if len(self.current_name) != len(self.name) - 1:
-                return updated_node
+        Raises:
+            ValueError: If the operation cannot apply.
+        """
 
-            # Check if this is an assignment to our target list
-            target = updated_node.targets[0].target
+        if self.not_found_message is not None and not contains_name(content, self.name):
+            raise self.not_found()
 
-            # Handle direct name access (e.g., INSTALLED_APPS)
-            if isinstance(target, cst.Name):
-                target_name = target.value
+    def not_found(self) -> TargetNotFound:
+        """Get the error for a variable that is not in the file."""
 
-                # If we're in a class context, we need to check if the class name matches
-                if self.current_name and self.current_name[0] == self.name[0]:
-                    if target_name == self.name[-1] and isinstance(updated_node.value, cst.List):
-                        self.found = True
+        return TargetNotFound(self.not_found_message.format(name=self.name))
 
-                        return self._add_to_list_node(updated_node)
+    @abstractmethod
+    def transform(self, tree: cst.Module) -> cst.Module:
+        """Return a modified version of the module, or the same module when nothing changed"""
 
-                # If not in a class context, just match the name
-                elif len(self.name) == 1 and target_name == self.name[0] and isinstance(updated_node.value, cst.List):
-                    self.found = True
 
-                    return self._add_to_list_node(updated_node)
+def _is_list(entry: IndexEntry) -> bool:
+    return isinstance(entry.node.value, cst.List)
 
-            # Handle nested attributes (e.g., Settings.INSTALLED_APPS)
-            elif isinstance(target, cst.Attribute):
-                # Check if the attribute path matches our target
-                attr_parts = []
-                node = target
 
-                while isinstance(node, cst.Attribute):
-                    attr_parts.append(node.attr.value)
-                    node = node.value
+def _is_dict(entry: IndexEntry) -> bool:
+    return isinstance(entry.node.value, cst.Dict)
 
-                if isinstance(node, cst.Name):
-                    attr_parts.append(node.value)
-                    attr_parts.reverse()  # Reverse to get the correct order
 
-                    # Check if the full path matches our target
-                    if ".".join(attr_parts) == ".".join(self.name) and isinstance(updated_node.value, cst.List):
-                        self.found = True
-                        return self._add_to_list_node(updated_node)
+# A path of keys into nested dicts, e.g. ("staticfiles", "BACKEND")
+KeyPath = tuple[Any, ...]
 
-            return updated_node
 
-        def _add_to_list_node(self, node):
-            """Add the value to the list node"""
-
-            # Parse the value as a CST element
-            value_node = cst.parse_expression(self.value)
-            new_element = cst.Element(value=value_node)
-
-            # Get existing elements
-            elements = list(node.value.elements)
-
-            # Insert at position
-            if self.after:
-                insert_pos = 0
-                for i, element in enumerate(elements):
-                    # Get the code for the element value to compare
-                    element_code = cst.Module([]).code_for_node(element.value).strip()
-                    if element_code == self.after:
-                        insert_pos = i + 1
-                        break
-                elements.insert(insert_pos, new_element)
-            elif self.position is None:
-                elements.append(new_element)
-            elif self.position < 0:
-                # Negative indexing
-                insert_pos = len(elements) + self.position + 1
-                elements.insert(max(0, insert_pos), new_element)
-            else:
-                elements.insert(min(self.position, len(elements)), new_element)
+def _get_quote(node: cst.CSTNode) -> str:
+    """Get the quote of the first string in the code that is not triple-quoted, e.g. a docstring"""
 
-            # Return updated node
-            return node.with_changes(value=node.value.with_changes(elements=elements))
+    nodes = [node]
 
-    def __init__(self, name: str, value: str, position: int | None = None, after: str | None = None):
-        self.name = name
-        self.value = value
-        self.position = position
-        self.after = after
+    while nodes:
+        current = nodes.pop()
 
-    def description(self) -> str:
-        if self.after:
-            return f"Append {self.value} to {self.name} after {self.after}"
-        pos = f" at position {self.position}" if self.position is not None else ""
+        if isinstance(current, cst.SimpleString) and len(current.quote) == 1:
+            return current.quote
 
-        return f"Append {self.value} to {self.name}{pos}"
+        nodes.extend(reversed(current.children))
 
-    def apply(self, content: str) -> str:
-        """Add a value to a list in Python code"""
+    return DEFAULT_QUOTE
 
-        tree = cst.parse_module(content)
-        transformer = self.AddToListTransformer(self.name, self.value, self.position, self.after)
-        modified_tree = tree.visit(transformer)
 
-        if not transformer.found:
-            raise ValueError(f"List '{self.name}' not found in file")
+def _to_node(value: Any, quote: str = DEFAULT_QUOTE) -> cst.BaseExpression:
+    """Build the node of a value; strings use `quote` unless they contain it"""
 
-        return modified_tree.code
+    if isinstance(value, Expression):
+        return value.node
 
+    if isinstance(value, dict):
+        return cst.Dict(
+            [cst.DictElement(key=_to_node(key, quote), value=_to_node(item, quote)) for key, item in value.items()]
+        )
 
-class RemoveFromList(PythonOperation):
-    """Remove a value from a Python list"""
+    if isinstance(value, list):
+        return cst.List([cst.Element(_to_node(item, quote)) for item in value])
 
-    class RemoveFromListTransformer(cst.CSTTransformer):
-        """CST transformer to remove items from a list"""
+    if isinstance(value, tuple):
+        return cst.Tuple([cst.Element(_to_node(item, quote)) for item in value])
 
-        def __init__(self, name: str, value: str):
-            self.name = name.split(".")
-            self.value = value
-            self.found = False
-            self.removed = False
-            self.current_name = []
+    code = repr(value)
 
-        def visit_ClassDef(self, node: cst.ClassDef) -> bool | None:  # noqa: N802
-            self.current_name.append(node.name.value)
+    if isinstance(value, str):
+        # `repr` only escapes a quote when the string contains both kinds
+        if code[0] != quote and quote not in value:
+            code = f"{quote}{code[1:-1]}{quote}"
 
-            return True
+        return cst.SimpleString(code)
 
-        def leave_ClassDef(self, _: cst.ClassDef, updated_node: cst.CSTNode) -> cst.CSTNode:  # noqa: N802
-            if self.current_name:
-                self.current_name.pop()
+    return cst.parse_expression(code)
 
-            return updated_node
 
-        def leave_Assign(self, _: cst.Assign, updated_node: cst.Assign) -> cst.CSTNode:  # noqa: N802
-            # Skip if we're not at the right path depth
-            if len(self.current_name) != len(self.name) - 1:
-                return updated_node
+def _code_for_node(node: cst.CSTNode) -> str:
+    return cst.Module([]).code_for_node(node)
 
-            target = updated_node.targets[0].target
 
-            # Handle direct name access
-            if isinstance(target, cst.Name):
-                target_name = target.value
+def _literal_value(node: cst.BaseExpression) -> Any:
+    try:
+        return ast.literal_eval(_code_for_node(node).strip())
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return _MISSING
 
-                if self.current_name and self.current_name[0] == self.name[0]:
-                    if target_name == self.name[-1] and isinstance(updated_node.value, cst.List):
-                        self.found = True
 
-                        return self._remove_from_list_node(updated_node)
-                elif len(self.name) == 1 and target_name == self.name[0] and isinstance(updated_node.value, cst.List):
-                    self.found = True
+def _find_key(node: cst.Dict, key: Any) -> int | None:
+    for idx, element in enumerate(node.elements):
+        # Skip `**other` elements
+        if isinstance(element, cst.DictElement) and _literal_value(element.key) == key:
+            return idx
 
-                    return self._remove_from_list_node(updated_node)
+    return None
 
-            # Handle nested attributes
-            elif isinstance(target, cst.Attribute):
-                attr_parts = []
-                node = target
 
-                while isinstance(node, cst.Attribute):
-                    attr_parts.append(node.attr.value)
-                    node = node.value
+def _append_element(node: cst.Dict, element: cst.DictElement) -> cst.Dict:
+    """Append an element, re-using the whitespace between the existing elements and any trailing comma"""
 
-                if isinstance(node, cst.Name):
-                    attr_parts.append(node.value)
-                    attr_parts.reverse()
+    elements = list(node.elements)
 
-                    if ".".join(attr_parts) == ".".join(self.name) and isinstance(updated_node.value, cst.List):
-                        self.found = True
+    if not elements:
+        return node.with_changes(elements=[element])
 
-                        return self._remove_from_list_node(updated_node)
+    if len(elements) > 1:
+        separator = elements[-2].comma.whitespace_after
+    elif isinstance(node.lbrace.whitespace_after, cst.ParenthesizedWhitespace):
+        separator = node.lbrace.whitespace_after
+    else:
+        separator = cst.SimpleWhitespace(" ")
 
-            return updated_node
+    last = elements[-1]
+    elements[-1] = last.with_changes(comma=cst.Comma(whitespace_after=separator))
+    elements.append(element.with_changes(comma=last.comma))
 
-        def _remove_from_list_node(self, node):
-            """Remove the value from the list node"""
+    return node.with_changes(elements=elements)
 
-            # Parse the value to compare
-            target_value = cst.parse_expression(self.value)
 
-            # Filter out matching elements
-            new_elements = []
+def _remove_element(node: cst.Dict, idx: int) -> cst.Dict:
+    """Remove an element, keeping any trailing comma"""
 
-            for element in node.value.elements:
-                if not element.value.deep_equals(target_value):
-                    new_elements.append(element)
-                else:
-                    self.removed = True
+    elements = list(node.elements)
+
+    if len(elements) == 1:
+        return node.with_changes(elements=[], lbrace=cst.LeftCurlyBrace(), rbrace=cst.RightCurlyBrace())
+
+    if idx == len(elements) - 1:
+        elements[idx - 1] = elements[idx - 1].with_changes(comma=elements[idx].comma)
+
+    del elements[idx]
+
+    return node.with_changes(elements=elements)
+
+
+def _edit_dict(
+    node: cst.Dict, key_path: KeyPath, value: cst.BaseExpression | None, quote: str = DEFAULT_QUOTE
+) -> cst.Dict:
+    """Set the value at a path of keys, or remove the key when `value` is `None`; missing keys are ignored"""
+
+    idx = _find_key(node, key_path[0])
+
+    if idx is None:
+        if value is None or len(key_path) > 1:
+            return node
+
+        return _append_element(node, cst.DictElement(key=_to_node(key_path[0], quote), value=value))
+
+    element = node.elements[idx]
+
+    if len(key_path) > 1:
+        if not isinstance(element.value, cst.Dict):
+            return node
+
+        new_value = _edit_dict(element.value, key_path[1:], value, quote)
+    elif value is None:
+        return _remove_element(node, idx)
+    else:
+        new_value = value
+
+    elements = list(node.elements)
+    elements[idx] = element.with_changes(value=new_value)
+
+    return node.with_changes(elements=elements)
+
+
+class AppendToList(PythonOperation):
+    """Append a value to a Python list, supporting nested class traversal"""
+
+    not_found_message = "List '{name}' not found in file"
+
+    def __init__(self, name: str, value: str, position: int | None = None, after: str | None = None):
+        self.name = name
+        self.value = value
+        self.position = position
+        self.after = after
+
+    def description(self) -> str:
+        if self.after:
+            return f"Append {self.value} to {self.name} after {self.after}"
+        pos = f" at position {self.position}" if self.position is not None else ""
+
+        return f"Append {self.value} to {self.name}{pos}"
+
+    def transform(self, tree: cst.Module) -> cst.Module:
+        """Add a value to a list in Python code"""
+
+        entries = [entry for entry in SettingsIndex.from_module(tree).get(self.name) if _is_list(entry)]
+
+        if not entries:
+            raise self.not_found()
+
+        for entry in entries:
+            tree = replace_at_path(tree, entry.path, self._add_to_list_node(entry.node))
+
+        return tree
+
+    def _add_to_list_node(self, node):
+        """Add the value to the list node"""
 
-            return node.with_changes(value=node.value.with_changes(elements=new_elements))
+        # Parse the value as a CST element
+        value_node = cst.parse_expression(self.value)
+        new_element = cst.Element(value=value_node)
+
+        # Get existing elements
+        elements = list(node.value.elements)
+
+        # Insert at position
+        if self.after:
+            insert_pos = 0
+            for i, element in enumerate(elements):
+                # Get the code for the element value to compare
+                element_code = cst.Module([]).code_for_node(element.value).strip()
+                if element_code == self.after:
+                    insert_pos = i + 1
+                    break
+            elements.insert(insert_pos, new_element)
+        elif self.position is None:
+            elements.append(new_element)
+        elif self.position < 0:
+            # Negative indexing
+            insert_pos = len(elements) + self.position + 1
+            elements.insert(max(0, insert_pos), new_element)
+        else:
+            elements.insert(min(self.position, len(elements)), new_element)
+
+        # Return updated node
+        return node.with_changes(value=node.value.with_changes(elements=elements))
+
+
+class RemoveFromList(PythonOperation):
+    """Remove a value from a Python list"""
+
+    not_found_message = "List '{name}' not found in file"
 
     def __init__(self, name: str, value: str):
         self.name = name
@@ -233,81 +352,58 @@ class RemoveFromList(PythonOperation):
     def description(self) -> str:
         return f"Remove {self.value} from {self.name}"
 
-    def apply(self, content: str) -> str:
+    def transform(self, tree: cst.Module) -> cst.Module:
         """Remove a value from a list in Python code"""
 
-        tree = cst.parse_module(content)
-        transformer = self.RemoveFromListTransformer(self.name, self.value)
-        modified_tree = tree.visit(transformer)
+        entries = [entry for entry in SettingsIndex.from_module(tree).get(self.name) if _is_list(entry)]
 
-        if not transformer.found:
-            raise ValueError(f"List '{self.name}' not found in file")
-        if not transformer.removed:
-            raise ValueError(f"Value {self.value} not found in '{self.name}'")
+        if not entries:
+            raise self.not_found()
 
-        return modified_tree.code
+        removed = False
 
+        for entry in entries:
+            new_node = self._remove_from_list_node(entry.node)
 
-class GetVariable(PythonOperation):
-    """Get the value of a Python variable"""
+            if new_node is not entry.node:
+                removed = True
+                tree = replace_at_path(tree, entry.path, new_node)
 
-    class GetVariableVisitor(cst.CSTVisitor):
-        """CST visitor to extract variable values"""
+        if not removed:
+            raise TargetNotFound(f"Value {self.value} not found in '{self.name}'")
 
-        def __init__(self, name: str):
-            self.name = name.split(".")
-            self.value = None
-            self.current_name = []
+        return tree
 
-        def visit_ClassDef(self, node: cst.ClassDef) -> bool | None:  # noqa: N802
-            self.current_name.append(node.name.value)
-            return True
+    def _remove_from_list_node(self, node):
+        """Remove the value from the list node; returns the same node when the value is not in the list"""
 
-        def leave_ClassDef(self, node: cst.ClassDef) -> None:  # noqa: N802, ARG002
-            if self.current_name:
-                self.current_name.pop()
+        # Parse the value to compare
+        target_value = cst.parse_expression(self.value)
 
-        def visit_Assign(self, node: cst.Assign) -> bool | None:  # noqa: N802
-            # Skip if we're not at the right path depth
-            if len(self.current_name) != len(self.name) - 1:
-                return True
+        # Filter out matching elements
+        elements = node.value.elements
+        new_elements = [element for element in elements if not element.value.deep_equals(target_value)]
 
-            target = node.targets[0].target
+        if len(new_elements) == len(elements):
+            return node
 
-            # Handle direct name access (e.g., STATIC_ROOT)
-            if isinstance(target, cst.Name):
-                target_name = target.value
+        # In a one-line list, the new last element gets the trailing comma, or the lack of one, of the list; the
+        # elements of a multi-line list keep their own commas, so the list is restored exactly after an append
+        multiline = isinstance(node.value.lbracket.whitespace_after, cst.ParenthesizedWhitespace)
 
-                # If we're in a class context, check if the class name matches
-                if self.current_name and self.current_name[0] == self.name[0]:
-                    if target_name == self.name[-1]:
-                        self.value = cst.Module([]).code_for_node(node.value)
-                        return False  # Stop visiting once found
+        if new_elements and new_elements[-1] is not elements[-1] and not multiline:
+            new_elements[-1] = new_elements[-1].with_changes(comma=elements[-1].comma)
 
-                # If not in a class context, just match the name
-                elif len(self.name) == 1 and target_name == self.name[0]:
-                    self.value = cst.Module([]).code_for_node(node.value)
-                    return False  # Stop visiting once found
+        return node.with_changes(value=node.value.with_changes(elements=new_elements))
 
-            # Handle nested attributes (e.g., Settings.STATIC_ROOT)
-            elif isinstance(target, cst.Attribute):
-                attr_parts = []
-                attr_node = target
 
-                while isinstance(attr_node, cst.Attribute):
-                    attr_parts.append(attr_node.attr.value)
-                    attr_node = attr_node.value
-
-                if isinstance(attr_node, cst.Name):
-                    attr_parts.append(attr_node.value)
-                    attr_parts.reverse()
+class GetVariable(PythonOperation):
+    """Get the value of a Python variable.
 
-                    # Check if the full path matches our target
-                    if ".".join(attr_parts) == ".".join(self.name):
-                        self.value = cst.Module([]).code_for_node(node.value)
-                        return False  # Stop visiting once found
+    Only reads the code, so it uses an `ast` tree, which is much cheaper to build than a `libcst` tree.
+    """
 
-            return True
+    not_found_message = "Variable '{name}' not found in file"
 
     def __init__(self, name: str):
         self.name = name
@@ -316,16 +412,52 @@ class GetVariable(PythonOperation):
         return f"Get value of {self.name}"
 
     def apply(self, content: str) -> str:
-        """Get the value of a variable from Python code"""
+        """Get the source code of the value of a variable from Python code"""
 
-        tree = cst.parse_module(content)
-        visitor = self.GetVariableVisitor(self.name)
-        tree.visit(visitor)
+        return self._find_assignment(content).code
+
+    def transform(self, tree: cst.Module) -> cst.Module:
+        """Reading a variable does not change the module"""
+
+        return tree
+
+    def get_value(self, content: str) -> Any | Expression:
+        """Get the value of a variable from Python code.
+
+        Literal values (strings, numbers, lists, dicts, etc.) are returned as Python objects. Any other value, e.g.
+        `BASE_DIR / "static"`, is returned as an `Expression` with its code and node.
+
+        Values are memoised per content and variable name during a run, so repeated lookups do not parse the code
+        again.
+        """
+
+        key = (hashlib.blake2b(content.encode(), digest_size=16).digest(), self.name)
+        cache = get_cache("values", VALUES_CACHE_SIZE)
+        value = cache.get(key, _MISSING) if cache is not None else _MISSING
+
+        if value is _MISSING:
+            assignment = self._find_assignment(content)
+
+            try:
+                value = ast.literal_eval(assignment.node)
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                value = Expression(code=assignment.code)
+
+            if cache is not None:
+                cache.set(key, value)
 
-        if visitor.value is None:
-            raise ValueError(f"Variable '{self.name}' not found in file")
+        # Literals are mutable, so callers get their own copy of the cached value
+        return copy.deepcopy(value) if not isinstance(value, Expression) else value
 
-        return visitor.value
+    def _find_assignment(self, content: str) -> Assignment:
+        self.check(content)
+
+        assignment = find_assignment(content, self.name)
+
+        if assignment is None:
+            raise self.not_found()
+
+        return assignment
 
 
 class AssignVariable(PythonOperation):
@@ -356,8 +488,7 @@ class AssignVariable(PythonOperation):
     def description(self) -> str:
         return f"Assign {self.value} to {self.name}"
 
-    def apply(self, content: str) -> str:
-        tree = cst.parse_module(content)
+    def transform(self, tree: cst.Module) -> cst.Module:
         transformer = self.AssignVariableTransformer(self.name, self.value)
         modified_tree = tree.visit(transformer)
 
@@ -369,90 +500,248 @@ class AssignVariable(PythonOperation):
             new_body.append(assign_stmt)
             modified_tree = modified_tree.with_changes(body=new_body)
 
-        return modified_tree.code
+        return modified_tree
 
 
 class RemoveVariable(PythonOperation):
     """Remove a variable assignment from Python code"""
 
-    class RemoveVariableTransformer(cst.CSTTransformer):
-        """CST transformer to remove variable assignments"""
+    not_found_message = "Variable '{name}' not found in file"
 
-        def __init__(self, name: str):
-            self.name = name.split(".")
-            self.found = False
-            self.current_name = []
+    def __init__(self, name: str):
+        self.name = name
 
-        def visit_ClassDef(self, node: cst.ClassDef) -> bool | None:  # noqa: N802
-            self.current_name.append(node.name.value)
-            return True
+    def description(self) -> str:
+        return f"Remove variable {self.name}"
 
-        def leave_ClassDef(self, _: cst.ClassDef, updated_node: cst.CSTNode) -> cst.CSTNode:  # noqa: N802
-            if self.current_name:
-                self.current_name.pop()
-            return updated_node
+    def transform(self, tree: cst.Module) -> cst.Module:
+        """Remove a variable assignment from Python code"""
 
-        def leave_SimpleStatementLine(  # noqa: N802
-            self, _: cst.SimpleStatementLine, updated_node: cst.SimpleStatementLine
-        ) -> cst.CSTNode | cst.RemovalSentinel:
-            # Check if this is an assignment statement we want to remove
-            if len(updated_node.body) == 1 and isinstance(updated_node.body[0], cst.Assign):
-                assign = updated_node.body[0]
+        entries = [entry for entry in SettingsIndex.from_module(tree).get(self.name) if entry.is_whole_statement]
 
-                # Skip if we're not at the right path depth
-                if len(self.current_name) != len(self.name) - 1:
-                    return updated_node
+        if not entries:
+            raise self.not_found()
 
-                target = assign.targets[0].target
+        # Remove from the end, so the paths of the earlier entries stay valid
+        for entry in reversed(entries):
+            tree = replace_at_path(tree, entry.statement_path, None)
 
-                # Handle direct name access
-                if isinstance(target, cst.Name):
-                    target_name = target.value
+        return tree
 
-                    # If we're in a class context, check if the class name matches
-                    if self.current_name and self.current_name[0] == self.name[0]:
-                        if target_name == self.name[-1]:
-                            self.found = True
-                            return cst.RemovalSentinel.REMOVE
 
-                    # If not in a class context, just match the name
-                    elif len(self.name) == 1 and target_name == self.name[0]:
-                        self.found = True
-                        return cst.RemovalSentinel.REMOVE
+class MergeDict(PythonOperation):
+    """Merge values into the nested keys of a dict literal, e.g. `STORAGES["staticfiles"]["BACKEND"]`.
 
-                # Handle nested attributes
-                elif isinstance(target, cst.Attribute):
-                    attr_parts = []
-                    node = target
+    Nested dicts are merged key by key, and any other value replaces the existing one. Values are Python values, so
+    strings are quoted like the other strings in the file; use an `Expression` for code. Only the changed keys are
+    re-generated, so the rest of the dict keeps its formatting. The variable is created when it does not exist.
 
-                    while isinstance(node, cst.Attribute):
-                        attr_parts.append(node.attr.value)
-                        node = node.value
+    The replaced values are recorded when the operation is applied, so `reverse()` can restore them exactly.
+    """
 
-                    if isinstance(node, cst.Name):
-                        attr_parts.append(node.value)
-                        attr_parts.reverse()
+    def __init__(self, name: str, value: dict):
+        self.name = name
+        self.value = value
 
-                        if ".".join(attr_parts) == ".".join(self.name):
-                            self.found = True
-                            return cst.RemovalSentinel.REMOVE
+        # The values that were replaced for each dict that was changed, or `None` for keys that were added
+        self.previous: list[dict[KeyPath, cst.BaseExpression | None]] | None = None
+        self.created = False
 
-            return updated_node
+    def description(self) -> str:
+        return f"Merge {self.value!r} into {self.name}"
 
-    def __init__(self, name: str):
+    def transform(self, tree: cst.Module) -> cst.Module:
+        """Merge the values into every dict assigned to the variable"""
+
+        entries = SettingsIndex.from_module(tree).get(self.name)
+        quote = _get_quote(tree)
+
+        if not entries:
+            self.previous = []
+            self.created = True
+
+            target = cst.AssignTarget(target=cst.parse_expression(self.name))
+            statement = cst.SimpleStatementLine([cst.Assign(targets=[target], value=_to_node(self.value, quote))])
+
+            return tree.with_changes(body=[*tree.body, statement])
+
+        entries = [entry for entry in entries if _is_dict(entry)]
+
+        if not entries:
+            raise ValueError(f"'{self.name}' is not a dict")
+
+        self.previous = []
+
+        for entry in entries:
+            previous: dict[KeyPath, cst.BaseExpression | None] = {}
+            new_value = self._merge_dict_node(entry.node.value, self.value, (), previous, quote)
+
+            self.previous.append(previous)
+            tree = replace_at_path(tree, entry.path, entry.node.with_changes(value=new_value))
+
+        return tree
+
+    def reverse(self) -> "UnmergeDict":
+        """Get the operation that undoes this one; restores the replaced values when this operation was applied"""
+
+        return UnmergeDict(name=self.name, value=self.value, previous=self.previous, created=self.created)
+
+    def get_record(self) -> dict | None:
+        """Get the replaced values as JSON, e.g. to keep them in the state file; `None` when this was not applied"""
+
+        if self.previous is None:
+            return None
+
+        return {
+            "created": self.created,
+            "previous": [
+                [
+                    [list(key_path), None if node is None else _code_for_node(node)]
+                    for key_path, node in previous.items()
+                ]
+                for previous in self.previous
+            ],
+        }
+
+    def _merge_dict_node(
+        self,
+        node: cst.Dict,
+        value: dict,
+        key_path: KeyPath,
+        previous: dict[KeyPath, cst.BaseExpression | None],
+        quote: str,
+    ) -> cst.Dict:
+        for key, new_value in value.items():
+            idx = _find_key(node, key)
+
+            if idx is None:
+                previous[(*key_path, key)] = None
+                node = _append_element(
+                    node, cst.DictElement(key=_to_node(key, quote), value=_to_node(new_value, quote))
+                )
+
+                continue
+
+            element = node.elements[idx]
+
+            if isinstance(new_value, dict) and isinstance(element.value, cst.Dict):
+                new_node = self._merge_dict_node(element.value, new_value, (*key_path, key), previous, quote)
+            elif not isinstance(new_value, Expression) and _literal_value(element.value) == new_value:
+                continue
+            else:
+                previous[(*key_path, key)] = element.value
+                new_node = _to_node(new_value, quote)
+
+            elements = list(node.elements)
+            elements[idx] = element.with_changes(value=new_node)
+            node = node.with_changes(elements=elements)
+
+        return node
+
+
+class UnmergeDict(PythonOperation):
+    """Undo a `MergeDict`.
+
+    With the values recorded by `MergeDict.reverse()`, the replaced values are restored and the added keys are removed.
+    Otherwise, the keys that still have the merged values are removed, along with any nested dicts that only
+    contained them.
+    """
+
+    not_found_message = "Dict '{name}' not found in file"
+
+    def __init__(
+        self,
+        name: str,
+        value: dict,
+        previous: list[dict[KeyPath, cst.BaseExpression | None]] | None = None,
+        *,
+        created: bool = False,
+    ):
         self.name = name
+        self.value = value
+        self.previous = previous
+        self.created = created
+
+    @classmethod
+    def from_record(cls, name: str, value: dict, record: dict | None) -> "UnmergeDict":
+        """Undo a `MergeDict` with the values from its `get_record()`, or by its values when there is no record"""
+
+        if record is None:
+            return cls(name=name, value=value)
+
+        previous = [
+            {tuple(key_path): None if code is None else cst.parse_expression(code) for key_path, code in edits}
+            for edits in record["previous"]
+        ]
+
+        return cls(name=name, value=value, previous=previous, created=record["created"])
 
     def description(self) -> str:
-        return f"Remove variable {self.name}"
+        return f"Unmerge {self.value!r} from {self.name}"
 
-    def apply(self, content: str) -> str:
-        """Remove a variable assignment from Python code"""
+    def transform(self, tree: cst.Module) -> cst.Module:
+        """Remove the merged values from every dict assigned to the variable"""
 
-        tree = cst.parse_module(content)
-        transformer = self.RemoveVariableTransformer(self.name)
-        modified_tree = tree.visit(transformer)
+        if self.created:
+            return RemoveVariable(name=self.name).transform(tree)
 
-        if not transformer.found:
-            raise ValueError(f"Variable '{self.name}' not found in file")
+        entries = [entry for entry in SettingsIndex.from_module(tree).get(self.name) if _is_dict(entry)]
+
+        if not entries:
+            raise self.not_found()
+
+        if self.previous is not None and len(self.previous) != len(entries):
+            raise ValueError(f"'{self.name}' changed since the values were merged")
+
+        changed = False
+        quote = _get_quote(tree) if self.previous is not None else DEFAULT_QUOTE
+
+        for idx, entry in enumerate(entries):
+            node = entry.node.value
+
+            if self.previous is not None:
+                edits = reversed(self.previous[idx].items())
+            else:
+                edits = ((key_path, None) for key_path in self._get_merged_key_paths(node, self.value, ()))
 
-        return modified_tree.code
+            for key_path, value in edits:
+                node = _edit_dict(node, key_path, value, quote)
+
+            if node is not entry.node.value:
+                changed = True
+                tree = replace_at_path(tree, entry.path, entry.node.with_changes(value=node))
+
+        if not changed and self.previous is None:
+            raise TargetNotFound(f"Values {self.value!r} not found in '{self.name}'")
+
+        return tree
+
+    def _get_merged_key_paths(self, node: cst.Dict, value: dict, key_path: KeyPath) -> list[KeyPath]:
+        """Get the paths of the keys that have the merged values; a dict with only merged keys is removed whole"""
+
+        key_paths = []
+
+        for key, merged_value in value.items():
+            idx = _find_key(node, key)
+
+            if idx is None:
+                continue
+
+            element = node.elements[idx]
+
+            if isinstance(merged_value, dict) and isinstance(element.value, cst.Dict):
+                nested_key_paths = self._get_merged_key_paths(element.value, merged_value, (*key_path, key))
+
+                child_key_paths = [path for path in nested_key_paths if len(path) == len(key_path) + 2]
+
+                if nested_key_paths and len(child_key_paths) == len(nested_key_paths) == len(element.value.elements):
+                    key_paths.append((*key_path, key))
+                else:
+                    key_paths.extend(nested_key_paths)
+            elif isinstance(merged_value, Expression):
+                if element.value.deep_equals(merged_value.node):
+                    key_paths.append((*key_path, key))
+            elif _literal_value(element.value) == merged_value:
+                key_paths.append((*key_path, key))
+
+        return key_paths
@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+
+import libcst as cst
+
+from django_new.transformer.operations.cache import get_cache
+
+# Fields of compound statements and their parts that contain statements
+STATEMENT_FIELDS = ("body", "orelse", "handlers", "finalbody", "cases")
+
+# How many indexes to keep around for re-use
+INDEXES_CACHE_SIZE = 8
+
+# A step from a node to one of its children: the name of the field, and the index when the field is a sequence
+Path = tuple[tuple[str, int | None], ...]
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """An assignment to a dotted name."""
+
+    # Dotted name, e.g. "INSTALLED_APPS" or "Settings.INSTALLED_APPS"
+    name: str
+
+    # The assignment
+    node: cst.Assign
+
+    # The line (or one-line suite) that contains the assignment
+    statement: cst.SimpleStatementLine | cst.SimpleStatementSuite
+
+    # Path from the module to the assignment
+    path: Path
+
+    @property
+    def statement_path(self) -> Path:
+        """Path from the module to the line that contains the assignment."""
+
+        return self.path[:-1]
+
+    @property
+    def is_whole_statement(self) -> bool:
+        """Whether the assignment is the only statement on its line."""
+
+        return isinstance(self.statement, cst.SimpleStatementLine) and len(self.statement.body) == 1
+
+
+class SettingsIndex:
+    """Symbol table of the assignments in a module, keyed by dotted name.
+
+    The index is built in one pass over the statements, without visiting any expressions. An assignment to a name
+    inside a class is keyed by the names of the enclosing classes and the name, e.g. `Settings.INSTALLED_APPS`; an
+    assignment to an attribute is keyed by the attribute path, e.g. `config.DEBUG`. Only the first target of an
+    assignment is indexed.
+    """
+
+    def __init__(self, module: cst.Module):
+        self.module = module
+        self.entries: dict[str, list[IndexEntry]] = {}
+
+        self._add_statements(module, (), [])
+
+    @classmethod
+    def from_module(cls, module: cst.Module) -> "SettingsIndex":
+        """Get the index of a module, re-using it when the same module was already indexed during the run."""
+
+        cache = get_cache("settings_indexes", INDEXES_CACHE_SIZE)
+
+        if cache is None:
+            return cls(module)
+
+        # The module is kept with its index, so its id cannot be re-used by another module while it is cached
+        cached = cache.get(id(module))
+
+        if cached is not None and cached[0] is module:
+            return cached[1]
+
+        index = cls(module)
+        cache.set(id(module), (module, index))
+
+        return index
+
+    def get(self, name: str) -> list[IndexEntry]:
+        """Get the assignments to a dotted name in the order they appear in the module."""
+
+        return self.entries.get(name, [])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def _add_statements(self, node: cst.CSTNode, path: Path, class_names: list[str]) -> None:
+        if isinstance(node, (cst.SimpleStatementLine, cst.SimpleStatementSuite)):
+            for idx, small_statement in enumerate(node.body):
+                if isinstance(small_statement, cst.Assign):
+                    self._add_assignment(small_statement, node, (*path, ("body", idx)), class_names)
+
+            return
+
+        if isinstance(node, cst.ClassDef):
+            class_names = [*class_names, node.name.value]
+
+        for field in STATEMENT_FIELDS:
+            value = getattr(node, field, None)
+
+            if isinstance(value, cst.CSTNode):
+                self._add_statements(value, (*path, (field, None)), class_names)
+            elif isinstance(value, (list, tuple)):
+                for idx, child in enumerate(value):
+                    self._add_statements(child, (*path, (field, idx)), class_names)
+
+    def _add_assignment(
+        self,
+        node: cst.Assign,
+        statement: cst.SimpleStatementLine | cst.SimpleStatementSuite,
+        path: Path,
+        class_names: list[str],
+    ) -> None:
+        name = get_dotted_name(node.targets[0].target)
+
+        if name is None:
+            return
+
+        # Names are relative to the enclosing classes, attributes are already qualified
+        if isinstance(node.targets[0].target, cst.Name):
+            name = ".".join([*class_names, name])
+
+        entry = IndexEntry(name=name, node=node, statement=statement, path=path)
+        self.entries.setdefault(name, []).append(entry)
+
+
+def get_dotted_name(node: cst.BaseExpression) -> str | None:
+    """Get the dotted name of a `Name` or `Attribute` node, e.g. "config.DEBUG"."""
+
+    parts = []
+
+    while isinstance(node, cst.Attribute):
+        parts.append(node.attr.value)
+        node = node.value
+
+    if not isinstance(node, cst.Name):
+        return None
+
+    parts.append(node.value)
+
+    return ".".join(reversed(parts))
+
+
+def replace_at_path(module: cst.Module, path: Path, new_node: cst.CSTNode | None) -> cst.Module:
+    """Replace the node at the end of a path, or remove it from its sequence when `new_node` is `None`.
+
+    Only the nodes along the path are re-created, so the rest of the module keeps its identity.
+    """
+
+    def replace(node: cst.CSTNode, remaining_path: Path) -> cst.CSTNode | None:
+        if not remaining_path:
+            return new_node
+
+        (field, idx), remaining_path = remaining_path[0], remaining_path[1:]
+        value = getattr(node, field)
+
+        if idx is None:
+            return node.with_changes(**{field: replace(value, remaining_path)})
+
+        children = list(value)
+        child = replace(children[idx], remaining_path)
+
+        if child is None:
+            del children[idx]
+        else:
+            children[idx] = child
+
+        return node.with_changes(**{field: children})
+
+    return replace(module, path)
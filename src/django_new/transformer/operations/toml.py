@@ -3,7 +3,15 @@ from typing import Any
 
 import tomlkit
 
-from django_new.transformer.operations import Operation
+from django_new.transformer.operations import Operation, TargetNotFound
+from django_new.transformer.operations.dependency_index import (
+    DependencyIndex,
+    get_keys,
+    merge_requirements,
+    parse_requirement,
+    upgrade_requirement,
+)
+from django_new.transformer.operations.instrumentation import PARSE, SERIALISE, TRANSFORM, stage
 
 
 class TomlOperation(Operation):
@@ -12,6 +20,79 @@ class TomlOperation(Operation):
     def can_handle(self, path: Path) -> bool:
         return path.suffix == ".toml"
 
+    def apply(self, content: str) -> str:
+        """Parse the content, modify the document, and serialise it again"""
+
+        with stage(PARSE):
+            doc = tomlkit.parse(content)
+
+        with stage(TRANSFORM):
+            self.apply_to_document(doc)
+
+        with stage(SERIALISE):
+            return tomlkit.dumps(doc)
+
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> Any:
+        """Modify a parsed document in place"""
+
+        raise NotImplementedError
+
+
+class TomlSession:
+    """Parses TOML once, applies any number of operations to the document, and serialises it once.
+
+    tomlkit is slow on large files, so this is much faster than applying the operations one by one.
+    """
+
+    def __init__(self, content: str, path: Path | None = None):
+        self.content = content
+        self.path = path
+        self.document = tomlkit.parse(content)
+
+    @classmethod
+    def open(cls, path: Path) -> "TomlSession":
+        """Start a session for a file; used as a context manager, the file is saved when the block succeeds."""
+
+        return cls(Path(path).read_text(), path=Path(path))
+
+    def apply(self, operation: TomlOperation) -> Any:
+        """Apply an operation to the document"""
+
+        with stage(TRANSFORM):
+            return operation.apply_to_document(self.document)
+
+    def dumps(self) -> str:
+        """Serialise the document"""
+
+        return tomlkit.dumps(self.document)
+
+    def save(self) -> bool:
+        """Write the document to the file, but only if it changed.
+
+        Returns:
+            Whether the file was written.
+        """
+
+        if self.path is None:
+            raise ValueError("The session was not opened from a file")
+
+        content = self.dumps()
+
+        if content == self.content:
+            return False
+
+        self.path.write_text(content)
+        self.content = content
+
+        return True
+
+    def __enter__(self) -> "TomlSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.save()
+
 
 class AddKeyValue(TomlOperation):
     """Add a key-value pair to a TOML file"""
@@ -24,11 +105,9 @@ class AddKeyValue(TomlOperation):
     def description(self) -> str:
         return f"Add {self.key} = {self.value!r} to [{self.name}]"
 
-    def apply(self, content: str) -> str:
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
         """Add a key-value pair to TOML"""
 
-        doc = tomlkit.parse(content)
-
         # Navigate to the table
         keys = self.name.split(".")
         current = doc
@@ -42,8 +121,6 @@ class AddKeyValue(TomlOperation):
         # Add the value
         current[self.key] = self.value
 
-        return tomlkit.dumps(doc)
-
 
 class RemoveKey(TomlOperation):
     """Remove a key from a TOML file"""
@@ -55,29 +132,25 @@ class RemoveKey(TomlOperation):
     def description(self) -> str:
         return f"Remove {self.key} from [{self.table_path}]"
 
-    def apply(self, content: str) -> str:
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
         """Remove a key from TOML"""
 
-        doc = tomlkit.parse(content)
-
         # Navigate to the table
         keys = self.table_path.split(".")
         current = doc
 
         for key in keys:
             if key not in current:
-                raise ValueError(f"Table path '{self.table_path}' not found")
+                raise TargetNotFound(f"Table path '{self.table_path}' not found")
 
             current = current[key]
 
         # Remove the key
         if self.key not in current:
-            raise ValueError(f"Key '{self.key}' not found in '{self.table_path}'")
+            raise TargetNotFound(f"Key '{self.key}' not found in '{self.table_path}'")
 
         del current[self.key]
 
-        return tomlkit.dumps(doc)
-
 
 class AppendToList(TomlOperation):
     """Append a value to a list in a TOML file.
@@ -96,8 +169,7 @@ class AppendToList(TomlOperation):
     def description(self) -> str:
         return f"Append {self.value!r} to {self.name}"
 
-    def apply(self, content: str) -> str:
-        doc = tomlkit.parse(content)
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
         current = doc
 
         # Navigate to the parent table if needed
@@ -115,7 +187,8 @@ class AppendToList(TomlOperation):
                 raise ValueError(f"Cannot append to '{self._list_key}': target is not a list")
             current[self._list_key].append(self.value)
 
-        return tomlkit.dumps(doc)
+        # The list is changed in place, so an index of it would be out of date
+        DependencyIndex.forget(doc)
 
 
 class RemoveFromList(TomlOperation):
@@ -135,20 +208,19 @@ class RemoveFromList(TomlOperation):
     def description(self) -> str:
         return f"Remove {self.value!r} from {self.name}"
 
-    def apply(self, content: str) -> str:
-        doc = tomlkit.parse(content)
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
         current = doc
 
         # Navigate to the parent table if needed
         if self._table_name:
             for key in self._table_name.split("."):
                 if key not in current:
-                    raise ValueError(f"Table path '{self._table_name}' not found")
+                    raise TargetNotFound(f"Table path '{self._table_name}' not found")
                 current = current[key]
 
         # Handle the list operation
         if self._list_key not in current:
-            raise ValueError(f"List '{self._list_key}' not found")
+            raise TargetNotFound(f"List '{self._list_key}' not found")
 
         if not isinstance(current[self._list_key], list | tomlkit.items.Array):
             raise ValueError(f"Cannot remove from '{self._list_key}': target is not a list")
@@ -170,9 +242,81 @@ class RemoveFromList(TomlOperation):
                 break
 
         if not found:
-            raise ValueError(f"Value {self.value!r} not found in {self.name}")
+            raise TargetNotFound(f"Value {self.value!r} not found in {self.name}")
 
-        return tomlkit.dumps(doc)
+        # The list is changed in place, so an index of it would be out of date
+        DependencyIndex.forget(doc)
+
+
+class DependencyOperation(TomlOperation):
+    """Base class for operations on the dependencies in `pyproject.toml`.
+
+    By default the operation changes `project.dependencies`; set `group` for a list in `dependency-groups`, or `extra`
+    for a list in `project.optional-dependencies`. Packages are matched by their PEP 503 normalised names, so
+    "Django_Unicorn" and "django-unicorn" are the same package.
+    """
+
+    def __init__(self, requirement: str, group: str | None = None, extra: str | None = None):
+        self.requirement = parse_requirement(requirement)
+        self.group = group
+        self.extra = extra
+        self.list_name = ".".join(get_keys(group=group, extra=extra))
+
+    def get_dependencies(self, doc: tomlkit.TOMLDocument, *, create: bool = False):
+        return DependencyIndex.from_document(doc).get_list(group=self.group, extra=self.extra, create=create)
+
+
+class AddDependency(DependencyOperation):
+    """Add a dependency to `pyproject.toml`.
+
+    If the package is already a dependency, the specifiers are merged so that both have to be satisfied.
+    """
+
+    def description(self) -> str:
+        return f"Add {str(self.requirement)!r} to {self.list_name}"
+
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
+        dependencies = self.get_dependencies(doc, create=True)
+        existing = dependencies.get(self.requirement.name)
+
+        if existing is None:
+            dependencies.add(self.requirement)
+        else:
+            merged = merge_requirements(existing, self.requirement)
+
+            if str(merged) != str(existing):
+                dependencies.replace(merged)
+
+
+class UpgradeDependency(DependencyOperation):
+    """Replace the specifiers of a dependency in `pyproject.toml`"""
+
+    def description(self) -> str:
+        return f"Upgrade {self.requirement.name!r} to {str(self.requirement)!r} in {self.list_name}"
+
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
+        dependencies = self.get_dependencies(doc)
+        existing = dependencies.get(self.requirement.name)
+
+        if existing is None:
+            raise TargetNotFound(f"Dependency {self.requirement.name!r} not found in {self.list_name}")
+
+        dependencies.replace(upgrade_requirement(existing, self.requirement))
+
+
+class RemoveDependency(DependencyOperation):
+    """Remove a dependency from `pyproject.toml`; any specifiers in the requirement are ignored"""
+
+    def description(self) -> str:
+        return f"Remove {self.requirement.name!r} from {self.list_name}"
+
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> None:
+        dependencies = self.get_dependencies(doc)
+
+        if self.requirement.name not in dependencies:
+            raise TargetNotFound(f"Dependency {self.requirement.name!r} not found in {self.list_name}")
+
+        dependencies.remove(self.requirement.name)
 
 
 class GetVariable(TomlOperation):
@@ -194,22 +338,26 @@ class GetVariable(TomlOperation):
     def apply(self, content: str) -> Any:
         """Get the value associated with a nested name"""
 
-        doc = tomlkit.parse(content)
+        return self.apply_to_document(tomlkit.parse(content))
+
+    def apply_to_document(self, doc: tomlkit.TOMLDocument) -> Any:
+        """Get the value associated with a nested name from a parsed document"""
+
         current = doc
 
         # Navigate to the parent table if needed
         if self._table_path:
             for key in self._table_path.split("."):
                 if key not in current:
-                    raise ValueError(f"Table path '{self._table_path}' not found")
+                    raise TargetNotFound(f"Table path '{self._table_path}' not found")
                 current = current[key]
 
         # Get the value
         if self._key not in current:
             if self._table_path:
-                raise ValueError(f"Key '{self._key}' not found in table '{self._table_path}'")
+                raise TargetNotFound(f"Key '{self._key}' not found in table '{self._table_path}'")
             else:
-                raise ValueError(f"Key '{self._key}' not found")
+                raise TargetNotFound(f"Key '{self._key}' not found")
 
         value = current[self._key]
 
@@ -222,3 +370,8 @@ class GetVariable(TomlOperation):
         else:
             # For strings, bools, ints, floats - return as-is
             return value
+
+    def get_value(self, content: str) -> Any:
+        """Get the value associated with a nested name as a Python value"""
+
+        return self.apply(content)
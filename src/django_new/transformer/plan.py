@@ -0,0 +1,199 @@
+import difflib
+import logging
+from pathlib import Path
+
+from django_new.transformer.journal import Journal
+from django_new.transformer.operations import Operation
+from django_new.transformer.operations.instrumentation import apply_operation, observe
+from django_new.transformer.operations.toml import TomlOperation, TomlSession
+
+logger = logging.getLogger(__name__)
+
+
+class OperationError(Exception):
+    """An operation that was queued in a plan failed when the plan was applied."""
+
+    def __init__(self, operation: Operation, path: Path | None, error: Exception):
+        location = f" for {path}" if path is not None else ""
+
+        super().__init__(f"{operation.description()} failed{location}: {error}")
+
+        self.operation = operation
+        self.path = path
+        self.error = error
+
+
+def apply_operations(content: str, operations: list[Operation], path: Path | None = None) -> str:
+    """Apply operations to the content of a file in order.
+
+    Consecutive TOML operations share one session, so the document is only parsed and serialised once; the hooks get
+    no sizes for the operations in a session, only the time they took to change the document.
+    """
+
+    session: TomlSession | None = None
+
+    for operation in operations:
+        try:
+            if isinstance(operation, TomlOperation):
+                if session is None:
+                    session = TomlSession(content)
+
+                with observe(operation, path=path):
+                    session.apply(operation)
+
+                continue
+
+            if session is not None:
+                content = session.dumps()
+                session = None
+
+            content = apply_operation(operation, content, path=path)
+        except Exception as e:
+            # The operation was queued long before it was applied, so say which one failed
+            raise OperationError(operation, path, e) from e
+
+    if session is not None:
+        content = session.dumps()
+
+    return content
+
+
+class Plan:
+    """In-memory copies of the files that transformations modify.
+
+    Operations are queued per file and only applied when the file is read again or when the plan gets applied.
+    Nothing is written to disk until the plan is committed.
+    """
+
+    def __init__(self):
+        self.originals: dict[Path, str] = {}
+        self.contents: dict[Path, str] = {}
+        self.operations: list[tuple[str | Path, Operation]] = []
+
+        # Operations that have not been applied to the in-memory copy of the file yet
+        self.pending: dict[Path, list[Operation]] = {}
+
+    def read_text(self, path: Path) -> str:
+        """Get the planned content of a file, or its content on disk if it has not been modified."""
+
+        if self.pending.get(path):
+            self._apply_pending(path)
+
+        return self._get_content(path)
+
+    def write_text(self, path: Path, content: str) -> None:
+        """Set the planned content of a file."""
+
+        if path not in self.originals:
+            self.originals[path] = self._get_content(path)
+
+        self.contents[path] = content
+
+    def add_operation(self, path: Path, operation: Operation, original_path: str | Path | None = None) -> None:
+        """Queue an operation for a file.
+
+        Args:
+            path: The resolved path of the file.
+            operation: The operation to apply.
+            original_path: The path as the transformation specified it; used when listing the operations.
+        """
+
+        self.pending.setdefault(path, []).append(operation)
+        self.operations.append((original_path or path, operation))
+
+    def apply(self) -> None:
+        """Apply all queued operations.
+
+        Raises:
+            OperationError: If an operation fails.
+        """
+
+        for path in self.get_pending_paths():
+            self._apply_pending(path)
+
+    def get_pending_paths(self) -> list[Path]:
+        """Paths that have queued operations."""
+
+        return [path for path, operations in self.pending.items() if operations]
+
+    def get_changed_paths(self) -> list[Path]:
+        """Paths whose planned content differs from the content on disk."""
+
+        return [path for path, content in self.contents.items() if content != self.originals[path]]
+
+    def commit(self, journal: Journal) -> list[Path]:
+        """Write all changed files to disk together.
+
+        The originals are recorded in the journal before any file is written, and restored if a write fails.
+
+        Returns:
+            The paths that were written.
+        """
+
+        self.apply()
+        changed_paths = self.get_changed_paths()
+
+        for path in changed_paths:
+            journal.record(path)
+
+        try:
+            for path in changed_paths:
+                path.write_text(self.contents[path])
+                logger.debug(f"Wrote {path}")
+        except Exception:
+            journal.replay()
+
+            raise
+
+        journal.clear()
+
+        # The files on disk now match the plan
+        self.originals.update(self.contents)
+
+        return changed_paths
+
+    def get_diff(self, root_path: Path) -> str:
+        """Get a unified diff of all planned changes.
+
+        Args:
+            root_path: The paths in the diff headers are relative to this path.
+        """
+
+        self.apply()
+
+        root_path = Path(root_path).resolve()
+        diff = ""
+
+        for path in self.get_changed_paths():
+            try:
+                name = path.relative_to(root_path).as_posix()
+            except ValueError:
+                name = path.as_posix()
+
+            for line in difflib.unified_diff(
+                self.originals[path].splitlines(keepends=True),
+                self.contents[path].splitlines(keepends=True),
+                fromfile=f"a/{name}",
+                tofile=f"b/{name}",
+            ):
+                if line.endswith("\n"):
+                    diff += line
+                else:
+                    diff += line + "\n\\ No newline at end of file\n"
+
+        return diff
+
+    def _get_content(self, path: Path) -> str:
+        if path in self.contents:
+            return self.contents[path]
+
+        return path.read_text()
+
+    def _apply_pending(self, path: Path) -> None:
+        operations = self.pending[path]
+        self.pending[path] = []
+
+        content = self._get_content(path)
+        self.originals.setdefault(path, content)
+
+        self.write_text(path, apply_operations(content, operations, path=path))
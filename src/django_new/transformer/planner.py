@@ -0,0 +1,116 @@
+import logging
+
+from django_new.transformer import APPEND, Transformation, resolve_transformation
+
+logger = logging.getLogger(__name__)
+
+
+class Planner:
+    """Orders transformations so they can be installed together in one batch.
+
+    Required transformations are added automatically and always come before the transformations that require them.
+    Otherwise, transformations keep the order they were requested in.
+    """
+
+    def __init__(self, *transformations: str | type[Transformation]):
+        self.transformations = transformations
+
+        self._requirements: dict[type[Transformation], list[type[Transformation]]] = {}
+
+    def resolve(self) -> list[type[Transformation]]:
+        """Get the transformation classes in the order they should be installed.
+
+        Raises:
+            ValueError: If there is a circular requirement or two of the transformations conflict.
+        """
+
+        transformation_classes: list[type[Transformation]] = []
+
+        for transformation in self.transformations:
+            self._add(_resolve(transformation), transformation_classes, stack=[])
+
+        self._check_conflicts(transformation_classes)
+
+        logger.debug(f"Planned transformations: {[cls.get_name() for cls in transformation_classes]}")
+
+        return transformation_classes
+
+    def _add(
+        self,
+        transformation_cls: type[Transformation],
+        transformation_classes: list[type[Transformation]],
+        stack: list[type[Transformation]],
+    ) -> None:
+        if transformation_cls in stack:
+            names = " -> ".join(cls.get_name() for cls in [*stack, transformation_cls])
+
+            raise ValueError(f"Circular requirement: {names}")
+
+        if transformation_cls in transformation_classes:
+            return
+
+        requirements = [_resolve(requirement) for requirement in transformation_cls.requires]
+        self._requirements[transformation_cls] = requirements
+
+        # Add requirements first, so the list ends up topologically sorted
+        for requirement in requirements:
+            self._add(requirement, transformation_classes, stack=[*stack, transformation_cls])
+
+        transformation_classes.append(transformation_cls)
+
+    def _check_conflicts(self, transformation_classes: list[type[Transformation]]) -> None:
+        for idx, transformation_cls in enumerate(transformation_classes):
+            for other_cls in transformation_classes[idx + 1 :]:
+                if _conflicts(transformation_cls, other_cls) or _conflicts(other_cls, transformation_cls):
+                    raise ValueError(f"{transformation_cls.get_name()} conflicts with {other_cls.get_name()}")
+
+                shared_settings = _get_shared_settings(transformation_cls, other_cls)
+
+                if shared_settings and not self._is_required_by(transformation_cls, other_cls):
+                    raise ValueError(
+                        f"{transformation_cls.get_name()} and {other_cls.get_name()} both modify "
+                        f"{', '.join(shared_settings)}, so one of them has to require the other"
+                    )
+
+    def _is_required_by(self, requirement_cls: type[Transformation], transformation_cls: type[Transformation]) -> bool:
+        requirements = self._requirements.get(transformation_cls, [])
+
+        return requirement_cls in requirements or any(
+            self._is_required_by(requirement_cls, cls) for cls in requirements
+        )
+
+
+def _resolve(transformation: str | type[Transformation]) -> type[Transformation]:
+    if isinstance(transformation, str):
+        return resolve_transformation(transformation)
+
+    return transformation
+
+
+def _get_shared_settings(transformation_cls: type[Transformation], other_cls: type[Transformation]) -> list[str]:
+    """Get the settings that both transformations edit, where the result depends on which one is applied first."""
+
+    shared_settings = set()
+
+    for name, kind in transformation_cls.settings.items():
+        for other_name, other_kind in other_cls.settings.items():
+            if kind == APPEND and other_kind == APPEND:
+                continue
+
+            # Editing a dict setting overlaps with editing any of its keys
+            if name == other_name or name.startswith(f"{other_name}.") or other_name.startswith(f"{name}."):
+                shared_settings.add(min(name, other_name, key=len))
+
+    return sorted(shared_settings)
+
+
+def _conflicts(transformation_cls: type[Transformation], other_cls: type[Transformation]) -> bool:
+    for conflict in transformation_cls.conflicts_with:
+        try:
+            if _resolve(conflict) is other_cls:
+                return True
+        except (ImportError, ValueError):
+            # A transformation that cannot be resolved is not part of the plan
+            continue
+
+    return False
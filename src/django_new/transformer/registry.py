@@ -0,0 +1,111 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from importlib.metadata import EntryPoint, entry_points
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+ENTRY_POINT_GROUP = "django_new.transformations"
+CACHE_FILE_NAME = "transformations.json"
+
+
+def get_cache_path() -> Path:
+    """Get the path of the on-disk index of transformation entry points."""
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    return Path(cache_home) / "django-new" / CACHE_FILE_NAME
+
+
+def get_distributions_key() -> str:
+    """Get a key that changes whenever a distribution is installed, upgraded, or removed.
+
+    Installing or removing a distribution adds or removes its metadata directory, which changes the modification time
+    of the directory on `sys.path` that contains it, so only those directories are checked. That is much cheaper than
+    reading the entry points, or checking the metadata directory, of every distribution.
+    """
+
+    hasher = hashlib.sha256()
+
+    for path in sys.path:
+        try:
+            mtime = os.stat(path or ".").st_mtime_ns
+        except OSError:
+            continue
+
+        hasher.update(f"{path}:{mtime}\n".encode())
+
+    return hasher.hexdigest()
+
+
+@functools.cache
+def get_index() -> dict[str, str]:
+    """Get the transformation entry points as a mapping of name to `module:attribute`.
+
+    The index is read from the on-disk cache when the installed distributions have not changed since it was written,
+    and is only looked up once per process. Nothing is imported until a transformation is resolved.
+    """
+
+    key = get_distributions_key()
+    cache_path = get_cache_path()
+
+    try:
+        cache = json.loads(cache_path.read_text())
+
+        if cache["key"] == key:
+            logger.debug(f"Read transformation index from {cache_path}")
+
+            return cache["entry_points"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    index: dict[str, str] = {}
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in index:
+            logger.debug(f"Skipping duplicate transformation entry point '{entry_point.name}': {entry_point.value}")
+
+            continue
+
+        index[entry_point.name] = entry_point.value
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # A unique temporary file, so processes that write the index at the same time do not write to the same file
+        with tempfile.NamedTemporaryFile(
+            "w", dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp", delete=False
+        ) as temporary_file:
+            temporary_path = Path(temporary_file.name)
+
+            try:
+                temporary_file.write(json.dumps({"key": key, "entry_points": index}))
+                temporary_file.close()
+                temporary_path.replace(cache_path)
+            except OSError:
+                temporary_path.unlink(missing_ok=True)
+
+                raise
+
+        logger.debug(f"Wrote transformation index to {cache_path}")
+    except OSError as e:
+        logger.debug(f"Could not write transformation index to {cache_path}: {e}")
+
+    return index
+
+
+def get_entry_point(name: str) -> EntryPoint | None:
+    """Get the entry point for a transformation name, if a distribution registered one."""
+
+    value = get_index().get(name)
+
+    if value is None:
+        return None
+
+    return EntryPoint(name=name, value=value, group=ENTRY_POINT_GROUP)
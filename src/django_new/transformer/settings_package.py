@@ -0,0 +1,143 @@
+import ast
+from collections.abc import Callable
+from pathlib import Path
+
+from django_new.parser import parse
+
+# Module names that are used for each environment, in order of preference
+ENVIRONMENT_MODULE_NAMES = {
+    "base": ("base", "common"),
+    "production": ("production", "prod"),
+    "local": ("local", "development", "dev"),
+    "test": ("test", "tests", "testing"),
+}
+
+
+class SettingsPackage:
+    """A settings package that is split into modules per environment, e.g. `config/settings/base.py` and
+    `config/settings/production.py`.
+
+    Every module in the package is indexed once: the names that it assigns at the top level, and the modules that it
+    star-imports, e.g. `from .base import *`.
+    """
+
+    def __init__(self, root_path: Path, path: Path, read_text: Callable[[Path], str] | None = None):
+        self.root_path = Path(root_path)
+        self.path = Path(path)
+        self.read_text = read_text or Path.read_text
+
+        # Module name -> path of every module in the package
+        self.modules: dict[str, Path] = {
+            module_path.stem: module_path
+            for module_path in sorted(self.path.glob("*.py"))
+            if module_path.stem != "__init__"
+        }
+
+        # Module name -> names assigned at the top level of the module
+        self.names: dict[str, set[str]] = {}
+
+        # Module name -> names of the modules that it star-imports, in the order they are imported
+        self.imports: dict[str, list[str]] = {}
+
+        for module_name, module_path in self.modules.items():
+            self._add_module(module_name, module_path)
+
+    @classmethod
+    def find(
+        cls, root_path: Path, settings_path: Path, read_text: Callable[[Path], str] | None = None
+    ) -> "SettingsPackage | None":
+        """Get the package that contains a settings file, or `None` if the settings are not split into a package."""
+
+        if settings_path.name == "settings.py" or settings_path.parent.name != "settings":
+            return None
+
+        return cls(root_path, settings_path.parent, read_text=read_text)
+
+    def get_module_name(self, environment: str) -> str:
+        """Get the name of the module for an environment, e.g. "prod" for "production".
+
+        Raises:
+            FileNotFoundError: If the package does not have a module for the environment.
+        """
+
+        for module_name in (environment, *ENVIRONMENT_MODULE_NAMES.get(environment, ())):
+            if module_name in self.modules:
+                return module_name
+
+        raise FileNotFoundError(f"Settings for environment '{environment}' not found in {self.path}")
+
+    def get_path(self, environment: str) -> Path:
+        """Get the path of the module for an environment."""
+
+        return self.modules[self.get_module_name(environment)]
+
+    def get_chain(self, environment: str) -> list[str]:
+        """Get the modules that settings of an environment are looked up in, from the module itself to its bases.
+
+        Later star imports override earlier ones, so they are looked up first.
+        """
+
+        chain: list[str] = []
+
+        def add(module_name: str) -> None:
+            if module_name in chain:
+                return
+
+            chain.append(module_name)
+
+            for imported_name in reversed(self.imports.get(module_name, [])):
+                add(imported_name)
+
+        add(self.get_module_name(environment))
+
+        return chain
+
+    def find_definition(self, environment: str, name: str) -> Path | None:
+        """Get the path of the module that defines the value a setting has in an environment."""
+
+        for module_name in self.get_chain(environment):
+            if name in self.names[module_name]:
+                return self.modules[module_name]
+
+        return None
+
+    def _add_module(self, module_name: str, module_path: Path) -> None:
+        names: set[str] = set()
+        imports: list[str] = []
+
+        try:
+            module = parse(self.read_text(module_path))
+        except SyntaxError:
+            module = ast.Module(body=[], type_ignores=[])
+
+        for statement in module.body:
+            if isinstance(statement, ast.Assign):
+                names.update(target.id for target in statement.targets if isinstance(target, ast.Name))
+            elif isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+                names.add(statement.target.id)
+            elif isinstance(statement, ast.ImportFrom) and any(alias.name == "*" for alias in statement.names):
+                imported_name = self._resolve_import(statement)
+
+                if imported_name is not None:
+                    imports.append(imported_name)
+
+        self.names[module_name] = names
+        self.imports[module_name] = imports
+
+    def _resolve_import(self, statement: ast.ImportFrom) -> str | None:
+        """Get the name of the module in the package that a star import refers to."""
+
+        if statement.module is None:
+            return None
+
+        if statement.level == 1:
+            module_path = self.path / f"{statement.module.replace('.', '/')}.py"
+        elif statement.level == 0:
+            module_path = self.root_path / f"{statement.module.replace('.', '/')}.py"
+        else:
+            return None
+
+        if module_path.parent.resolve() != self.path.resolve() or module_path.stem not in self.modules:
+            return None
+
+        return module_path.stem
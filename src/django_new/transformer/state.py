@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from django_new.transformer import Transformation
+
+logger = logging.getLogger(__name__)
+
+
+STATE_PATH_NAME = "django_new/state.json"
+
+
+def hash_file(path: Path) -> str | None:
+    """Get the SHA-256 hash of a file, or `None` if it does not exist."""
+
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class State:
+    """Record of the transformations that have been applied to a project.
+
+    Each transformation is stored with its version and the hashes of the files it touched, so a transformation that
+    was already applied can be skipped without parsing any files, as long as none of them has changed since.
+    """
+
+    def __init__(self, root_path: Path):
+        self.root_path = Path(root_path).resolve()
+        self.path = self.root_path / STATE_PATH_NAME
+
+        self._transformations: dict[str, dict] | None = None
+
+    @property
+    def transformations(self) -> dict[str, dict]:
+        """Applied transformations keyed by name."""
+
+        if self._transformations is None:
+            self._transformations = self._load()
+
+        return self._transformations
+
+    def is_applied(self, transformation: "Transformation") -> bool:
+        """Whether the same version of the transformation was applied and its files are unchanged."""
+
+        name = transformation.get_name()
+        entry = self.transformations.get(name)
+
+        if entry is None:
+            return False
+
+        if entry.get("version") != transformation.version:
+            logger.debug(f"{name} was applied with version {entry.get('version')}")
+
+            return False
+
+        for relative_path, file_hash in entry.get("files", {}).items():
+            if hash_file(self.root_path / relative_path) != file_hash:
+                logger.debug(f"{relative_path} changed since {name} was applied")
+
+                return False
+
+        return True
+
+    def record(self, transformation: "Transformation") -> None:
+        """Store the version of an applied transformation, the current hashes of the files it touched, and its data."""
+
+        files = {}
+
+        for path in sorted(transformation.modified_paths):
+            relative_path = Path(path).resolve().relative_to(self.root_path).as_posix()
+            files[relative_path] = hash_file(self.root_path / relative_path)
+
+        entry = {
+            "version": transformation.version,
+            "files": files,
+        }
+
+        data = transformation.get_data()
+
+        if data:
+            entry["data"] = data
+
+        self.transformations[transformation.get_name()] = entry
+
+    def get_data(self, transformation: "Transformation") -> dict[str, Any]:
+        """Get the data the transformation stored when it was applied."""
+
+        return self.transformations.get(transformation.get_name(), {}).get("data", {})
+
+    def remove(self, transformation: "Transformation") -> None:
+        """Forget a transformation that was reversed."""
+
+        self.transformations.pop(transformation.get_name(), None)
+
+    def save(self) -> None:
+        """Write the state to disk."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        temporary_path = self.path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps({"transformations": self.transformations}, indent=2, sort_keys=True))
+        temporary_path.replace(self.path)
+
+        logger.debug(f"Wrote {self.path}")
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            return json.loads(self.path.read_text())["transformations"]
+        except FileNotFoundError:
+            return {}
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring invalid state file {self.path}: {e}")
+
+            return {}
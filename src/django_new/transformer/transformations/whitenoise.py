@@ -1,12 +1,32 @@
-from packaging.requirements import Requirement
+from typing import Any, ClassVar
 
-from django_new.transformer import Transformation
+from django_new.transformer import APPEND, ASSIGN, INSERT, Transformation
 from django_new.transformer.operations import python, toml
+from django_new.transformer.operations.dependency_index import DependencyList
+
+STATICFILES_STORAGES = {
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 
 class WhitenoiseTransformation(Transformation):
     """Add whitenoise to a Django project"""
 
+    name = "whitenoise"
+    settings: ClassVar[dict[str, str]] = {
+        "INSTALLED_APPS": APPEND,
+        "MIDDLEWARE": INSERT,
+        "STORAGES.staticfiles.BACKEND": ASSIGN,
+    }
+
+    def __init__(self, root_path):
+        super().__init__(root_path)
+
+        # Records the storage it replaces, so `backwards` can restore it
+        self.merge_storages = python.MergeDict(name="STORAGES", value=STATICFILES_STORAGES)
+
     def get_summary(self) -> str:
         return """### Whitenoise
 
@@ -25,20 +45,16 @@ Documentation is available at https://whitenoise.readthedocs.io/.
         # Add package to pyproject.toml dependencies
         dependencies = self.get_variable("pyproject.toml", "project.dependencies")
 
-        for dependency in dependencies:
-            req = Requirement(dependency)
+        if "whitenoise" in DependencyList(dependencies):
+            raise AssertionError("Whitenoise already installed")
 
-            if req.name == "whitenoise":
-                raise AssertionError("Whitenoise already installed")
-
-        self.modify_file("pyproject.toml", toml.AppendToList(name="project.dependencies", value="whitenoise==6.6.0"))
+        self.modify_file("pyproject.toml", toml.AddDependency("whitenoise==6.6.0"))
 
         # Add whitenoise.runserver_nostatic to INSTALLED_APPS
         installed_apps = self.get_variable(settings_path, "INSTALLED_APPS")
 
-        for app in installed_apps:
-            if app == "whitenoise.runserver_nostatic":
-                raise AssertionError("whitenoise.runserver_nostatic already installed")
+        if not isinstance(installed_apps, python.Expression) and "whitenoise.runserver_nostatic" in installed_apps:
+            raise AssertionError("whitenoise.runserver_nostatic already installed")
 
         self.modify_file(
             settings_path,
@@ -48,9 +64,11 @@ Documentation is available at https://whitenoise.readthedocs.io/.
         # Add whitenoise.middleware.WhiteNoiseMiddleware to MIDDLEWARE
         middlewares = self.get_variable(settings_path, "MIDDLEWARE")
 
-        for middleware in middlewares:
-            if middleware == "whitenoise.middleware.WhiteNoiseMiddleware":
-                raise AssertionError("whitenoise.middleware.WhiteNoiseMiddleware already installed")
+        if (
+            not isinstance(middlewares, python.Expression)
+            and "whitenoise.middleware.WhiteNoiseMiddleware" in middlewares
+        ):
+            raise AssertionError("whitenoise.middleware.WhiteNoiseMiddleware already installed")
 
         self.modify_file(
             settings_path,
@@ -67,21 +85,21 @@ Documentation is available at https://whitenoise.readthedocs.io/.
         except ValueError:
             storages = {}
 
-        for storage in storages:
-            if storage == "whitenoise.storage.CompressedManifestStaticFilesStorage":
+        if isinstance(storages, dict) and isinstance(storages.get("staticfiles"), dict):
+            backend = storages["staticfiles"].get("BACKEND")
+
+            if backend == "whitenoise.storage.CompressedManifestStaticFilesStorage":
                 raise AssertionError("whitenoise.storage.CompressedManifestStaticFilesStorage already installed")
 
-        self.modify_file(
-            settings_path,
-            python.AssignVariable(
-                name="STORAGES",
-                value={
-                    "staticfiles": {
-                        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
-                    },
-                },
-            ),
-        )
+        self.modify_file(settings_path, self.merge_storages)
+
+    def get_data(self) -> dict[str, Any]:
+        record = self.merge_storages.get_record()
+
+        if record is None:
+            return {}
+
+        return {"STORAGES": record}
 
     def backwards(self):
         # Determine settings.py path
@@ -98,16 +116,13 @@ Documentation is available at https://whitenoise.readthedocs.io/.
             python.RemoveFromList(name="MIDDLEWARE", value='"whitenoise.middleware.WhiteNoiseMiddleware"'),
         )
 
-        # Reset STORAGES.staticfiles to empty dict
+        # Restore the static files storage that was replaced, keeping any other storages
         self.modify_file(
             settings_path,
-            python.AssignVariable(
-                name="STORAGES",
-                value={
-                    "staticfiles": {},
-                },
+            python.UnmergeDict.from_record(
+                name="STORAGES", value=STATICFILES_STORAGES, record=self.data.get("STORAGES")
             ),
         )
 
         # Remove from pyproject.toml dependencies
-        self.modify_file("pyproject.toml", toml.RemoveFromList(name="project.dependencies", value="whitenoise==6.6.0"))
+        self.modify_file("pyproject.toml", toml.RemoveDependency("whitenoise"))
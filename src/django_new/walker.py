@@ -0,0 +1,309 @@
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Directories and files that are never interesting in a project tree, in `.gitignore` syntax
+DEFAULT_IGNORE_PATTERNS = (
+    "__pycache__/",
+    "*.py[cod]",
+    "*.egg-info/",
+    "node_modules/",
+    "media/",
+    "staticfiles/",
+    "htmlcov/",
+    "venv/",
+)
+
+# How deep to descend into directories
+MAX_DEPTH = 8
+
+# How many entries to list in total before the rest are summarised
+MAX_ENTRIES = 1_000
+
+
+@dataclass
+class TreeNode:
+    """A file or directory in the project tree."""
+
+    name: str
+    path: Path
+    is_dir: bool
+    children: list["TreeNode"] = field(default_factory=list)
+
+    # How many entries of the directory were left out because the entry budget ran out
+    more: int = 0
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """A pattern from a `.gitignore` file."""
+
+    # Matches the path relative to `base`, or the name when the pattern is not anchored
+    regex: re.Pattern
+
+    # Directory of the `.gitignore` file, relative to the root; "" for the root
+    base: str
+
+    # Whether the pattern starts with `!`, which un-ignores the paths it matches
+    negate: bool
+
+    # Whether the pattern ends with `/`, so it only matches directories
+    dir_only: bool
+
+    # Whether the pattern contains a `/`, so it is matched against the whole path instead of the name
+    anchored: bool
+
+    def matches(self, relative_path: str, name: str, is_dir: bool) -> bool:  # noqa: FBT001
+        if self.dir_only and not is_dir:
+            return False
+
+        if self.base:
+            if not relative_path.startswith(f"{self.base}/"):
+                return False
+
+            relative_path = relative_path[len(self.base) + 1 :]
+
+        return bool(self.regex.fullmatch(relative_path if self.anchored else name))
+
+
+class IgnoreRules:
+    """The `.gitignore` rules that apply to a directory; like git, the last matching rule wins."""
+
+    def __init__(self, rules: tuple[IgnoreRule, ...] = ()):
+        self.rules = rules
+
+    @classmethod
+    def from_patterns(cls, patterns: list[str] | tuple[str, ...], base: str = "") -> "IgnoreRules":
+        return cls(tuple(rule for rule in (parse_pattern(pattern, base) for pattern in patterns) if rule))
+
+    def add_gitignore(self, directory: Path, base: str) -> "IgnoreRules":
+        """Get the rules extended with the `.gitignore` file in a directory, if there is one."""
+
+        try:
+            patterns = (directory / ".gitignore").read_text().splitlines()
+        except (FileNotFoundError, NotADirectoryError, UnicodeDecodeError):
+            return self
+        except OSError as e:
+            logger.debug(f"Could not read {directory / '.gitignore'}: {e}")
+
+            return self
+
+        return IgnoreRules(self.rules + IgnoreRules.from_patterns(patterns, base=base).rules)
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:  # noqa: FBT001
+        name = relative_path.rsplit("/", 1)[-1]
+        ignored = False
+
+        for rule in self.rules:
+            if rule.matches(relative_path, name, is_dir):
+                ignored = not rule.negate
+
+        return ignored
+
+
+def parse_pattern(pattern: str, base: str = "") -> IgnoreRule | None:
+    """Parse a line of a `.gitignore` file; returns `None` for blank lines and comments."""
+
+    pattern = pattern.rstrip()
+
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negate = pattern.startswith("!")
+
+    if negate:
+        pattern = pattern[1:]
+
+    if pattern.startswith("\\"):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+
+    if not pattern:
+        return None
+
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    return IgnoreRule(
+        regex=re.compile(translate_pattern(pattern)),
+        base=base,
+        negate=negate,
+        dir_only=dir_only,
+        anchored=anchored,
+    )
+
+
+def translate_pattern(pattern: str) -> str:
+    """Translate a `.gitignore` glob to a regular expression."""
+
+    regex = ""
+    idx = 0
+
+    while idx < len(pattern):
+        char = pattern[idx]
+
+        if pattern.startswith("**/", idx):
+            regex += "(?:.*/)?"
+            idx += 3
+        elif pattern.startswith("**", idx):
+            regex += ".*"
+            idx += 2
+        elif char == "*":
+            regex += "[^/]*"
+            idx += 1
+        elif char == "?":
+            regex += "[^/]"
+            idx += 1
+        elif char == "[" and "]" in pattern[idx + 2 :]:
+            end = pattern.index("]", idx + 2)
+            characters = pattern[idx + 1 : end]
+
+            if characters.startswith("!"):
+                characters = f"^{characters[1:]}"
+
+            regex += f"[{characters}]"
+            idx = end + 1
+        else:
+            regex += re.escape(char)
+            idx += 1
+
+    return regex
+
+
+def scan_directory(directory: Path, rules: IgnoreRules, relative_path: str = "") -> list[os.DirEntry]:
+    """List the entries of a directory that are not hidden or ignored, directories first and then by name.
+
+    `os.scandir` gets the type of each entry while listing the directory, so sorting and filtering the entries does
+    not need any more system calls.
+    """
+
+    try:
+        with os.scandir(directory) as iterator:
+            entries = [entry for entry in iterator if not entry.name.startswith(".")]
+    except OSError as e:
+        logger.debug(f"Could not list {directory}: {e}")
+
+        return []
+
+    entries = [
+        entry
+        for entry in entries
+        if not rules.is_ignored(f"{relative_path}/{entry.name}" if relative_path else entry.name, is_dir(entry))
+    ]
+    entries.sort(key=lambda entry: (not is_dir(entry), entry.name.lower()))
+
+    return entries
+
+
+def is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def build_tree(directory: Path, max_depth: int = MAX_DEPTH, max_entries: int = MAX_ENTRIES) -> TreeNode:
+    """Walk a directory once and build the tree of its contents.
+
+    Hidden files, the default ignore patterns and `.gitignore` files are skipped. Directories deeper than `max_depth`
+    are not opened, and after `max_entries` entries the rest of each directory is only counted.
+    """
+
+    directory = Path(directory)
+    root = TreeNode(name=str(directory), path=directory, is_dir=True)
+    remaining = max_entries
+
+    def walk(node: TreeNode, relative_path: str, depth: int, rules: IgnoreRules) -> None:
+        nonlocal remaining
+
+        entries = scan_directory(node.path, rules, relative_path)
+
+        for idx, entry in enumerate(entries):
+            if remaining <= 0:
+                node.more = len(entries) - idx
+
+                return
+
+            remaining -= 1
+
+            child = TreeNode(name=entry.name, path=node.path / entry.name, is_dir=is_dir(entry))
+            node.children.append(child)
+
+            # Symlinked directories are not followed, so they cannot loop
+            if child.is_dir and depth < max_depth and not entry.is_symlink():
+                child_relative_path = f"{relative_path}/{entry.name}" if relative_path else entry.name
+                child_rules = rules.add_gitignore(child.path, base=child_relative_path)
+
+                walk(child, child_relative_path, depth + 1, child_rules)
+
+    rules = IgnoreRules.from_patterns(DEFAULT_IGNORE_PATTERNS).add_gitignore(directory, base="")
+    walk(root, "", 1, rules)
+
+    return root
+
+
+def build_tree_from_paths(directory: Path, paths: list[Path]) -> TreeNode:
+    """Build the tree of some paths in a directory, e.g. the files that were created, without walking the directory.
+
+    Paths outside of the directory are left out; the directories in between are added.
+    """
+
+    directory = Path(directory)
+    root = TreeNode(name=str(directory), path=directory, is_dir=True)
+    nodes: dict[Path, TreeNode] = {directory: root}
+
+    for path in paths:
+        try:
+            parts = Path(path).relative_to(directory).parts
+        except ValueError:
+            continue
+
+        node = root
+
+        for idx, part in enumerate(parts):
+            child_path = node.path / part
+            child = nodes.get(child_path)
+
+            if child is None:
+                is_last = idx == len(parts) - 1
+                child = TreeNode(name=part, path=child_path, is_dir=not is_last or child_path.is_dir())
+
+                nodes[child_path] = child
+                node.children.append(child)
+
+            node = child
+
+    for node in nodes.values():
+        node.children.sort(key=lambda child: (not child.is_dir, child.name.lower()))
+
+    return root
+
+
+def render_plain(root: TreeNode) -> str:
+    """Render a tree as plain text with the same guides as `rich`."""
+
+    lines = [f"📂 {root.name}"]
+
+    def render(node: TreeNode, prefix: str) -> None:
+        labels = [(f"📂 {child.name}" if child.is_dir else child.name, child) for child in node.children]
+
+        if node.more:
+            labels.append((f"… {node.more} more", None))
+
+        for idx, (label, child) in enumerate(labels):
+            is_last = idx == len(labels) - 1
+
+            lines.append(f"{prefix}{'└── ' if is_last else '├── '}{label}")
+
+            if child is not None and (child.children or child.more):
+                render(child, prefix + ("    " if is_last else "│   "))
+
+    render(root, "")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,188 @@
+import json
+
+import pytest
+from benchmarks.__main__ import main
+from benchmarks.compare import compare_app as app
+from benchmarks.compare import compare_benchmark, compare_results, get_noise, get_threshold
+from typer.testing import CliRunner
+
+runner = CliRunner()
+
+MACHINE = {"python": "3.12.0", "platform": "Linux", "django_new": "0.6.1"}
+
+
+def get_benchmark(name: str, samples: list[float], peak_memory: int | None = 1_000_000, **parse_counts) -> dict:
+    return {
+        "name": name,
+        "group": name.rsplit(".", 1)[0],
+        "param": None,
+        "samples": samples,
+        "peak_memory": peak_memory,
+        "parse_counts": parse_counts,
+    }
+
+
+def write_results(path, *benchmarks, machine=MACHINE) -> None:
+    path.write_text(json.dumps({"version": 1, "machine": machine, "benchmarks": list(benchmarks)}))
+
+
+def test_get_noise():
+    assert get_noise([1.0, 1.0, 1.0]) == 0.0
+
+    # One slow sample does not make the samples noisy
+    assert get_noise([1.0, 1.0, 1.0, 1.0, 10.0]) == 0.0
+
+    assert 0.0 < get_noise([0.9, 1.0, 1.1]) < 0.2
+
+
+def test_get_threshold():
+    assert get_threshold([1.0, 1.0, 1.0], [1.0, 1.0, 1.0]) == 0.05
+    assert get_threshold([0.8, 1.0, 1.2], [1.0, 1.0, 1.0]) > 0.5
+
+
+def test_compare_benchmark_startup_regression():
+    comparison = compare_benchmark(
+        get_benchmark("cli.version", [0.50, 0.50, 0.51]),
+        get_benchmark("cli.version", [0.60, 0.61, 0.60]),
+    )
+
+    assert comparison.median_delta > 0.19
+    assert comparison.regressions == [f"time {comparison.median_delta:+.1%}"]
+    assert comparison.status == "regression"
+
+
+def test_compare_benchmark_noisy():
+    comparison = compare_benchmark(
+        get_benchmark("cli.version", [0.40, 0.50, 0.60]),
+        get_benchmark("cli.version", [0.45, 0.55, 0.65]),
+    )
+
+    assert comparison.regressions == []
+    assert comparison.status == "unchanged"
+
+
+def test_compare_benchmark_time_not_gated():
+    comparison = compare_benchmark(
+        get_benchmark("operations.python.append_to_list[100]", [0.010, 0.010, 0.010]),
+        get_benchmark("operations.python.append_to_list[100]", [0.020, 0.020, 0.020]),
+    )
+
+    assert comparison.regressions == []
+    assert comparison.status == "slower"
+
+
+def test_compare_benchmark_time_gated():
+    comparison = compare_benchmark(
+        get_benchmark("operations.python.append_to_list[100]", [0.010, 0.010, 0.010]),
+        get_benchmark("operations.python.append_to_list[100]", [0.020, 0.020, 0.020]),
+        gated_groups=("operations",),
+    )
+
+    assert comparison.status == "regression"
+
+
+def test_compare_benchmark_faster():
+    comparison = compare_benchmark(
+        get_benchmark("cli.version", [0.50, 0.50, 0.50]),
+        get_benchmark("cli.version", [0.25, 0.25, 0.25]),
+    )
+
+    assert comparison.median_delta == -0.5
+    assert comparison.status == "faster"
+
+
+def test_compare_benchmark_peak_memory():
+    comparison = compare_benchmark(
+        get_benchmark("operations.python.append_to_list[100]", [0.01], peak_memory=1_000_000),
+        get_benchmark("operations.python.append_to_list[100]", [0.01], peak_memory=1_500_000),
+    )
+
+    assert comparison.regressions == ["peak memory +50.0%"]
+
+
+def test_compare_benchmark_peak_memory_within_slack():
+    comparison = compare_benchmark(
+        get_benchmark("operations.python.append_to_list[100]", [0.01], peak_memory=100_000),
+        get_benchmark("operations.python.append_to_list[100]", [0.01], peak_memory=150_000),
+    )
+
+    assert comparison.regressions == []
+
+
+def test_compare_benchmark_parse_counts():
+    comparison = compare_benchmark(
+        get_benchmark("operations.python.append_to_list[100]", [0.01], libcst=1, ast=2),
+        get_benchmark("operations.python.append_to_list[100]", [0.01], libcst=2, ast=1),
+    )
+
+    assert comparison.parse_deltas == {"libcst": 1, "ast": -1}
+    assert comparison.regressions == ["libcst parses +1"]
+
+
+def test_compare_results_added_and_removed():
+    baseline = {"benchmarks": [get_benchmark("cli.version", [0.5]), get_benchmark("cli.help", [0.5])]}
+    current = {"benchmarks": [get_benchmark("cli.version", [0.5]), get_benchmark("creators.classic", [0.05])]}
+
+    comparisons, removed, added = compare_results(baseline, current)
+
+    assert [comparison.name for comparison in comparisons] == ["cli.version"]
+    assert removed == ["cli.help"]
+    assert added == ["creators.classic"]
+
+
+def test_compare(temp_path):
+    write_results(temp_path / "baseline.json", get_benchmark("cli.version", [0.50, 0.50, 0.50]))
+    write_results(temp_path / "current.json", get_benchmark("cli.version", [0.51, 0.50, 0.50]))
+
+    result = runner.invoke(app, ["compare", str(temp_path / "baseline.json"), str(temp_path / "current.json")])
+
+    assert result.exit_code == 0
+    assert "No regressions in 1 benchmarks" in result.output
+    assert "different machines" not in result.output
+
+
+def test_compare_regression(temp_path):
+    write_results(temp_path / "baseline.json", get_benchmark("cli.version", [0.50, 0.50, 0.50]))
+    write_results(
+        temp_path / "current.json",
+        get_benchmark("cli.version", [0.70, 0.70, 0.70]),
+        machine={**MACHINE, "django_new": "0.7.0"},
+    )
+
+    result = runner.invoke(app, ["compare", str(temp_path / "baseline.json"), str(temp_path / "current.json")])
+
+    assert result.exit_code == 1
+    assert "+40.0%" in result.output
+
+    # Only the version of django-new is different
+    assert "different machines" not in result.output
+
+
+def test_compare_different_machines(temp_path):
+    write_results(temp_path / "baseline.json", get_benchmark("cli.version", [0.50]))
+    write_results(temp_path / "current.json", get_benchmark("cli.version", [0.50]), machine={"python": "3.13.0"})
+
+    result = runner.invoke(app, ["compare", str(temp_path / "baseline.json"), str(temp_path / "current.json")])
+
+    assert result.exit_code == 0
+    assert "different machines" in result.output
+
+
+def test_compare_unsupported_results(temp_path):
+    write_results(temp_path / "baseline.json", get_benchmark("cli.version", [0.50]))
+    (temp_path / "current.json").write_text(json.dumps({"version": 2, "benchmarks": []}))
+
+    result = runner.invoke(app, ["compare", str(temp_path / "baseline.json"), str(temp_path / "current.json")])
+
+    assert result.exit_code == 2
+
+
+def test_main_compare(temp_path, capsys):
+    write_results(temp_path / "baseline.json", get_benchmark("cli.version", [0.50, 0.50, 0.50]))
+    write_results(temp_path / "current.json", get_benchmark("cli.version", [0.50, 0.50, 0.50]))
+
+    with pytest.raises(SystemExit) as e:
+        main(["compare", str(temp_path / "baseline.json"), str(temp_path / "current.json")])
+
+    assert e.value.code == 0
+    assert "No regressions in 1 benchmarks" in capsys.readouterr().out
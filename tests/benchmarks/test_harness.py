@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from benchmarks.harness import Benchmark, Timer, percentile, run, write_results
+
+from django_new.transformer.operations.python import AppendToList
+from django_new.transformer.operations.toml import AddKeyValue
+
+
+def append_to_list(timer: Timer, line_count: int) -> None:
+    content = "INSTALLED_APPS = []\n" + "DEBUG = True\n" * line_count
+
+    with timer:
+        AppendToList(name="INSTALLED_APPS", value='"app"').apply(content)
+        AddKeyValue(name="project", key="name", value="example").apply("[project]\n")
+
+
+def test_run():
+    benchmark = Benchmark(name="append_to_list[10]", group="operations", func=append_to_list, param=10)
+
+    results = run([benchmark], repeat=3, warmup=0)
+
+    assert results["version"] == 1
+    assert results["machine"]["python"]
+
+    (result,) = results["benchmarks"]
+
+    assert result["name"] == "append_to_list[10]"
+    assert len(result["samples"]) == 3
+    assert result["min"] <= result["median"] <= result["p95"] <= result["max"]
+    assert result["peak_memory"] > 0
+
+    # The caches are cleared before each run, so the code is always parsed
+    assert result["parse_counts"] == {"libcst": 1, "ast": 0, "tomlkit": 1}
+
+
+def test_run_without_profile():
+    benchmark = Benchmark(name="append_to_list[10]", group="operations", func=append_to_list, param=10, profile=False)
+
+    (result,) = run([benchmark], repeat=2, warmup=0)["benchmarks"]
+
+    assert result["peak_memory"] is None
+    assert result["parse_counts"] == {}
+
+
+def test_run_without_timer():
+    benchmark = Benchmark(name="setup_only", group="operations", func=lambda _: None)
+
+    with pytest.raises(ValueError, match="did not use the timer"):
+        run([benchmark], repeat=1, warmup=0)
+
+
+def test_percentile():
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 95) == pytest.approx(4.8)
+    assert percentile([2.0], 95) == 2.0
+
+
+def test_write_results(temp_path):
+    results = {"version": 1, "benchmarks": []}
+
+    write_results(results, temp_path / "results" / "latest.json")
+
+    assert json.loads((temp_path / "results" / "latest.json").read_text()) == results
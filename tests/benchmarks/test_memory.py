@@ -0,0 +1,59 @@
+import contextlib
+import inspect
+import io
+import logging
+
+import pytest
+from benchmarks.memory import MODES, measure_growth, profile, run_in_project
+
+from django_new.transformer.operations.toml import AddDependency
+
+# Repeated runs retain a little memory at first, e.g. for interned strings, but not for every run
+MAX_GROWTH_PER_RUN = 16 * 1024
+
+CONTENT = """[project]
+name = "example"
+dependencies = [
+    "django>=5",
+]
+"""
+
+
+def test_profile():
+    memory_profile = profile("add_dependency", lambda: AddDependency("whitenoise").apply(CONTENT))
+
+    assert memory_profile.name == "add_dependency"
+    assert memory_profile.peak > 0
+    assert memory_profile.retained < memory_profile.peak
+
+
+def test_profile_sites():
+    retained = []
+
+    def retain():
+        retained.append(AddDependency("whitenoise").apply(CONTENT) * 1_000)
+
+    memory_profile = profile("retain", retain)
+
+    (site, *_) = memory_profile.sites
+
+    # The line in the body of `retain`
+    _, line = inspect.getsourcelines(retain)
+
+    assert site.location.endswith(f"test_memory.py:{line + 1}")
+    assert site.size >= len(retained[0])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("mode", MODES)
+def test_repeated_runs_do_not_leak(mode):
+    # pytest keeps the captured log records, which would count as growth
+    logging.disable()
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            growth = measure_growth(run_in_project(100, MODES[mode]))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    assert growth < MAX_GROWTH_PER_RUN
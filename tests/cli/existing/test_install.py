@@ -43,3 +43,75 @@ def test_install_whitenoise(fake_fs, temp_path):
     docs_dir = temp_path / "django_new" / "md"
     assert docs_dir.exists()
     assert len(list(docs_dir.glob("*.md"))) == 2
+
+
+def test_install_whitenoise_dry_run(fake_fs, temp_path):
+    name = "new_project"
+    result = runner.invoke(app, [name, str(temp_path), "--project"])
+    assert result.exit_code == 0
+
+    original_pyproject = (temp_path / "pyproject.toml").read_text()
+    original_settings = (temp_path / "config" / "settings.py").read_text()
+
+    result = runner.invoke(app, [str(temp_path), "--install=whitenoise", "--dry-run"])
+    assert result.exit_code == 0
+
+    assert "+++ b/pyproject.toml" in result.output
+    assert "+++ b/config/settings.py" in result.output
+    assert '+    "whitenoise.middleware.WhiteNoiseMiddleware",' in result.output
+
+    # Verify nothing was written
+    assert (temp_path / "pyproject.toml").read_text() == original_pyproject
+    assert (temp_path / "config" / "settings.py").read_text() == original_settings
+
+    docs_dir = temp_path / "django_new" / "md"
+    assert len(list(docs_dir.glob("*.md"))) == 1
+
+
+def test_dry_run_without_install_fails(fake_fs, temp_path):
+    result = runner.invoke(app, ["new_project", str(temp_path), "--dry-run"])
+
+    assert result.exit_code == 1
+
+
+def test_install_whitenoise_already_applied(fake_fs, temp_path):
+    name = "new_project"
+    result = runner.invoke(app, [name, str(temp_path), "--project"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, [str(temp_path), "--install=whitenoise"])
+    assert result.exit_code == 0
+    assert "Installed whitenoise package" in result.output
+
+    settings_content = (temp_path / "config" / "settings.py").read_text()
+
+    result = runner.invoke(app, [str(temp_path), "--install=whitenoise"])
+    assert result.exit_code == 0
+    assert "whitenoise already applied, files unchanged" in result.output
+
+    # Files are not touched again
+    assert (temp_path / "config" / "settings.py").read_text() == settings_content
+
+
+def test_install_summary_only_lists_changed_files(fake_fs, temp_path):
+    result = runner.invoke(app, ["new_project", str(temp_path), "--project"])
+    assert result.exit_code == 0
+
+    (md_file,) = (temp_path / "django_new" / "md").glob("*.md")
+    content = md_file.read_text()
+
+    assert "manage.py" in content
+    assert "settings.py" in content
+    assert "were modified" not in content
+
+    result = runner.invoke(app, [str(temp_path), "--install=whitenoise"])
+    assert result.exit_code == 0
+
+    md_file = next(path for path in (temp_path / "django_new" / "md").glob("*.md") if path != md_file)
+    content = md_file.read_text()
+    tree = content.split("```test")[1].split("```")[0]
+
+    assert "manage.py" not in tree
+    assert "settings.py" in tree
+    assert "- `config/settings.py`" in content
+    assert "- `pyproject.toml`" in content
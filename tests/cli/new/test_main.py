@@ -261,3 +261,30 @@ def test_django_version_arg(fake_fs, temp_path):
 
     pyproject_content = pyproject_path.read_text()
     assert f'"Django{django_version}"' in pyproject_content
+
+
+def test_background_summary(fake_fs, temp_path):
+    """Create a project and leave the summary to the background worker"""
+    name = "new_app"
+
+    with patch("django_new.cli.start_summary_worker") as mock_start_summary_worker:
+        result = runner.invoke(app, [name, str(temp_path), "--background-summary"])
+
+    assert result.exit_code == 0
+    assert_project(path=temp_path, name=name)
+
+    mock_start_summary_worker.assert_called_once()
+    assert "Next Steps" in result.output
+    assert "Project Structure" not in result.output
+    assert_file_missing(temp_path / "django_new" / "summary.html")
+
+
+def test_background_summary_fallback(fake_fs, temp_path):
+    """Write the summary at once when the background worker cannot be started"""
+    name = "new_app"
+
+    with patch("django_new.cli.start_summary_worker", return_value=None):
+        result = runner.invoke(app, [name, str(temp_path), "--background-summary"])
+
+    assert result.exit_code == 0
+    assert_file(temp_path / "django_new" / "summary.html")
@@ -53,6 +53,20 @@ def test_install_multiple_transformations(fake_fs, temp_path):
     assert dummy_file.read_text() == "dummy"
 
 
+def test_install_summarizes_required_transformations(fake_fs, temp_path):
+    name = "new_project"
+
+    # Only the requiring transformation is asked for; whitenoise gets installed because it is required
+    result = runner.invoke(app, [name, str(temp_path), "--web", "--install=tests.transformations.requiring"])
+
+    assert result.exit_code == 0
+    assert "whitenoise" in (temp_path / "pyproject.toml").read_text()
+
+    markdown_files = list((temp_path / "django_new" / "md").glob("*.md"))
+    assert len(markdown_files) == 1
+    assert "### Whitenoise" in markdown_files[0].read_text()
+
+
 def test_create_project_with_install_failure(fake_fs, temp_path):
     name = "new_project"
 
@@ -61,3 +75,18 @@ def test_create_project_with_install_failure(fake_fs, temp_path):
 
     assert result.exit_code == 1
     assert "Failed to install tests.transformations.error" in result.stderr
+
+
+def test_install_conflicting_transformations(fake_fs, temp_path):
+    name = "new_project"
+
+    result = runner.invoke(
+        app, [name, str(temp_path), "--web", "--install=whitenoise", "--install=tests.transformations.conflicting"]
+    )
+
+    assert result.exit_code == 1
+    assert "conflicts with" in result.stderr
+
+    # Nothing is installed when the plan is invalid
+    assert "whitenoise" not in (temp_path / "pyproject.toml").read_text()
+    assert not (temp_path / "conflicting.txt").exists()
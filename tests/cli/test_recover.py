@@ -0,0 +1,29 @@
+from typer.testing import CliRunner
+
+from django_new.cli import typer_app as app
+from django_new.transformer.journal import Journal
+
+runner = CliRunner()
+
+
+def test_recover(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+
+    Journal(root_path=temp_path).record(settings)
+    settings.write_text("DEBUG = False")
+
+    result = runner.invoke(app, ["--recover", str(temp_path)])
+
+    assert result.exit_code == 0
+    assert "settings.py restored" in result.output
+
+    assert settings.read_text() == "DEBUG = True"
+    assert not (temp_path / "django_new" / ".journal").exists()
+
+
+def test_recover_nothing_to_recover(fake_fs, temp_path):
+    result = runner.invoke(app, ["--recover", str(temp_path)])
+
+    assert result.exit_code == 0
+    assert "Nothing to recover" in result.output
@@ -30,6 +30,13 @@ def temp_path():
     yield Path(tmp_dir.name)
 
 
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch, tmp_path):
+    """Keep the transformation index that tests write out of the real `~/.cache`."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--real-fs", action="store_true", default=False, help="Use the real filesystem instead of pyfakefs"
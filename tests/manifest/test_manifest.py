@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from django_new.manifest import (
+    Manifest,
+    get_current,
+    record_created,
+    record_created_tree,
+    record_modified,
+    record_moved,
+    record_removed,
+)
+
+
+def test_record_without_manifest():
+    record_created(Path("a.py"))
+
+    assert get_current() is None
+
+
+def test_record_created_and_modified(fake_fs, temp_path):
+    with Manifest(temp_path) as manifest:
+        assert get_current() is manifest
+
+        record_created(temp_path / "a.py")
+        record_modified(temp_path / "a.py")
+        record_modified(temp_path / "settings.py")
+        record_modified(temp_path / "settings.py")
+
+    assert get_current() is None
+    assert list(manifest.created) == [temp_path / "a.py"]
+    assert list(manifest.modified) == [temp_path / "settings.py"]
+    assert manifest.paths == [temp_path / "a.py", temp_path / "settings.py"]
+
+
+def test_record_created_tree(fake_fs, temp_path):
+    (temp_path / "app" / "migrations").mkdir(parents=True)
+    (temp_path / "app" / "migrations" / "__init__.py").write_text("")
+    (temp_path / "app" / "models.py").write_text("")
+
+    with Manifest(temp_path) as manifest:
+        record_created_tree(temp_path / "app")
+
+    assert set(manifest.created) == {
+        temp_path / "app",
+        temp_path / "app" / "migrations",
+        temp_path / "app" / "migrations" / "__init__.py",
+        temp_path / "app" / "models.py",
+    }
+
+
+def test_record_removed(fake_fs, temp_path):
+    with Manifest(temp_path) as manifest:
+        record_created(temp_path / "app" / "views.py")
+        record_created(temp_path / "app" / "models.py")
+        record_created(temp_path / "other.py")
+
+        record_removed(temp_path / "app")
+
+    assert list(manifest.created) == [temp_path / "other.py"]
+
+
+def test_record_moved(fake_fs, temp_path):
+    with Manifest(temp_path) as manifest:
+        record_created(temp_path / "app" / "app" / "views.py")
+        record_moved(temp_path / "app" / "app" / "views.py", temp_path / "app" / "views.py")
+
+    assert list(manifest.created) == [temp_path / "app" / "views.py"]
@@ -0,0 +1,60 @@
+import time
+
+import libcst as cst
+import pytest
+
+from django_new.parser import find_assignment
+
+LINE_COUNT = 5_000
+
+
+def generate_settings(line_count: int) -> str:
+    lines = ['"""Generated settings."""', "", "from pathlib import Path", ""]
+
+    while len(lines) < line_count:
+        idx = len(lines)
+        lines.extend(
+            [
+                f"SETTING_{idx} = [",
+                f'    "app_{idx}.apps.AppConfig",  # comment',
+                f'    "app_{idx}.middleware.Middleware",',
+                "]",
+                f'OPTION_{idx} = {{"default": {{"BACKEND": "backend_{idx}", "TIMEOUT": {idx}}}}}',
+                "",
+            ]
+        )
+
+    lines.append('INSTALLED_APPS = ["django.contrib.admin", "django.contrib.auth"]')
+
+    return "\n".join(lines) + "\n"
+
+
+def measure_time(func, repeat: int = 3) -> float:
+    """Get the best time in seconds of calling `func`."""
+
+    best_time = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time
+
+
+@pytest.mark.slow
+def test_find_assignment_is_faster_than_libcst():
+    content = generate_settings(LINE_COUNT)
+
+    def query_libcst():
+        return cst.parse_module(content)
+
+    def query_ast():
+        return find_assignment(content, "INSTALLED_APPS")
+
+    libcst_time = measure_time(query_libcst)
+    ast_time = measure_time(query_ast)
+
+    print(f"\n{LINE_COUNT} lines: libcst {libcst_time * 1000:.1f}ms, ast {ast_time * 1000:.1f}ms")  # noqa: T201
+
+    assert ast_time < libcst_time
@@ -0,0 +1,145 @@
+import ast
+import random
+
+import libcst as cst
+import pytest
+
+from django_new.parser import find_assignment
+from django_new.transformer.operations.settings_index import get_dotted_name
+
+NAMES = ["INSTALLED_APPS", "DEBUG", "STORAGES"]
+VALUES = [
+    '["a", "b"]',
+    "[\n    'a',  # comment\n    'b',\n]",
+    "(1)",
+    "( 1 )",
+    "((1))",
+    "(1, 2)",
+    "(  # comment (with parens)\n    1\n)",
+    '"a" "b"',
+    '("a"\n "b")',
+    '"ünïcödé"',
+    "BASE_DIR / 'static'",
+    '{"default": {"BACKEND": "a"}}',
+    "True  # comment",
+    "(x for x in range(3))",
+    "lambda x: (x)",
+    '"""\nmultiline = (1)\n"""',
+    'f"""\n{DEBUG}\n"""',
+    "[\n\n1,\n]",
+]
+
+
+class ReferenceVisitor(cst.CSTVisitor):
+    """Finds the code of the last assignment to a dotted name with libcst, which `find_assignment` has to match"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = None
+        self.class_names = []
+
+    def visit_ClassDef(self, node: cst.ClassDef) -> bool | None:  # noqa: N802
+        self.class_names.append(node.name.value)
+        return True
+
+    def leave_ClassDef(self, node: cst.ClassDef) -> None:  # noqa: N802, ARG002
+        self.class_names.pop()
+
+    def visit_Assign(self, node: cst.Assign) -> bool | None:  # noqa: N802
+        target = node.targets[0].target
+        name = get_dotted_name(target)
+
+        if isinstance(target, cst.Name):
+            name = ".".join([*self.class_names, name])
+
+        if name == self.name:
+            self.value = cst.Module([]).code_for_node(node.value)
+
+        return True
+
+
+def generate_statement(rng: random.Random, indent: str) -> str:
+    name = rng.choice(NAMES)
+    value = rng.choice(VALUES).replace("\n", f"\n{indent}")
+
+    kind = rng.choice(["assign", "assign", "multiple", "annotated", "attribute", "backslash"])
+
+    if kind == "multiple":
+        return f"{indent}OTHER = {name} = {value}\n"
+    elif kind == "annotated":
+        return f"{indent}{name}: int = {value}\n"
+    elif kind == "attribute":
+        return f"{indent}Settings.{name} = {value}\n"
+    elif kind == "backslash":
+        return f"{indent}{name} = \\\n{indent}    {value}\n"
+
+    return f"{indent}{name} = {value}\n"
+
+
+def generate_module(rng: random.Random) -> str:
+    content = ""
+
+    for _ in range(rng.randint(1, 6)):
+        kind = rng.choice(["statement", "statement", "class", "nested_class", "function"])
+
+        if kind == "statement":
+            content += generate_statement(rng, "")
+        elif kind == "class":
+            content += "class Settings:\n" + generate_statement(rng, rng.choice(["    ", "  ", "\t"]))
+        elif kind == "nested_class":
+            content += "class Settings:\n    class Inner:\n" + generate_statement(rng, "        ")
+        else:
+            content += "def get_settings():\n" + generate_statement(rng, "    ")
+
+    return content
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_find_assignment_matches_libcst(seed):
+    """The `ast` backend must find the same value with the same code as the libcst visitor"""
+
+    rng = random.Random(seed)  # noqa: S311
+    content = generate_module(rng)
+    module = cst.parse_module(content)
+
+    for name in [*NAMES, *(f"Settings.{name}" for name in NAMES), "Settings.Inner.DEBUG"]:
+        visitor = ReferenceVisitor(name)
+        module.visit(visitor)
+
+        assignment = find_assignment(content, name)
+
+        if visitor.value is None:
+            assert assignment is None
+        else:
+            assert assignment is not None
+            assert visitor.value == assignment.code
+
+
+def test_find_assignment_node():
+    content = """
+INSTALLED_APPS = ["a"]
+"""
+
+    actual = find_assignment(content, "INSTALLED_APPS")
+
+    assert isinstance(actual.node, ast.List)
+    assert actual.code == '["a"]'
+
+
+def test_find_assignment_last_assignment_wins():
+    content = """
+DEBUG = False
+DEBUG = True
+"""
+
+    actual = find_assignment(content, "DEBUG")
+
+    assert actual.code == "True"
+
+
+def test_find_assignment_missing():
+    content = """
+DEBUG = False
+"""
+
+    assert find_assignment(content, "MISSING") is None
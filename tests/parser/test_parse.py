@@ -0,0 +1,11 @@
+from django_new.parser import parse
+from django_new.transformer.operations.cache import RunCache
+
+
+def test_parse_reuses_module_in_run():
+    with RunCache():
+        assert parse("A = 1") is parse("A = 1")
+
+
+def test_parse_outside_of_run():
+    assert parse("A = 1") is not parse("A = 1")
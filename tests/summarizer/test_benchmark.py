@@ -0,0 +1,70 @@
+import time
+
+import pytest
+from markdown_it import MarkdownIt
+from mdit_py_plugins.front_matter import front_matter_plugin
+
+from django_new.summarizer import get_summary_fragments
+
+SUMMARY_COUNT = 500
+
+
+def write_summaries(temp_path, count: int) -> None:
+    md_dir = temp_path / "django_new" / "md"
+    md_dir.mkdir(parents=True)
+
+    for idx in range(count):
+        name = f"2025-01-01T00:00:{idx:04d}"
+
+        (md_dir / f"{name}.md").write_text(f"""---
+date: {name}
+---
+
+# `project_{idx}` Project
+
+- Path: /tmp/project_{idx}
+- Created: {name}
+
+## Project Structure
+
+```test
+project_{idx}
+├── config
+│   ├── settings.py
+│   └── urls.py
+└── manage.py
+```
+
+## Next Steps
+
+1. Go to your project directory: `cd project_{idx}`
+2. Run the following command to start the development server: `uv run python manage.py runserver`
+""")
+
+
+def render_all(temp_path) -> list[str]:
+    md = MarkdownIt().use(front_matter_plugin)
+
+    return [md.render(path.read_text()) for path in sorted((temp_path / "django_new" / "md").glob("*.md"))]
+
+
+@pytest.mark.slow
+def test_cached_fragments_are_faster_than_rendering(temp_path):
+    write_summaries(temp_path, SUMMARY_COUNT)
+
+    # Fill the cache
+    assert get_summary_fragments(temp_path) == render_all(temp_path)
+
+    start = time.perf_counter()
+    render_all(temp_path)
+    render_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_summary_fragments(temp_path)
+    cached_time = time.perf_counter() - start
+
+    print(  # noqa: T201
+        f"\n{SUMMARY_COUNT} summaries: render {render_time * 1000:.1f}ms, cached {cached_time * 1000:.1f}ms"
+    )
+
+    assert cached_time < render_time
@@ -0,0 +1,168 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+from django_new.summarizer import get_archive_html, get_summary_fragments
+from django_new.summary_archive import STALE_LOCK_AGE, RetentionPolicy, SummaryArchive, compact_summaries
+
+
+def write_summaries(temp_path, count: int) -> list:
+    md_dir = temp_path / "django_new" / "md"
+    md_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+
+    for idx in range(count):
+        name = f"2025-01-{idx + 1:02d}T00:00:00"
+        path = md_dir / f"{name}.md"
+        path.write_text(f"""---
+date: {name}
+---
+
+# Summary {idx}
+
+- Created: {name}
+""")
+        paths.append(path)
+
+    return paths
+
+
+def test_compact_by_count(fake_fs, temp_path):
+    paths = write_summaries(temp_path, 5)
+
+    archived = compact_summaries(temp_path, RetentionPolicy(max_count=2))
+
+    assert archived == paths[:3]
+    assert sorted((temp_path / "django_new" / "md").glob("*.md")) == paths[3:]
+
+    archive = SummaryArchive(temp_path)
+
+    assert [summary.title for summary in archive.summaries] == ["Summary 0", "Summary 1", "Summary 2"]
+    assert (
+        archive.read(archive.summaries[1])
+        == "<!-- 2025-01-02T00:00:00 -->\n# Summary 1\n\n- Created: 2025-01-02T00:00:00\n\n"
+    )
+
+
+def test_compact_by_age(fake_fs, temp_path):
+    paths = write_summaries(temp_path, 5)
+
+    archived = compact_summaries(
+        temp_path,
+        RetentionPolicy(max_count=None, max_age=timedelta(days=2)),
+        now=datetime(2025, 1, 5, 12),  # noqa: DTZ001
+    )
+
+    assert archived == paths[:3]
+
+
+def test_compact_nothing_to_archive(fake_fs, temp_path):
+    write_summaries(temp_path, 2)
+
+    assert compact_summaries(temp_path, RetentionPolicy(max_count=2)) == []
+    assert not (temp_path / "django_new" / "archive.md").exists()
+
+
+def test_compact_appends_to_archive(fake_fs, temp_path):
+    write_summaries(temp_path, 3)
+    compact_summaries(temp_path, RetentionPolicy(max_count=2))
+
+    write_summaries(temp_path, 0)
+    (temp_path / "django_new" / "md" / "2025-02-01T00:00:00.md").write_text("# Later\n")
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    archive = SummaryArchive(temp_path)
+
+    assert [summary.title for summary in archive.summaries] == ["Summary 0", "Summary 1", "Summary 2"]
+    assert archive.read(archive.summaries[2]).startswith("<!-- 2025-01-03T00:00:00 -->\n# Summary 2")
+
+
+def test_compact_discards_unfinished_compaction(fake_fs, temp_path):
+    write_summaries(temp_path, 2)
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    # A compaction that was interrupted after writing to the archive
+    with (temp_path / "django_new" / "archive.md").open("a") as f:
+        f.write("partial")
+
+    (temp_path / "django_new" / "md" / "2025-02-01T00:00:00.md").write_text("# Later\n")
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    archive = SummaryArchive(temp_path)
+
+    assert "partial" not in (temp_path / "django_new" / "archive.md").read_text()
+    assert archive.read(archive.summaries[1]).startswith("<!-- 2025-01-02T00:00:00 -->")
+
+
+def test_compact_rebuilds_missing_index(fake_fs, temp_path):
+    write_summaries(temp_path, 3)
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+    archive_content = (temp_path / "django_new" / "archive.md").read_text()
+
+    (temp_path / "django_new" / "archive.json").unlink()
+    (temp_path / "django_new" / "md" / "2025-02-01T00:00:00.md").write_text("# Later\n")
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    archive = SummaryArchive(temp_path)
+
+    assert (temp_path / "django_new" / "archive.md").read_text().startswith(archive_content)
+    assert [summary.title for summary in archive.summaries] == ["Summary 0", "Summary 1", "Summary 2"]
+    assert archive.read(archive.summaries[1]).startswith("<!-- 2025-01-02T00:00:00 -->\n# Summary 1")
+
+
+def test_compact_rebuilds_invalid_index(fake_fs, temp_path):
+    write_summaries(temp_path, 2)
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    (temp_path / "django_new" / "archive.json").write_text("{")
+
+    archive = SummaryArchive(temp_path)
+
+    assert [summary.name for summary in archive.summaries] == ["2025-01-01T00:00:00"]
+    assert archive.size == (temp_path / "django_new" / "archive.md").stat().st_size
+
+
+def test_compact_skipped_while_locked(fake_fs, temp_path):
+    paths = write_summaries(temp_path, 3)
+    lock_path = temp_path / "django_new" / "archive.lock"
+    lock_path.write_text("123")
+
+    assert compact_summaries(temp_path, RetentionPolicy(max_count=1)) == []
+    assert sorted((temp_path / "django_new" / "md").glob("*.md")) == paths
+    assert lock_path.exists()
+
+
+def test_compact_replaces_stale_lock(fake_fs, temp_path):
+    paths = write_summaries(temp_path, 3)
+    lock_path = temp_path / "django_new" / "archive.lock"
+    lock_path.write_text("123")
+
+    stale_time = time.time() - STALE_LOCK_AGE.total_seconds() - 1
+    os.utime(lock_path, (stale_time, stale_time))
+
+    assert compact_summaries(temp_path, RetentionPolicy(max_count=1)) == paths[:2]
+    assert not lock_path.exists()
+
+
+def test_compact_releases_lock(fake_fs, temp_path):
+    write_summaries(temp_path, 3)
+
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    assert not (temp_path / "django_new" / "archive.lock").exists()
+
+
+def test_archive_html(fake_fs, temp_path):
+    write_summaries(temp_path, 3)
+    compact_summaries(temp_path, RetentionPolicy(max_count=1))
+
+    actual = get_archive_html(temp_path)
+
+    assert actual.index("Summary 1") < actual.index("Summary 0")
+    assert '<a href="archive.md">' in actual
+    assert len(get_summary_fragments(temp_path)) == 1
+
+
+def test_archive_html_empty(fake_fs, temp_path):
+    assert get_archive_html(temp_path) == ""
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+
+from django_new import summarizer
+from django_new.summarizer import FRAGMENTS_PATH_NAME, Summarizer, get_summary_fragments
+
+
+def write_summary(temp_path, name: str, title: str) -> None:
+    md_dir = temp_path / "django_new" / "md"
+    md_dir.mkdir(parents=True, exist_ok=True)
+
+    (md_dir / f"{name}.md").write_text(f"""---
+date: {name}
+---
+
+# {title}
+""")
+
+
+@pytest.fixture
+def render_count(monkeypatch):
+    count = {"render": 0}
+    original_markdown_it = summarizer.MarkdownIt
+
+    class CountingMarkdownIt(original_markdown_it):
+        def render(self, src, env=None):
+            count["render"] += 1
+
+            return super().render(src, env)
+
+    monkeypatch.setattr(summarizer, "MarkdownIt", CountingMarkdownIt)
+
+    return count
+
+
+def test_get_summary_fragments(fake_fs, temp_path):
+    write_summary(temp_path, "2025-02-01T00:00:00", "Second")
+    write_summary(temp_path, "2025-01-01T00:00:00", "First")
+
+    actual = get_summary_fragments(temp_path)
+
+    assert actual == ["\n<h1>First</h1>\n", "\n<h1>Second</h1>\n"]
+
+
+def test_get_summary_fragments_leaves_no_temporary_files(fake_fs, temp_path):
+    write_summary(temp_path, "2025-01-01T00:00:00", "First")
+
+    get_summary_fragments(temp_path)
+
+    fragment_paths = list((temp_path / FRAGMENTS_PATH_NAME).iterdir())
+    assert len(fragment_paths) == 1
+    assert fragment_paths[0].suffix == ".html"
+
+
+def test_get_summary_fragments_only_renders_new_summaries(fake_fs, temp_path, render_count):
+    write_summary(temp_path, "2025-01-01T00:00:00", "First")
+    get_summary_fragments(temp_path)
+
+    write_summary(temp_path, "2025-02-01T00:00:00", "Second")
+    actual = get_summary_fragments(temp_path)
+
+    assert actual == ["\n<h1>First</h1>\n", "\n<h1>Second</h1>\n"]
+    assert render_count["render"] == 2
+
+
+def test_get_summary_fragments_renders_changed_summaries(fake_fs, temp_path, render_count):
+    write_summary(temp_path, "2025-01-01T00:00:00", "First")
+    get_summary_fragments(temp_path)
+
+    write_summary(temp_path, "2025-01-01T00:00:00", "Changed")
+    actual = get_summary_fragments(temp_path)
+
+    assert actual == ["\n<h1>Changed</h1>\n"]
+    assert render_count["render"] == 2
+    assert len(list((temp_path / FRAGMENTS_PATH_NAME).glob("*.html"))) == 1
+
+
+def test_get_summary_fragments_removes_unused_fragments(fake_fs, temp_path):
+    write_summary(temp_path, "2025-01-01T00:00:00", "First")
+    get_summary_fragments(temp_path)
+
+    (temp_path / "django_new" / "md" / "2025-01-01T00:00:00.md").unlink()
+
+    assert get_summary_fragments(temp_path) == []
+    assert list((temp_path / FRAGMENTS_PATH_NAME).glob("*.html")) == []
+
+
+def test_write_summary_html(fake_fs, temp_path):
+    write_summary(temp_path, "2025-01-01T00:00:00", "First")
+
+    ctx = SimpleNamespace(obj={"project_already_existed": True, "folder_path": temp_path}, params={})
+    Summarizer(ctx=ctx).write_summary_html()
+
+    actual = (temp_path / "django_new" / "summary.html").read_text()
+
+    assert actual.startswith("<!DOCTYPE html>")
+    assert "<main>\n\n<h1>First</h1>\n</main></body></html>" in actual
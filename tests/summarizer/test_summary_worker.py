@@ -0,0 +1,56 @@
+from django_new.manifest import Manifest
+from django_new.summary_worker import SummaryContext, get_payload, load_context, start_summary_worker, write_summary
+
+
+def get_context(temp_path) -> SummaryContext:
+    manifest = Manifest(temp_path)
+    manifest.add_created(temp_path / "manage.py")
+    manifest.add_modified(temp_path / "pyproject.toml")
+
+    (temp_path / "manage.py").write_text("")
+    (temp_path / "pyproject.toml").write_text("")
+
+    return SummaryContext(
+        obj={
+            "folder_path": temp_path,
+            "project_already_existed": False,
+            "project_name": "demo",
+            "app_name": "demo",
+            "manifest": manifest,
+        },
+        params={"name": "demo", "project": True, "app": False, "install": None},
+    )
+
+
+def test_load_context(fake_fs, temp_path):
+    ctx = load_context(get_payload(get_context(temp_path)))
+
+    assert ctx.obj["folder_path"] == temp_path
+    assert ctx.obj["project_name"] == "demo"
+    assert ctx.obj["manifest"].created == {temp_path / "manage.py": None}
+    assert ctx.obj["manifest"].modified == {temp_path / "pyproject.toml": None}
+    assert ctx.params == {"name": "demo", "project": True, "app": False, "install": None}
+
+
+def test_write_summary(fake_fs, temp_path):
+    write_summary(load_context(get_payload(get_context(temp_path))))
+
+    (markdown_file,) = (temp_path / "django_new" / "md").glob("*.md")
+
+    assert "# `demo` Project" in markdown_file.read_text()
+    assert "- `pyproject.toml`" in markdown_file.read_text()
+    assert "<h1><code>demo</code> Project</h1>" in (temp_path / "django_new" / "summary.html").read_text()
+
+    # The temporary files are hidden and replaced, so none are left behind
+    assert not list((temp_path / "django_new").glob(".*.tmp"))
+    assert not list((temp_path / "django_new" / "md").glob(".*.tmp"))
+
+
+def test_start_summary_worker(temp_path):
+    process = start_summary_worker(get_context(temp_path))
+
+    assert process is not None
+    assert process.wait(timeout=30) == 0
+
+    assert len(list((temp_path / "django_new" / "md").glob("*.md"))) == 1
+    assert (temp_path / "django_new" / "summary.html").exists()
@@ -0,0 +1,11 @@
+from django_new.transformer import Transformation
+
+
+class ConflictingTransformation(Transformation):
+    conflicts_with = ("whitenoise",)
+
+    def forwards(self):
+        (self.root_path / "conflicting.txt").write_text("conflicting")
+
+    def backwards(self):
+        (self.root_path / "conflicting.txt").unlink(missing_ok=True)
@@ -0,0 +1,11 @@
+from django_new.transformer import Transformation
+
+
+class RequiringTransformation(Transformation):
+    requires = ("whitenoise",)
+
+    def forwards(self):
+        (self.root_path / "requiring.txt").write_text("requiring")
+
+    def backwards(self):
+        (self.root_path / "requiring.txt").unlink(missing_ok=True)
@@ -0,0 +1,57 @@
+import pytest
+
+from django_new.transformer.operations.python import (
+    AppendToList,
+    GetVariable,
+    RemoveFromList,
+    RemoveVariable,
+    contains_name,
+)
+
+
+def test_contains_name():
+    assert contains_name('INSTALLED_APPS = ["a"]', "INSTALLED_APPS")
+
+
+def test_contains_name_missing():
+    assert not contains_name('MIDDLEWARE = ["a"]', "INSTALLED_APPS")
+
+
+def test_contains_name_partial_identifier():
+    assert not contains_name('MY_INSTALLED_APPS = ["a"]\nINSTALLED_APPS_2 = []', "INSTALLED_APPS")
+
+
+def test_contains_name_dotted():
+    content = """
+class Settings:
+    INSTALLED_APPS = []
+"""
+
+    assert contains_name(content, "Settings.INSTALLED_APPS")
+    assert not contains_name(content, "Other.INSTALLED_APPS")
+
+
+def test_contains_name_attribute():
+    assert contains_name("Settings.INSTALLED_APPS = []", "Settings.INSTALLED_APPS")
+
+
+@pytest.mark.parametrize(
+    ("operation", "message"),
+    [
+        (AppendToList(name="INSTALLED_APPS", value='"a"'), "List 'INSTALLED_APPS' not found in file"),
+        (RemoveFromList(name="INSTALLED_APPS", value='"a"'), "List 'INSTALLED_APPS' not found in file"),
+        (RemoveVariable(name="INSTALLED_APPS"), "Variable 'INSTALLED_APPS' not found in file"),
+        (GetVariable(name="INSTALLED_APPS"), "Variable 'INSTALLED_APPS' not found in file"),
+    ],
+)
+def test_missing_name_is_not_parsed(monkeypatch, operation, message):
+    """Operations fail before parsing when the name does not appear in the content"""
+
+    def fail(content):
+        raise AssertionError("The content should not be parsed")
+
+    monkeypatch.setattr("django_new.transformer.operations.python.parse_module", fail)
+    monkeypatch.setattr("django_new.transformer.operations.python.find_assignment", fail)
+
+    with pytest.raises(ValueError, match=message):
+        operation.apply("MIDDLEWARE = []\n" * 1_000)
@@ -1,6 +1,8 @@
+import libcst as cst
 import pytest
 
-from django_new.transformer.operations.python import GetVariable
+from django_new.transformer.operations.cache import RunCache
+from django_new.transformer.operations.python import Expression, GetVariable
 
 
 def test_get_top_level_string():
@@ -199,3 +201,120 @@ string value
 
     assert "multiline" in actual
     assert "string value" in actual
+
+
+def test_get_value_list():
+    """Test getting a list as a Python value"""
+    content = """
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",  # comment
+]
+"""
+
+    operation = GetVariable(name="INSTALLED_APPS")
+    actual = operation.get_value(content)
+
+    assert actual == ["django.contrib.admin", "django.contrib.auth"]
+
+
+def test_get_value_dict():
+    """Test getting a dict as a Python value"""
+    content = """
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+"""
+
+    operation = GetVariable(name="STORAGES")
+    actual = operation.get_value(content)
+
+    assert actual == {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+
+
+def test_get_value_class_attribute():
+    """Test getting a class attribute as a Python value"""
+    content = """
+class Settings:
+    DEBUG = True
+"""
+
+    operation = GetVariable(name="Settings.DEBUG")
+    actual = operation.get_value(content)
+
+    assert actual is True
+
+
+def test_get_value_expression():
+    """Test getting a value that is not a literal"""
+    content = """
+STATIC_ROOT = BASE_DIR / "static"
+"""
+
+    operation = GetVariable(name="STATIC_ROOT")
+    actual = operation.get_value(content)
+
+    assert isinstance(actual, Expression)
+    assert actual.code == 'BASE_DIR / "static"'
+    assert isinstance(actual.node, cst.BinaryOperation)
+
+
+def test_get_value_not_found():
+    """Test getting the value of a variable that does not exist"""
+    content = """
+DEBUG = True
+"""
+
+    operation = GetVariable(name="MISSING")
+
+    with pytest.raises(ValueError, match="Variable 'MISSING' not found in file"):
+        operation.get_value(content)
+
+
+def test_get_value_is_memoised(monkeypatch):
+    """Test that repeated lookups of the same variable in a run do not parse the code again"""
+    content = """
+ALLOWED_HOSTS = ["localhost"]
+"""
+
+    with RunCache():
+        expected = GetVariable(name="ALLOWED_HOSTS").get_value(content)
+
+        def fail(content, name):
+            raise AssertionError("The code should not be parsed again")
+
+        monkeypatch.setattr("django_new.transformer.operations.python.find_assignment", fail)
+
+        actual = GetVariable(name="ALLOWED_HOSTS").get_value(content)
+
+    assert expected == actual
+
+
+def test_get_value_is_not_memoised_outside_of_run(monkeypatch):
+    content = """
+ALLOWED_HOSTS = ["localhost"]
+"""
+
+    GetVariable(name="ALLOWED_HOSTS").get_value(content)
+
+    def fail(content, name):
+        raise AssertionError("Parsed again")
+
+    monkeypatch.setattr("django_new.transformer.operations.python.find_assignment", fail)
+
+    with pytest.raises(AssertionError, match="Parsed again"):
+        GetVariable(name="ALLOWED_HOSTS").get_value(content)
+
+
+def test_get_value_returns_copy():
+    """Test that mutating a returned value does not change the memoised value"""
+    content = """
+ALLOWED_HOSTS = ["localhost"]
+"""
+
+    operation = GetVariable(name="ALLOWED_HOSTS")
+
+    with RunCache():
+        operation.get_value(content).append("example.com")
+
+        actual = operation.get_value(content)
+
+    assert actual == ["localhost"]
@@ -0,0 +1,295 @@
+import json
+
+import pytest
+
+from django_new.transformer.operations.python import Expression, MergeDict, UnmergeDict
+
+STATICFILES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+
+CONTENT = """
+STORAGES = {
+    # Uploaded files
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        "OPTIONS": {"location": "static"},  # keep me
+    },
+}
+"""
+
+
+def test_merge_into_empty_dict():
+    expected = """
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+"""
+
+    content = """
+STORAGES = {}
+"""
+
+    actual = MergeDict(name="STORAGES", value=STATICFILES).apply(content)
+
+    assert expected == actual
+
+
+def test_merge_replaces_nested_value_and_keeps_formatting():
+    expected = """
+STORAGES = {
+    # Uploaded files
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+        "OPTIONS": {"location": "static"},  # keep me
+    },
+}
+"""
+
+    actual = MergeDict(name="STORAGES", value=STATICFILES).apply(CONTENT)
+
+    assert expected == actual
+
+
+def test_merge_adds_key_to_multiline_dict():
+    expected = """
+STORAGES = {
+    # Uploaded files
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        "OPTIONS": {"location": "static"},  # keep me
+    },
+    "media": {"BACKEND": "storages.backends.s3.S3Storage"},
+}
+"""
+
+    actual = MergeDict(name="STORAGES", value={"media": {"BACKEND": "storages.backends.s3.S3Storage"}}).apply(CONTENT)
+
+    assert expected == actual
+
+
+def test_merge_adds_key_to_one_line_dict():
+    expected = """
+CACHES = {"default": {"BACKEND": "locmem"}, "sessions": {"TIMEOUT": 60}}
+"""
+
+    content = """
+CACHES = {"default": {"BACKEND": "locmem"}}
+"""
+
+    actual = MergeDict(name="CACHES", value={"sessions": {"TIMEOUT": 60}}).apply(content)
+
+    assert expected == actual
+
+
+def test_merge_same_value_is_unchanged():
+    content = """
+DATABASES = {"default": {"CONN_MAX_AGE": 60}}
+"""
+
+    actual = MergeDict(name="DATABASES", value={"default": {"CONN_MAX_AGE": 60}}).apply(content)
+
+    assert content == actual
+
+
+def test_merge_expression():
+    expected = """
+DATABASES = {"default": {"NAME": BASE_DIR / "db.sqlite3"}}
+"""
+
+    content = """
+DATABASES = {"default": {"NAME": "db.sqlite3"}}
+"""
+
+    actual = MergeDict(name="DATABASES", value={"default": {"NAME": Expression('BASE_DIR / "db.sqlite3"')}}).apply(
+        content
+    )
+
+    assert expected == actual
+
+
+def test_merge_creates_variable():
+    expected = """DEBUG = True
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+"""
+
+    content = """DEBUG = True
+"""
+
+    actual = MergeDict(name="STORAGES", value=STATICFILES).apply(content)
+
+    assert expected == actual
+
+
+def test_merge_creates_variable_with_expression():
+    expected = """DEBUG = True
+STORAGES = {"staticfiles": {"OPTIONS": {"location": BASE_DIR / "static", "prefixes": ["css", "js"]}}}
+"""
+
+    content = """DEBUG = True
+"""
+
+    value = {"staticfiles": {"OPTIONS": {"location": Expression('BASE_DIR / "static"'), "prefixes": ["css", "js"]}}}
+    actual = MergeDict(name="STORAGES", value=value).apply(content)
+
+    assert expected == actual
+
+
+def test_merge_follows_quote_style():
+    expected = """
+CACHES = {'default': {'BACKEND': 'locmem'}, 'sessions': {'KEY_PREFIX': "it's", 'OPTIONS': ('a',)}}
+"""
+
+    content = """
+CACHES = {'default': {'BACKEND': 'locmem'}}
+"""
+
+    actual = MergeDict(name="CACHES", value={"sessions": {"KEY_PREFIX": "it's", "OPTIONS": ("a",)}}).apply(content)
+
+    assert expected == actual
+
+
+def test_merge_into_class_attribute():
+    content = """
+class Settings:
+    CACHES = {}
+"""
+
+    actual = MergeDict(name="Settings.CACHES", value={"default": {"TIMEOUT": 60}}).apply(content)
+
+    assert '    CACHES = {"default": {"TIMEOUT": 60}}\n' in actual
+
+
+def test_merge_not_a_dict():
+    content = """
+STORAGES = get_storages()
+"""
+
+    with pytest.raises(ValueError, match="'STORAGES' is not a dict"):
+        MergeDict(name="STORAGES", value=STATICFILES).apply(content)
+
+
+def test_reverse_restores_exactly():
+    operation = MergeDict(name="STORAGES", value={**STATICFILES, "media": {"BACKEND": "s3"}})
+
+    merged = operation.apply(CONTENT)
+    actual = operation.reverse().apply(merged)
+
+    assert CONTENT == actual
+
+
+def test_reverse_removes_created_variable():
+    content = """DEBUG = True
+"""
+
+    operation = MergeDict(name="STORAGES", value=STATICFILES)
+
+    merged = operation.apply(content)
+    actual = operation.reverse().apply(merged)
+
+    assert content == actual
+
+
+def test_unmerge_from_record_restores_exactly():
+    operation = MergeDict(name="STORAGES", value={**STATICFILES, "media": {"BACKEND": "s3"}})
+    merged = operation.apply(CONTENT)
+
+    # The record survives being stored as JSON, e.g. in the state file
+    record = json.loads(json.dumps(operation.get_record()))
+
+    actual = UnmergeDict.from_record(name="STORAGES", value=operation.value, record=record).apply(merged)
+
+    assert CONTENT == actual
+
+
+def test_unmerge_from_record_removes_created_variable():
+    content = """DEBUG = True
+"""
+
+    operation = MergeDict(name="STORAGES", value=STATICFILES)
+    merged = operation.apply(content)
+
+    actual = UnmergeDict.from_record(name="STORAGES", value=STATICFILES, record=operation.get_record()).apply(merged)
+
+    assert content == actual
+
+
+def test_unmerge_from_missing_record():
+    content = """
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+"""
+
+    actual = UnmergeDict.from_record(name="STORAGES", value=STATICFILES, record=None).apply(content)
+
+    assert (
+        actual
+        == """
+STORAGES = {}
+"""
+    )
+
+
+def test_get_record_not_applied():
+    assert MergeDict(name="STORAGES", value=STATICFILES).get_record() is None
+
+
+def test_unmerge_keeps_other_keys():
+    expected = """
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+}
+"""
+
+    content = """
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+"""
+
+    actual = UnmergeDict(name="STORAGES", value=STATICFILES).apply(content)
+
+    assert expected == actual
+
+
+def test_unmerge_keeps_nested_keys_that_were_not_merged():
+    expected = """
+STORAGES = {"staticfiles": {"OPTIONS": {}}}
+"""
+
+    content = """
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage", "OPTIONS": {}}}
+"""
+
+    actual = UnmergeDict(name="STORAGES", value=STATICFILES).apply(content)
+
+    assert expected == actual
+
+
+def test_unmerge_keeps_changed_values():
+    content = """
+STORAGES = {"staticfiles": {"BACKEND": "other"}}
+"""
+
+    with pytest.raises(ValueError, match="not found in 'STORAGES'"):
+        UnmergeDict(name="STORAGES", value=STATICFILES).apply(content)
+
+
+def test_unmerge_missing_variable():
+    content = """
+DEBUG = True
+"""
+
+    with pytest.raises(ValueError, match="Dict 'STORAGES' not found in file"):
+        UnmergeDict(name="STORAGES", value=STATICFILES).apply(content)
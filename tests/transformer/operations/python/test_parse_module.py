@@ -0,0 +1,37 @@
+import libcst as cst
+
+from django_new.transformer.operations.cache import RunCache
+from django_new.transformer.operations.python import AppendToList, parse_module
+
+
+def test_parse_module_reuses_module():
+    content = "INSTALLED_APPS = []\n"
+
+    with RunCache():
+        assert parse_module(content) is parse_module(content)
+
+
+def test_parse_module_outside_of_run():
+    """Nothing is cached outside of a run, so no module is kept alive"""
+
+    content = "INSTALLED_APPS = []\n"
+
+    assert parse_module(content) is not parse_module(content)
+
+
+def test_parse_module_reuses_modified_module(monkeypatch):
+    """The module generated by an operation is re-used by the next operation"""
+
+    content = "INSTALLED_APPS = []\n"
+    operation = AppendToList(name="INSTALLED_APPS", value='"a"')
+
+    with RunCache():
+        actual = operation.apply(content)
+
+        def fail(_):
+            raise AssertionError("Module should not be parsed again")
+
+        monkeypatch.setattr(cst, "parse_module", fail)
+
+        assert actual == 'INSTALLED_APPS = ["a"]\n'
+        assert parse_module(actual).code == actual
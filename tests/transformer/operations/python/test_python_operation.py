@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from django_new.transformer.operations.python import PythonOperation
+import libcst as cst
+import pytest
+
+from django_new.transformer.operations.python import AppendToList, PythonOperation
 
 
 # Create a concrete implementation for testing
@@ -10,8 +13,18 @@ class FakePythonOperation(PythonOperation):
     def description(self) -> str:
         return "Test operation"
 
-    def apply(self, content: str) -> str:
-        return content
+    def transform(self, tree: cst.Module) -> cst.Module:
+        return tree
+
+
+class FakeNamedOperation(FakePythonOperation):
+    not_found_message = "Setting '{name}' not found in file"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def transform(self, tree: cst.Module) -> cst.Module:  # noqa: ARG002
+        raise AssertionError("The content should not be parsed")
 
 
 def test_python():
@@ -48,3 +61,45 @@ def test_no_extension():
 
     assert operation.can_handle(Path("no_extension")) is False
     assert operation.can_handle(Path("path/to/file")) is False
+
+
+def test_apply_unchanged_returns_content():
+    content = """
+# Comment
+INSTALLED_APPS = ["a"]
+"""
+
+    actual = FakePythonOperation().apply(content)
+
+    assert actual is content
+
+
+def test_apply_keeps_formatting():
+    content = """INSTALLED_APPS = ["a"]
+
+class Settings:
+    MIDDLEWARE = []
+    DEBUG = True  # comment
+"""
+
+    expected = """INSTALLED_APPS = ["a"]
+
+class Settings:
+    MIDDLEWARE = ["b"]
+    DEBUG = True  # comment
+"""
+
+    actual = AppendToList(name="Settings.MIDDLEWARE", value='"b"').apply(content)
+
+    assert expected == actual
+
+
+def test_check_name_not_found():
+    with pytest.raises(ValueError, match="Setting 'DEBUG' not found in file"):
+        FakeNamedOperation(name="DEBUG").apply("INSTALLED_APPS = []\n")
+
+
+def test_check_without_message():
+    content = "INSTALLED_APPS = []\n"
+
+    assert FakePythonOperation().apply(content) is content
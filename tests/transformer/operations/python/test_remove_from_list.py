@@ -1,6 +1,6 @@
 import pytest
 
-from django_new.transformer.operations.python import RemoveFromList
+from django_new.transformer.operations.python import AppendToList, RemoveFromList
 
 
 def test_remove_from_top_level_list():
@@ -33,6 +33,47 @@ SOME_VAR = ["django", "pytest"]
     assert actual.strip() == expected.strip()
 
 
+def test_remove_last_from_list():
+    content = """
+SOME_VAR = ["django", "pytest"]
+"""
+
+    actual = RemoveFromList(name="SOME_VAR", value='"pytest"').apply(content)
+
+    assert (
+        actual
+        == """
+SOME_VAR = ["django"]
+"""
+    )
+
+
+def test_remove_last_from_multiline_list():
+    content = """
+SOME_VAR = [
+    "django",
+    "pytest",
+]
+"""
+
+    actual = RemoveFromList(name="SOME_VAR", value='"pytest"').apply(content)
+
+    assert actual == '\nSOME_VAR = [\n    "django",\n    \n]\n'
+
+
+def test_remove_appended_from_multiline_list():
+    content = """
+SOME_VAR = [
+    "django",
+]
+"""
+
+    appended = AppendToList(name="SOME_VAR", value='"pytest"', position=-1).apply(content)
+    actual = RemoveFromList(name="SOME_VAR", value='"pytest"').apply(appended)
+
+    assert actual == content
+
+
 def test_remove_from_nested_class_list():
     expected = """
 class Settings:
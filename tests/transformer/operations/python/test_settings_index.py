@@ -0,0 +1,150 @@
+import libcst as cst
+
+from django_new.transformer.operations.cache import RunCache
+from django_new.transformer.operations.python import AppendToList, RemoveVariable
+from django_new.transformer.operations.settings_index import SettingsIndex, replace_at_path
+
+CONTENT = """
+INSTALLED_APPS = ["a"]
+
+class Settings:
+    INSTALLED_APPS = ["b"]
+
+    class Inner:
+        DEBUG = True
+
+config.DEBUG = False
+
+if DEBUG:
+    MIDDLEWARE = []
+else:
+    MIDDLEWARE = ["c"]
+
+try:
+    import local_settings
+except ImportError:
+    STORAGES = {}
+finally:
+    pass
+
+def get_settings():
+    SECRET_KEY = "secret"
+
+if True: ALLOWED_HOSTS = []; DEBUG = False
+
+OTHER = INSTALLED_APPS = []
+"""
+
+
+def get_names(index: SettingsIndex) -> set[str]:
+    return set(index.entries)
+
+
+def test_index_names():
+    expected = {
+        "INSTALLED_APPS",
+        "Settings.INSTALLED_APPS",
+        "Settings.Inner.DEBUG",
+        "config.DEBUG",
+        "MIDDLEWARE",
+        "STORAGES",
+        "SECRET_KEY",
+        "ALLOWED_HOSTS",
+        "DEBUG",
+        "OTHER",
+    }
+
+    actual = get_names(SettingsIndex(cst.parse_module(CONTENT)))
+
+    assert expected == actual
+
+
+def test_index_entries_in_order():
+    index = SettingsIndex(cst.parse_module(CONTENT))
+
+    actual = [cst.Module([]).code_for_node(entry.node.value) for entry in index.get("MIDDLEWARE")]
+
+    assert actual == ["[]", '["c"]']
+
+
+def test_index_missing_name():
+    index = SettingsIndex(cst.parse_module(CONTENT))
+
+    assert index.get("MISSING") == []
+    assert "MISSING" not in index
+    assert "INSTALLED_APPS" in index
+
+
+def test_index_whole_statement():
+    index = SettingsIndex(cst.parse_module(CONTENT))
+
+    assert index.get("INSTALLED_APPS")[0].is_whole_statement
+    assert not index.get("ALLOWED_HOSTS")[0].is_whole_statement
+
+
+def test_from_module_is_cached():
+    module = cst.parse_module(CONTENT)
+
+    with RunCache():
+        assert SettingsIndex.from_module(module) is SettingsIndex.from_module(module)
+
+
+def test_from_module_is_not_cached_outside_of_run():
+    module = cst.parse_module(CONTENT)
+
+    assert SettingsIndex.from_module(module) is not SettingsIndex.from_module(module)
+
+
+def test_replace_at_path_keeps_other_nodes():
+    module = cst.parse_module(CONTENT)
+    entry = SettingsIndex(module).get("Settings.Inner.DEBUG")[0]
+
+    modified_module = replace_at_path(module, entry.path, entry.node.with_changes(value=cst.Name("False")))
+
+    assert "        DEBUG = False\n" in modified_module.code
+    assert modified_module.body[0] is module.body[0]
+    assert modified_module.body[1] is not module.body[1]
+    assert modified_module.body[2] is module.body[2]
+
+
+def test_replace_at_path_remove():
+    module = cst.parse_module(CONTENT)
+    entry = SettingsIndex(module).get("SECRET_KEY")[0]
+
+    modified_module = replace_at_path(module, entry.statement_path, None)
+
+    assert "SECRET_KEY" not in modified_module.code
+
+
+def test_append_to_module_level_attribute():
+    content = """
+Settings.INSTALLED_APPS = ["a"]
+"""
+
+    expected = """
+Settings.INSTALLED_APPS = ["a", "b"]
+"""
+
+    actual = AppendToList(name="Settings.INSTALLED_APPS", value='"b"').apply(content)
+
+    assert expected == actual
+
+
+def test_remove_variable_from_every_branch():
+    content = """
+if DEBUG:
+    STORAGES = {}
+else:
+    STORAGES = {"a": "b"}
+"""
+
+    expected = """
+if DEBUG:
+    pass
+else:
+    pass
+"""
+
+    actual = RemoveVariable(name="STORAGES").apply(content)
+
+    assert expected == actual
@@ -0,0 +1,48 @@
+from django_new.transformer.operations.cache import LRUCache, RunCache, get_cache
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Using "a" makes "b" the least recently used item
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("b", 0) == 0
+    assert cache.get("c") == 3
+
+
+def test_get_cache():
+    with RunCache() as run_cache:
+        cache = get_cache("modules", 8)
+
+        assert cache is get_cache("modules", 8)
+        assert cache is not get_cache("values", 8)
+        assert run_cache.caches["modules"] is cache
+
+
+def test_get_cache_outside_of_run():
+    assert get_cache("modules", 8) is None
+
+
+def test_run_cache_is_dropped_after_run():
+    with RunCache() as run_cache:
+        get_cache("modules", 8).set("a", 1)
+
+    assert run_cache.caches == {}
+    assert get_cache("modules", 8) is None
+
+
+def test_lru_cache_discard():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+
+    cache.discard("a")
+    cache.discard("b")
+
+    assert len(cache) == 0
@@ -0,0 +1,165 @@
+import pytest
+from tomlkit.exceptions import ParseError
+
+from django_new.transformer import Transformation
+from django_new.transformer.operations import TargetNotFound, instrumentation
+from django_new.transformer.operations.instrumentation import add_hook, apply_operation, hook, remove_hook
+from django_new.transformer.operations.python import AppendToList, RemoveFromList
+from django_new.transformer.operations.toml import AddDependency, AddKeyValue, RemoveDependency
+from django_new.transformer.plan import Plan
+
+SETTINGS = "INSTALLED_APPS = []\n"
+
+PYPROJECT = """[project]
+name = "example"
+dependencies = []
+"""
+
+
+class InstallTransformation(Transformation):
+    def forwards(self):
+        self.modify_file("settings.py", AppendToList(name="INSTALLED_APPS", value='"whitenoise"'))
+        self.modify_file("pyproject.toml", AddDependency("whitenoise"))
+        self.modify_file("pyproject.toml", AddKeyValue(name="tool.example", key="enabled", value=True))
+
+
+def test_apply_operation():
+    events = []
+    operation = AppendToList(name="INSTALLED_APPS", value='"app"')
+
+    with hook(events.append):
+        content = apply_operation(operation, SETTINGS)
+
+    (event,) = events
+
+    assert event.operation is operation
+    assert event.path is None
+    assert set(event.timings) == {"check", "parse", "transform", "serialise"}
+    assert event.duration == sum(event.timings.values())
+    assert event.input_bytes == len(SETTINGS)
+    assert event.output_bytes == len(content.encode())
+    assert event.found
+    assert event.error is None
+
+
+def test_apply_operation_toml():
+    events = []
+
+    with hook(events.append):
+        content = apply_operation(AddDependency("whitenoise"), PYPROJECT)
+
+    (event,) = events
+
+    assert set(event.timings) == {"parse", "transform", "serialise"}
+    assert event.input_bytes == len(PYPROJECT)
+    assert event.output_bytes == len(content)
+
+
+def test_apply_operation_not_found():
+    events = []
+
+    with hook(events.append), pytest.raises(ValueError, match="not found"):
+        apply_operation(RemoveDependency("whitenoise"), PYPROJECT)
+
+    (event,) = events
+
+    assert not event.found
+    assert isinstance(event.error, TargetNotFound)
+    assert event.output_bytes is None
+
+
+def test_apply_operation_not_found_before_parsing():
+    events = []
+
+    with hook(events.append), pytest.raises(TargetNotFound, match="List 'MIDDLEWARE' not found in file"):
+        apply_operation(RemoveFromList(name="MIDDLEWARE", value='"app"'), SETTINGS)
+
+    (event,) = events
+
+    assert not event.found
+    assert set(event.timings) == {"check"}
+
+
+def test_apply_operation_invalid_content():
+    events = []
+
+    # tomlkit's `ParseError` is a `ValueError`, but it does not mean that the target is missing
+    with hook(events.append), pytest.raises(ParseError):
+        apply_operation(AddDependency("whitenoise"), "[project\n")
+
+    (event,) = events
+
+    assert event.found
+    assert isinstance(event.error, ParseError)
+
+
+def test_apply_operation_without_hooks():
+    assert instrumentation._hooks == ()
+
+    assert apply_operation(AppendToList(name="INSTALLED_APPS", value='"app"'), SETTINGS) == 'INSTALLED_APPS = ["app"]\n'
+
+
+def test_failing_hook_is_ignored(caplog):
+    def fail(event):
+        raise RuntimeError("telemetry is down")
+
+    with hook(fail):
+        content = apply_operation(AppendToList(name="INSTALLED_APPS", value='"app"'), SETTINGS)
+
+    assert content == 'INSTALLED_APPS = ["app"]\n'
+    assert "telemetry is down" in caplog.text
+
+
+def test_add_and_remove_hook():
+    events = []
+
+    assert add_hook(events.append) == events.append
+
+    # Adding a hook again does not call it twice
+    add_hook(events.append)
+
+    try:
+        apply_operation(AppendToList(name="INSTALLED_APPS", value='"app"'), SETTINGS)
+    finally:
+        remove_hook(events.append)
+
+    apply_operation(AppendToList(name="INSTALLED_APPS", value='"app"'), SETTINGS)
+
+    assert len(events) == 1
+
+
+def test_modify_file(fake_fs, temp_path):
+    (temp_path / "settings.py").write_text(SETTINGS)
+    (temp_path / "pyproject.toml").write_text(PYPROJECT)
+    events = []
+
+    with hook(events.append):
+        InstallTransformation(root_path=temp_path).forwards()
+
+    assert [event.path.name for event in events] == ["settings.py", "pyproject.toml", "pyproject.toml"]
+    assert all(event.input_bytes and event.output_bytes for event in events)
+
+
+def test_modify_file_in_plan(fake_fs, temp_path):
+    (temp_path / "settings.py").write_text(SETTINGS)
+    (temp_path / "pyproject.toml").write_text(PYPROJECT)
+    events = []
+
+    transformation = InstallTransformation(root_path=temp_path)
+    transformation.plan = Plan()
+    transformation.forwards()
+
+    with hook(events.append):
+        transformation.plan.apply()
+
+    assert [event.path.name for event in events] == ["settings.py", "pyproject.toml", "pyproject.toml"]
+
+    settings_event, *toml_events = events
+
+    assert settings_event.input_bytes == len(SETTINGS)
+
+    # The TOML operations share a session, so only the time they took to change the document is known
+    for event in toml_events:
+        assert set(event.timings) == {"transform"}
+        assert event.input_bytes is None
+        assert event.output_bytes is None
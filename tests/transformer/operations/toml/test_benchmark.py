@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from django_new.transformer.operations.toml import AddKeyValue, AppendToList, RemoveKey, TomlSession
+
+LINE_COUNT = 2_000
+
+
+def generate_pyproject(line_count: int) -> str:
+    lines = ["[project]", 'name = "example"', 'dependencies = ["django"]', ""]
+
+    while len(lines) < line_count:
+        idx = len(lines)
+        lines.extend(
+            [
+                f"[tool.example_{idx}]",
+                f'option = "value_{idx}"',
+                f"numbers = [{idx}, {idx + 1}, {idx + 2}]",
+                f"enabled = {'true' if idx % 2 else 'false'}  # comment",
+                "",
+            ]
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def get_operations():
+    return [
+        AppendToList(name="project.dependencies", value="whitenoise==6.6.0"),
+        AppendToList(name="project.dependencies", value="django-unicorn"),
+        AddKeyValue(name="project", key="version", value="1.0"),
+        RemoveKey(table_path="tool.example_4", key="enabled"),
+    ]
+
+
+@pytest.mark.slow
+def test_session_is_faster_than_separate_operations():
+    content = generate_pyproject(LINE_COUNT)
+
+    def apply_separately():
+        result = content
+
+        for operation in get_operations():
+            result = operation.apply(result)
+
+        return result
+
+    def apply_in_session():
+        session = TomlSession(content)
+
+        for operation in get_operations():
+            session.apply(operation)
+
+        return session.dumps()
+
+    assert apply_separately() == apply_in_session()
+
+    start = time.perf_counter()
+    apply_separately()
+    separate_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    apply_in_session()
+    session_time = time.perf_counter() - start
+
+    print(  # noqa: T201
+        f"\n{LINE_COUNT} lines: separate {separate_time * 1000:.1f}ms, session {session_time * 1000:.1f}ms"
+    )
+
+    assert session_time < separate_time
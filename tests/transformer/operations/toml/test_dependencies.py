@@ -0,0 +1,254 @@
+import gc
+import weakref
+
+import pytest
+from packaging.requirements import Requirement
+
+from django_new.transformer.operations.cache import RunCache
+from django_new.transformer.operations.dependency_index import (
+    DependencyIndex,
+    DependencyList,
+    merge_requirements,
+    upgrade_requirement,
+)
+from django_new.transformer.operations.toml import (
+    AddDependency,
+    AppendToList,
+    RemoveDependency,
+    RemoveFromList,
+    TomlSession,
+    UpgradeDependency,
+)
+
+CONTENT = """[project]
+name = "example"
+dependencies = [
+    "Django>=4.2",
+    "django_unicorn[minify]>=0.60; python_version >= '3.10'",
+]
+
+[project.optional-dependencies]
+server = ["gunicorn"]
+
+[dependency-groups]
+dev = ["pytest>=8", {include-group = "lint"}]
+lint = ["ruff"]
+"""
+
+
+def test_add_dependency():
+    expected = """[project]
+name = "example"
+dependencies = [
+    "Django>=4.2",
+    "django_unicorn[minify]>=0.60; python_version >= '3.10'",
+    "whitenoise==6.6.0",
+]
+"""
+
+    actual = AddDependency("whitenoise==6.6.0").apply(CONTENT)
+
+    assert actual.startswith(expected)
+
+
+def test_add_dependency_creates_list():
+    content = """[project]
+name = "example"
+"""
+
+    actual = AddDependency("whitenoise").apply(content)
+
+    assert 'dependencies = ["whitenoise"]' in actual
+
+
+def test_add_dependency_merges_specifiers():
+    actual = AddDependency("django<6.0").apply(CONTENT)
+
+    assert '"Django<6.0,>=4.2",' in actual
+    assert actual.count("jango") == 2
+
+
+def test_add_dependency_merges_extras_and_keeps_marker():
+    actual = AddDependency("Django-Unicorn[compat]").apply(CONTENT)
+
+    assert '"django_unicorn[compat,minify]>=0.60; python_version >= \\"3.10\\""' in actual
+
+
+def test_add_dependency_same_requirement_is_unchanged():
+    actual = AddDependency("django>=4.2").apply(CONTENT)
+
+    assert actual == CONTENT
+
+
+def test_add_dependency_conflicting_specifiers():
+    with pytest.raises(ValueError, match="the specifiers conflict"):
+        AddDependency("django==4.1").apply(CONTENT)
+
+
+def test_add_dependency_to_group():
+    actual = AddDependency("pytest-django", group="dev").apply(CONTENT)
+
+    assert 'dev = ["pytest>=8", {include-group = "lint"}, "pytest-django"]' in actual
+
+
+def test_add_dependency_to_extra():
+    actual = AddDependency("uvicorn", extra="server").apply(CONTENT)
+
+    assert 'server = ["gunicorn", "uvicorn"]' in actual
+
+
+def test_add_dependency_group_and_extra():
+    with pytest.raises(ValueError, match="Only one of group and extra can be set"):
+        AddDependency("uvicorn", group="dev", extra="server")
+
+
+def test_add_dependency_invalid_requirement():
+    with pytest.raises(ValueError, match="Invalid requirement 'not a requirement'"):
+        AddDependency("not a requirement")
+
+
+def test_upgrade_dependency():
+    actual = UpgradeDependency("django>=5.0").apply(CONTENT)
+
+    assert '"Django>=5.0",' in actual
+
+
+def test_upgrade_dependency_keeps_extras_and_marker():
+    actual = UpgradeDependency("django-unicorn>=0.62").apply(CONTENT)
+
+    assert '"django_unicorn[minify]>=0.62; python_version >= \\"3.10\\""' in actual
+
+
+def test_upgrade_dependency_missing():
+    with pytest.raises(ValueError, match=r"Dependency 'whitenoise' not found in project\.dependencies"):
+        UpgradeDependency("whitenoise>=6").apply(CONTENT)
+
+
+def test_remove_dependency():
+    expected = """[project]
+name = "example"
+dependencies = [
+    "Django>=4.2",
+]
+"""
+
+    actual = RemoveDependency("Django.Unicorn").apply(CONTENT)
+
+    assert actual.startswith(expected)
+
+
+def test_remove_dependency_from_group():
+    actual = RemoveDependency("pytest", group="dev").apply(CONTENT)
+
+    assert 'dev = [{include-group = "lint"}]' in actual
+
+
+def test_remove_dependency_missing():
+    with pytest.raises(ValueError, match=r"Dependency 'whitenoise' not found in project\.dependencies"):
+        RemoveDependency("whitenoise").apply(CONTENT)
+
+
+def test_remove_dependency_missing_group():
+    with pytest.raises(ValueError, match=r"'dependency-groups\.test' not found"):
+        RemoveDependency("pytest", group="test").apply(CONTENT)
+
+
+def test_dependency_list():
+    dependencies = DependencyList(["Django>=4.2", "django_unicorn", {"include-group": "lint"}, "not valid"])
+
+    assert "django" in dependencies
+    assert "Django-Unicorn" in dependencies
+    assert "whitenoise" not in dependencies
+    assert str(dependencies.get("DJANGO")) == "Django>=4.2"
+    assert len(dependencies) == 2
+
+
+def test_merge_requirements_different_packages():
+    with pytest.raises(ValueError, match="they are for different packages"):
+        merge_requirements(Requirement("django>=4.2"), Requirement("whitenoise>=6"))
+
+
+def test_upgrade_requirement_different_packages():
+    with pytest.raises(ValueError, match="they are for different packages"):
+        upgrade_requirement(Requirement("django>=4.2"), Requirement("whitenoise>=6"))
+
+
+def test_dependency_list_same_length_after_changes():
+    items = ["django", "whitenoise"]
+    dependencies = DependencyList(items)
+
+    # Another item replaces one, so the length of the list stays the same
+    dependencies.remove("django")
+    dependencies.add(Requirement("gunicorn"))
+
+    assert items == ["whitenoise", "gunicorn"]
+    assert "gunicorn" in dependencies
+    assert "django" not in dependencies
+    assert str(dependencies.get("whitenoise")) == "whitenoise"
+
+
+def test_index_is_shared_in_session():
+    session = TomlSession(CONTENT)
+
+    with RunCache():
+        session.apply(AddDependency("whitenoise"))
+        session.apply(RemoveDependency("django"))
+
+        index = DependencyIndex.from_document(session.document)
+
+        assert index is DependencyIndex.from_document(session.document)
+
+    assert "whitenoise" in index.get_list()
+    assert "django" not in index.get_list()
+
+
+def test_index_does_not_keep_document_alive():
+    session = TomlSession(CONTENT)
+    session.apply(AddDependency("whitenoise"))
+    document = weakref.ref(session.document)
+
+    del session
+    gc.collect()
+
+    assert document() is None
+
+
+def test_index_is_not_shared_outside_of_run():
+    session = TomlSession(CONTENT)
+
+    assert DependencyIndex.from_document(session.document) is not DependencyIndex.from_document(session.document)
+
+
+def test_index_sees_remove_and_append_from_other_operations():
+    expected = """[project]
+name = "example"
+dependencies = [
+    "django_unicorn[minify]>=0.61; python_version >= \\"3.10\\"",
+    "gunicorn>=22",
+    "Django>=5",
+]
+"""
+
+    session = TomlSession(CONTENT)
+
+    with RunCache():
+        session.apply(UpgradeDependency("django-unicorn>=0.61"))
+
+        # Keeps the length of the list the same
+        session.apply(RemoveFromList(name="project.dependencies", value="Django>=4.2"))
+        session.apply(AppendToList(name="project.dependencies", value="gunicorn>=21"))
+
+        session.apply(UpgradeDependency("gunicorn>=22"))
+        session.apply(AddDependency("Django>=5"))
+
+    assert session.dumps().startswith(expected)
+
+
+def test_index_sees_changes_from_other_operations():
+    session = TomlSession(CONTENT)
+    session.apply(AddDependency("whitenoise"))
+    session.apply(AppendToList(name="project.dependencies", value="gunicorn"))
+
+    session.apply(RemoveDependency("gunicorn"))
+
+    assert "gunicorn" not in session.dumps().split("[project.optional-dependencies]")[0]
@@ -0,0 +1,133 @@
+import pytest
+import tomlkit
+
+from django_new.transformer.operations.python import AppendToList as PythonAppendToList
+from django_new.transformer.operations.toml import (
+    AddKeyValue,
+    AppendToList,
+    GetVariable,
+    RemoveFromList,
+    RemoveKey,
+    TomlSession,
+)
+from django_new.transformer.plan import apply_operations
+
+CONTENT = """[project]
+name = "example"
+dependencies = ["django"]
+
+[tool.example]
+debug = true
+"""
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    count = {"parse": 0}
+    original_parse = tomlkit.parse
+
+    def parse(content):
+        count["parse"] += 1
+
+        return original_parse(content)
+
+    monkeypatch.setattr("django_new.transformer.operations.toml.tomlkit.parse", parse)
+
+    return count
+
+
+def test_session_applies_operations(parse_count):
+    expected = """[project]
+name = "example"
+dependencies = ["whitenoise"]
+version = "1.0"
+
+[tool.example]
+"""
+
+    session = TomlSession(CONTENT)
+    session.apply(AppendToList(name="project.dependencies", value="whitenoise"))
+    session.apply(RemoveFromList(name="project.dependencies", value="django"))
+    session.apply(AddKeyValue(name="project", key="version", value="1.0"))
+    session.apply(RemoveKey(table_path="tool.example", key="debug"))
+
+    actual = session.dumps()
+
+    assert expected == actual
+    assert parse_count["parse"] == 1
+
+
+def test_session_get_variable():
+    session = TomlSession(CONTENT)
+    session.apply(AppendToList(name="project.dependencies", value="whitenoise"))
+
+    actual = session.apply(GetVariable(name="project.dependencies"))
+
+    assert actual == ["django", "whitenoise"]
+
+
+def test_session_unchanged():
+    session = TomlSession(CONTENT)
+
+    assert session.dumps() == CONTENT
+
+
+def test_session_save(fake_fs, temp_path):
+    path = temp_path / "pyproject.toml"
+    path.write_text(CONTENT)
+
+    with TomlSession.open(path) as session:
+        session.apply(AddKeyValue(name="project", key="version", value="1.0"))
+
+    assert 'version = "1.0"' in path.read_text()
+
+
+def test_session_save_unchanged(fake_fs, temp_path):
+    path = temp_path / "pyproject.toml"
+    path.write_text(CONTENT)
+    mtime = path.stat().st_mtime_ns
+
+    session = TomlSession.open(path)
+    session.apply(GetVariable(name="project.name"))
+
+    assert session.save() is False
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_session_not_saved_on_error(fake_fs, temp_path):
+    path = temp_path / "pyproject.toml"
+    path.write_text(CONTENT)
+
+    with pytest.raises(ValueError, match="Key 'missing' not found"), TomlSession.open(path) as session:
+        session.apply(AddKeyValue(name="project", key="version", value="1.0"))
+        session.apply(RemoveKey(table_path="project", key="missing"))
+
+    assert path.read_text() == CONTENT
+
+
+def test_session_save_without_path():
+    with pytest.raises(ValueError, match="The session was not opened from a file"):
+        TomlSession(CONTENT).save()
+
+
+def test_apply_operations_shares_session(parse_count):
+    operations = [
+        AppendToList(name="project.dependencies", value="whitenoise"),
+        AddKeyValue(name="project", key="version", value="1.0"),
+        RemoveKey(table_path="tool.example", key="debug"),
+    ]
+
+    actual = apply_operations(CONTENT, operations)
+
+    assert '"whitenoise"' in actual
+    assert 'version = "1.0"' in actual
+    assert "debug" not in actual
+    assert parse_count["parse"] == 1
+
+
+def test_apply_operations_mixed():
+    content = "INSTALLED_APPS = []\n"
+
+    actual = apply_operations(content, [PythonAppendToList(name="INSTALLED_APPS", value='"a"')])
+
+    assert actual == 'INSTALLED_APPS = ["a"]\n'
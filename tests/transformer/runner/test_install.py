@@ -36,7 +36,7 @@ dependencies = ["whitenoise==6.6.0"]
     expected = """
 INSTALLED_APPS = ["whitenoise.runserver_nostatic"]
 MIDDLEWARE = ["django.middleware.security.SecurityMiddleware", "whitenoise.middleware.WhiteNoiseMiddleware"]
-STORAGES = {'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'}}
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
 """
 
     actual = (temp_path / "settings.py").read_text()
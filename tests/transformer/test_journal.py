@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from django_new.transformer.journal import Journal
+
+
+def test_record(fake_fs, temp_path):
+    """Test that the original content is on disk after recording"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+
+    journal = Journal(root_path=temp_path)
+    journal.record(settings)
+
+    index = json.loads((temp_path / "django_new/.journal/index.json").read_text())
+
+    assert index == {"files": {"settings.py": "0.orig"}}
+    assert (temp_path / "django_new/.journal/0.orig").read_text() == "DEBUG = True"
+
+
+def test_record_only_stores_first_original(fake_fs, temp_path):
+    """Test that recording a file more than once keeps the first original"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+
+    journal = Journal(root_path=temp_path)
+    journal.record(settings)
+
+    settings.write_text("DEBUG = False")
+    journal.record(settings)
+
+    assert journal.paths == [settings.resolve()]
+    assert len(list((temp_path / "django_new/.journal").glob("*.orig"))) == 1
+
+    journal.replay()
+
+    assert settings.read_text() == "DEBUG = True"
+
+
+def test_replay(fake_fs, temp_path):
+    """Test that replay restores every file and removes the journal"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+    pyproject = temp_path / "pyproject.toml"
+    pyproject.write_text("[project]")
+
+    journal = Journal(root_path=temp_path)
+    journal.record(settings)
+    journal.record(pyproject)
+
+    settings.write_text("DEBUG = False")
+    pyproject.write_text("[tool]")
+
+    actual = journal.replay()
+
+    assert actual == [settings.resolve(), pyproject.resolve()]
+    assert settings.read_text() == "DEBUG = True"
+    assert pyproject.read_text() == "[project]"
+    assert not journal.exists()
+    assert not (temp_path / "django_new/.journal").exists()
+
+
+def test_replay_from_another_process(fake_fs, temp_path):
+    """Test that a journal left behind by a killed process can be replayed"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+
+    Journal(root_path=temp_path).record(settings)
+    settings.write_text("DEBUG = False")
+
+    actual = Journal(root_path=temp_path).replay()
+
+    assert actual == [settings.resolve()]
+    assert settings.read_text() == "DEBUG = True"
+
+
+def test_replay_file_outside_of_root(fake_fs, temp_path):
+    """Test that a file that is symlinked into the project from outside of it is restored"""
+
+    shared_settings = temp_path / "shared" / "settings.py"
+    shared_settings.parent.mkdir()
+    shared_settings.write_text("DEBUG = True")
+
+    root_path = temp_path / "project"
+    root_path.mkdir()
+    settings = root_path / "settings.py"
+    settings.symlink_to(shared_settings)
+
+    Journal(root_path=root_path).record(settings)
+    settings.write_text("DEBUG = False")
+
+    actual = Journal(root_path=root_path).replay()
+
+    assert actual == [shared_settings.resolve()]
+    assert shared_settings.read_text() == "DEBUG = True"
+
+
+def test_record_with_unfinished_journal_raises(fake_fs, temp_path):
+    """Test that a new session does not overwrite the journal of an unfinished one"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+
+    Journal(root_path=temp_path).record(settings)
+
+    with pytest.raises(RuntimeError, match="django-new --recover"):
+        Journal(root_path=temp_path).record(settings)
+
+
+def test_clear(fake_fs, temp_path):
+    """Test that clear removes the journal without restoring anything"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("DEBUG = True")
+
+    journal = Journal(root_path=temp_path)
+    journal.record(settings)
+    settings.write_text("DEBUG = False")
+
+    journal.clear()
+
+    assert settings.read_text() == "DEBUG = False"
+    assert journal.paths == []
+    assert not journal.exists()
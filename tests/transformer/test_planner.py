@@ -0,0 +1,176 @@
+import pytest
+
+from django_new.transformer import APPEND, ASSIGN, INSERT, Transformation
+from django_new.transformer.planner import Planner
+from django_new.transformer.transformations.whitenoise import WhitenoiseTransformation
+
+
+class BaseTransformation(Transformation):
+    name = "base"
+
+
+class RequiresBaseTransformation(Transformation):
+    name = "requires-base"
+    requires = (BaseTransformation,)
+
+
+class RequiresBothTransformation(Transformation):
+    name = "requires-both"
+    requires = (RequiresBaseTransformation, BaseTransformation)
+
+
+class ConflictingTransformation(Transformation):
+    name = "conflicting"
+    conflicts_with = (BaseTransformation,)
+
+
+class ConflictsWithUnknownTransformation(Transformation):
+    name = "conflicts-with-unknown"
+    conflicts_with = ("tests.transformations.missing",)
+
+
+class MiddlewareTransformation(Transformation):
+    name = "middleware"
+    settings = {"MIDDLEWARE": INSERT}  # noqa: RUF012
+
+
+class OtherMiddlewareTransformation(Transformation):
+    name = "other-middleware"
+    settings = {"MIDDLEWARE": INSERT}  # noqa: RUF012
+
+
+class RequiresMiddlewareTransformation(Transformation):
+    name = "requires-middleware"
+    requires = (MiddlewareTransformation,)
+    settings = {"MIDDLEWARE": INSERT}  # noqa: RUF012
+
+
+class InstalledAppsTransformation(Transformation):
+    name = "installed-apps"
+    settings = {"INSTALLED_APPS": APPEND, "STORAGES.default.BACKEND": ASSIGN}  # noqa: RUF012
+
+
+class OtherInstalledAppsTransformation(Transformation):
+    name = "other-installed-apps"
+    settings = {"INSTALLED_APPS": APPEND, "STORAGES.staticfiles.BACKEND": ASSIGN}  # noqa: RUF012
+
+
+class StoragesTransformation(Transformation):
+    name = "storages"
+    settings = {"STORAGES": ASSIGN}  # noqa: RUF012
+
+
+class FirstCircularTransformation(Transformation):
+    name = "first-circular"
+
+
+class SecondCircularTransformation(Transformation):
+    name = "second-circular"
+    requires = (FirstCircularTransformation,)
+
+
+FirstCircularTransformation.requires = (SecondCircularTransformation,)
+
+
+def test_resolve_keeps_requested_order():
+    expected = [MiddlewareTransformation, BaseTransformation]
+
+    actual = Planner(MiddlewareTransformation, BaseTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_names():
+    expected = [WhitenoiseTransformation]
+
+    actual = Planner("whitenoise").resolve()
+
+    assert expected == actual
+
+
+def test_resolve_adds_requirements_first():
+    expected = [BaseTransformation, RequiresBaseTransformation]
+
+    actual = Planner(RequiresBaseTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_moves_requirements_before_dependents():
+    expected = [BaseTransformation, RequiresBaseTransformation, RequiresBothTransformation]
+
+    actual = Planner(RequiresBothTransformation, BaseTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_removes_duplicates():
+    expected = [BaseTransformation]
+
+    actual = Planner(BaseTransformation, BaseTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_conflict():
+    with pytest.raises(ValueError, match="base conflicts with conflicting"):
+        Planner(BaseTransformation, ConflictingTransformation).resolve()
+
+
+def test_resolve_conflict_with_unknown_transformation():
+    expected = [ConflictsWithUnknownTransformation]
+
+    actual = Planner(ConflictsWithUnknownTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_shared_settings():
+    with pytest.raises(ValueError, match="middleware and other-middleware both modify MIDDLEWARE"):
+        Planner(MiddlewareTransformation, OtherMiddlewareTransformation).resolve()
+
+
+def test_resolve_shared_settings_appended():
+    expected = [InstalledAppsTransformation, OtherInstalledAppsTransformation]
+
+    actual = Planner(InstalledAppsTransformation, OtherInstalledAppsTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_shared_settings_different_keys():
+    expected = [InstalledAppsTransformation, WhitenoiseTransformation]
+
+    actual = Planner(InstalledAppsTransformation, WhitenoiseTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_shared_settings_assigned_key():
+    with pytest.raises(ValueError, match=r"whitenoise both modify STORAGES\.staticfiles\.BACKEND,"):
+        Planner(OtherInstalledAppsTransformation, WhitenoiseTransformation).resolve()
+
+
+def test_resolve_shared_settings_assigned_dict():
+    with pytest.raises(ValueError, match="installed-apps and storages both modify STORAGES,"):
+        Planner(InstalledAppsTransformation, StoragesTransformation).resolve()
+
+
+def test_resolve_shared_settings_with_requirement():
+    expected = [MiddlewareTransformation, RequiresMiddlewareTransformation]
+
+    actual = Planner(RequiresMiddlewareTransformation).resolve()
+
+    assert expected == actual
+
+
+def test_resolve_circular_requirement():
+    with pytest.raises(ValueError, match="Circular requirement: first-circular -> second-circular -> first-circular"):
+        Planner(FirstCircularTransformation).resolve()
+
+
+def test_get_name_defaults_to_module_name():
+    class UnnamedTransformation(Transformation):
+        pass
+
+    assert UnnamedTransformation.get_name() == "test_planner"
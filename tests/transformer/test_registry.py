@@ -0,0 +1,153 @@
+import json
+import os
+import sys
+
+import pytest
+
+from django_new.transformer import registry, resolve_transformation
+from django_new.transformer.registry import get_cache_path, get_distributions_key, get_entry_point, get_index
+from django_new.transformer.transformations.whitenoise import WhitenoiseTransformation
+from tests.transformations.dummy import DummyTransformation
+
+
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch, temp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(temp_path))
+
+    get_index.cache_clear()
+    resolve_transformation.cache_clear()
+
+    yield temp_path
+
+    get_index.cache_clear()
+    resolve_transformation.cache_clear()
+
+
+def test_get_index():
+    actual = get_index()
+
+    assert actual["whitenoise"] == "django_new.transformer.transformations.whitenoise:WhitenoiseTransformation"
+
+
+def test_get_index_writes_cache(cache_home):
+    get_index()
+
+    cache_path = cache_home / "django-new" / "transformations.json"
+    assert get_cache_path() == cache_path
+
+    cache = json.loads(cache_path.read_text())
+    assert cache["key"] == get_distributions_key()
+    assert "whitenoise" in cache["entry_points"]
+
+
+def test_get_index_does_not_leave_temporary_files(cache_home):
+    get_index()
+
+    assert [path.name for path in (cache_home / "django-new").iterdir()] == ["transformations.json"]
+
+
+def test_get_distributions_key(monkeypatch, temp_path):
+    site_packages = temp_path / "site-packages"
+    dist_info = site_packages / "example-1.0.dist-info"
+    dist_info.mkdir(parents=True)
+    os.utime(site_packages, ns=(1_000_000_000, 1_000_000_000))
+
+    monkeypatch.setattr(sys, "path", [str(site_packages), str(temp_path / "missing")])
+
+    key = get_distributions_key()
+
+    # Only the directories on `sys.path` are checked
+    os.utime(dist_info, ns=(2_000_000_000, 2_000_000_000))
+
+    assert get_distributions_key() == key
+
+    # Installing or removing a distribution changes the directory that contains it
+    os.utime(site_packages, ns=(3_000_000_000, 3_000_000_000))
+
+    assert get_distributions_key() != key
+
+
+def test_get_index_reads_cache(monkeypatch):
+    expected = {"dummy": "tests.transformations.dummy:DummyTransformation"}
+
+    cache_path = get_cache_path()
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text(json.dumps({"key": get_distributions_key(), "entry_points": expected}))
+
+    def fail(**kwargs):
+        raise AssertionError("Entry points should not be read")
+
+    monkeypatch.setattr(registry, "entry_points", fail)
+
+    actual = get_index()
+
+    assert expected == actual
+
+
+def test_get_index_ignores_stale_cache():
+    cache_path = get_cache_path()
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text(json.dumps({"key": "stale", "entry_points": {}}))
+
+    actual = get_index()
+
+    assert "whitenoise" in actual
+    assert json.loads(cache_path.read_text())["key"] == get_distributions_key()
+
+
+def test_get_index_ignores_invalid_cache():
+    cache_path = get_cache_path()
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text("not json")
+
+    actual = get_index()
+
+    assert "whitenoise" in actual
+
+
+def test_get_index_is_memoised(monkeypatch):
+    get_index()
+
+    def fail():
+        raise AssertionError("The index should only be built once")
+
+    monkeypatch.setattr(registry, "get_distributions_key", fail)
+
+    get_index()
+
+
+def test_get_entry_point_missing():
+    assert get_entry_point("missing") is None
+
+
+def test_resolve_transformation_entry_point():
+    assert resolve_transformation("whitenoise") is WhitenoiseTransformation
+
+
+def test_resolve_transformation_third_party_entry_point(monkeypatch):
+    monkeypatch.setattr(
+        registry, "get_index", lambda: {"third-party": "tests.transformations.dummy:DummyTransformation"}
+    )
+
+    assert resolve_transformation("third-party") is DummyTransformation
+
+
+def test_resolve_transformation_entry_point_not_a_transformation(monkeypatch):
+    monkeypatch.setattr(registry, "get_index", lambda: {"invalid": "pathlib:Path"})
+
+    with pytest.raises(ValueError, match="Entry point 'invalid' is not a Transformation class"):
+        resolve_transformation("invalid")
+
+
+def test_resolve_transformation_entry_point_missing_attribute(monkeypatch):
+    monkeypatch.setattr(registry, "get_index", lambda: {"invalid": "tests.transformations.dummy:Missing"})
+
+    with pytest.raises(ImportError, match="Could not load transformation entry point 'invalid'"):
+        resolve_transformation("invalid")
+
+
+def test_resolve_transformation_is_memoised():
+    resolve_transformation("tests.transformations.dummy")
+    resolve_transformation("tests.transformations.dummy")
+
+    assert resolve_transformation.cache_info().hits == 1
@@ -4,6 +4,8 @@ import pytest
 
 from django_new.transformer import Runner, Transformation
 from django_new.transformer.operations.python import AppendToList, RemoveFromList
+from django_new.transformer.operations.toml import AppendToList as TomlAppendToList
+from django_new.transformer.plan import OperationError
 
 
 class FakeTransformation(Transformation):
@@ -71,6 +73,66 @@ def test_install_with_error(fake_fs, temp_path):
     assert original_content == settings.read_text()
 
 
+class MultipleFilesTransformation(Transformation):
+    """Test transformation that modifies independent files"""
+
+    def forwards(self):
+        self.modify_file(path="settings.py", operation=AppendToList(name="INSTALLED_APPS", value='"myapp"'))
+        self.modify_file(path="pyproject.toml", operation=TomlAppendToList(name="project.dependencies", value="a"))
+        self.modify_file(path="settings.py", operation=AppendToList(name="INSTALLED_APPS", value='"otherapp"'))
+
+
+def write_multiple_files(temp_path: Path) -> None:
+    (temp_path / "settings.py").write_text("INSTALLED_APPS = []\n")
+    (temp_path / "pyproject.toml").write_text("[project]\ndependencies = []\n")
+
+
+def test_install_multiple_files(fake_fs, temp_path):
+    """Test that the operations for each file are applied in order"""
+
+    write_multiple_files(temp_path)
+
+    runner = Runner(path=temp_path)
+    actual = runner.install(MultipleFilesTransformation(root_path=temp_path))
+
+    assert actual is True
+    assert (temp_path / "settings.py").read_text() == 'INSTALLED_APPS = ["myapp", "otherapp"]\n'
+    assert (temp_path / "pyproject.toml").read_text() == '[project]\ndependencies = ["a"]\n'
+    assert not (temp_path / "django_new" / ".journal").exists()
+
+
+def test_install_failing_operation(fake_fs, temp_path):
+    """Test that an operation that fails when the plan is applied says which operation and file failed"""
+
+    write_multiple_files(temp_path)
+    (temp_path / "settings.py").write_text("DEBUG = True\n")
+
+    runner = Runner(path=temp_path)
+
+    with pytest.raises(OperationError, match=r"Append \"myapp\" to INSTALLED_APPS failed for .*settings\.py") as e:
+        runner.install(MultipleFilesTransformation(root_path=temp_path))
+
+    assert isinstance(e.value.error, ValueError)
+    assert (temp_path / "settings.py").read_text() == "DEBUG = True\n"
+    assert (temp_path / "pyproject.toml").read_text() == "[project]\ndependencies = []\n"
+
+
+def test_install_writes_nothing_when_a_transformation_fails(fake_fs, temp_path):
+    """Test that no file is written unless every transformation succeeds"""
+
+    write_multiple_files(temp_path)
+
+    runner = Runner(path=temp_path)
+
+    with pytest.raises(ValueError, match="Intentional failure"):
+        runner.install(
+            MultipleFilesTransformation(root_path=temp_path), FakeTransformation(root_path=temp_path, should_fail=True)
+        )
+
+    assert (temp_path / "settings.py").read_text() == "INSTALLED_APPS = []\n"
+    assert (temp_path / "pyproject.toml").read_text() == "[project]\ndependencies = []\n"
+
+
 def test_install_dry_run(fake_fs, temp_path):
     """Test that install in dry-run mode returns operations"""
 
@@ -93,6 +155,66 @@ def test_install_dry_run(fake_fs, temp_path):
     assert original_content == settings.read_text()
 
 
+class ReadingTransformation(Transformation):
+    """Test transformation that depends on the changes of a previous transformation"""
+
+    def forwards(self):
+        installed_apps = self.get_variable("settings.py", "INSTALLED_APPS")
+
+        if "myapp" not in installed_apps:
+            raise ValueError("myapp is not installed")
+
+        operation = AppendToList(name="INSTALLED_APPS", value='"otherapp"')
+        self.modify_file(path="settings.py", operation=operation)
+
+
+def test_install_dry_run_multiple_transformations(fake_fs, temp_path):
+    """Test that dry-run mode chains the changes of every transformation in memory"""
+
+    settings = temp_path / "settings.py"
+    original_content = "INSTALLED_APPS = []\n"
+    settings.write_text(original_content)
+
+    runner = Runner(path=temp_path, dry_run=True)
+
+    actual = runner.install(FakeTransformation(root_path=temp_path), ReadingTransformation(root_path=temp_path))
+
+    assert len(actual) == 2
+    assert runner.plan.read_text(settings.resolve()) == 'INSTALLED_APPS = ["myapp", "otherapp"]\n'
+
+    # File should not be touched
+    assert original_content == settings.read_text()
+    assert not (temp_path / "django_new").exists()
+
+
+def test_get_diff(fake_fs, temp_path):
+    """Test that dry-run mode produces a unified diff"""
+
+    expected = """--- a/settings.py
++++ b/settings.py
+@@ -1 +1 @@
+-INSTALLED_APPS = []
++INSTALLED_APPS = ["myapp"]
+"""
+
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    runner = Runner(path=temp_path, dry_run=True)
+    runner.install(FakeTransformation(root_path=temp_path))
+
+    actual = runner.get_diff()
+
+    assert expected == actual
+
+
+def test_get_diff_without_dry_run_raises(fake_fs, temp_path):
+    runner = Runner(path=temp_path, dry_run=False)
+
+    with pytest.raises(ValueError, match="only available in dry-run mode"):
+        runner.get_diff()
+
+
 def test_uninstall(fake_fs, temp_path):
     """Test uninstalling a single transformation"""
 
@@ -0,0 +1,133 @@
+import pytest
+
+from django_new.transformer import Runner, Transformation
+from django_new.transformer.operations.python import AppendToList, MergeDict
+from django_new.transformer.settings_package import SettingsPackage
+
+
+class PerformanceTransformation(Transformation):
+    """Adds production-only settings"""
+
+    def forwards(self):
+        self.modify_settings(AppendToList(name="INSTALLED_APPS", value='"perf"'))
+        self.modify_settings(MergeDict(name="DATABASES", value={"default": {"CONN_MAX_AGE": 60}}), "production")
+
+    def backwards(self):
+        pass
+
+
+@pytest.fixture
+def settings_path(temp_path):
+    settings_path = temp_path / "config" / "settings"
+    settings_path.mkdir(parents=True)
+
+    (settings_path / "__init__.py").write_text("")
+    (settings_path / "base.py").write_text("""
+INSTALLED_APPS = ["django.contrib.admin"]
+DEBUG = False
+DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3"}}
+""")
+    (settings_path / "prod.py").write_text("""
+from .base import *
+
+DATABASES = {"default": {"ENGINE": "django.db.backends.postgresql"}}
+""")
+    (settings_path / "local.py").write_text("""
+from config.settings.prod import *
+
+DEBUG = True
+""")
+
+    return settings_path
+
+
+def test_find_package(fake_fs, temp_path, settings_path):
+    package = SettingsPackage.find(temp_path, settings_path / "base.py")
+
+    assert package.path == settings_path
+    assert set(package.modules) == {"base", "prod", "local"}
+
+
+def test_find_package_single_file(fake_fs, temp_path):
+    (temp_path / "settings.py").write_text("DEBUG = True\n")
+
+    assert SettingsPackage.find(temp_path, temp_path / "settings.py") is None
+
+
+def test_index(fake_fs, temp_path, settings_path):
+    package = SettingsPackage(temp_path, settings_path)
+
+    assert package.names["base"] == {"INSTALLED_APPS", "DEBUG", "DATABASES"}
+    assert package.imports == {"base": [], "prod": ["base"], "local": ["prod"]}
+
+
+def test_get_path_alias(fake_fs, temp_path, settings_path):
+    package = SettingsPackage(temp_path, settings_path)
+
+    assert package.get_path("production") == settings_path / "prod.py"
+    assert package.get_path("local") == settings_path / "local.py"
+
+
+def test_get_path_missing_environment(fake_fs, temp_path, settings_path):
+    package = SettingsPackage(temp_path, settings_path)
+
+    with pytest.raises(FileNotFoundError, match="Settings for environment 'test' not found"):
+        package.get_path("test")
+
+
+def test_get_chain(fake_fs, temp_path, settings_path):
+    package = SettingsPackage(temp_path, settings_path)
+
+    assert package.get_chain("local") == ["local", "prod", "base"]
+
+
+def test_get_chain_circular_imports(fake_fs, temp_path, settings_path):
+    (settings_path / "base.py").write_text("from .local import *\n")
+
+    package = SettingsPackage(temp_path, settings_path)
+
+    assert package.get_chain("local") == ["local", "prod", "base"]
+
+
+def test_find_definition(fake_fs, temp_path, settings_path):
+    package = SettingsPackage(temp_path, settings_path)
+
+    assert package.find_definition("local", "DEBUG") == settings_path / "local.py"
+    assert package.find_definition("local", "DATABASES") == settings_path / "prod.py"
+    assert package.find_definition("local", "INSTALLED_APPS") == settings_path / "base.py"
+    assert package.find_definition("local", "MISSING") is None
+
+
+def test_get_setting(fake_fs, temp_path, settings_path):
+    transformation = PerformanceTransformation(root_path=temp_path)
+
+    assert transformation.get_setting("DATABASES", "local") == {"default": {"ENGINE": "django.db.backends.postgresql"}}
+    assert transformation.get_setting("DATABASES") == {"default": {"ENGINE": "django.db.backends.sqlite3"}}
+
+
+def test_get_setting_missing(fake_fs, temp_path, settings_path):
+    transformation = PerformanceTransformation(root_path=temp_path)
+
+    with pytest.raises(ValueError, match="Setting 'MISSING' not found for environment 'production'"):
+        transformation.get_setting("MISSING", "production")
+
+
+def test_get_settings_file_environment_single_file(fake_fs, temp_path):
+    (temp_path / "settings.py").write_text("INSTALLED_APPS = []\n")
+
+    transformation = PerformanceTransformation(root_path=temp_path)
+
+    assert transformation.get_settings_file("production") == temp_path / "settings.py"
+
+
+def test_modify_settings_across_modules_in_one_run(fake_fs, temp_path, settings_path):
+    runner = Runner(path=temp_path)
+
+    runner.install(PerformanceTransformation(root_path=temp_path))
+
+    assert '"perf"' in (settings_path / "base.py").read_text()
+    assert (
+        'DATABASES = {"default": {"ENGINE": "django.db.backends.postgresql", "CONN_MAX_AGE": 60}}'
+        in (settings_path / "prod.py").read_text()
+    )
+    assert "CONN_MAX_AGE" not in (settings_path / "base.py").read_text()
@@ -0,0 +1,177 @@
+import json
+
+from django_new.transformer import Runner, Transformation
+from django_new.transformer.operations.python import AppendToList, RemoveFromList
+from django_new.transformer.state import State
+
+
+class MyAppTransformation(Transformation):
+    name = "myapp"
+
+    def __init__(self, root_path):
+        super().__init__(root_path)
+        self.forwards_called = False
+
+    def forwards(self):
+        self.forwards_called = True
+
+        self.modify_file("settings.py", AppendToList(name="INSTALLED_APPS", value='"myapp"'))
+
+    def backwards(self):
+        self.modify_file("settings.py", RemoveFromList(name="INSTALLED_APPS", value='"myapp"'))
+
+
+class MyAppVersionTwoTransformation(MyAppTransformation):
+    version = "2"
+
+
+def test_record(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    state = json.loads((temp_path / "django_new" / "state.json").read_text())
+
+    assert state["transformations"]["myapp"]["version"] == "1"
+    assert list(state["transformations"]["myapp"]["files"]) == ["settings.py"]
+
+
+def test_record_data(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    class MyAppDataTransformation(MyAppTransformation):
+        def get_data(self):
+            return {"apps": ["myapp"]}
+
+        def backwards(self):
+            assert self.data == {"apps": ["myapp"]}
+
+            super().backwards()
+
+    Runner(path=temp_path).install(MyAppDataTransformation(root_path=temp_path))
+
+    state = json.loads((temp_path / "django_new" / "state.json").read_text())
+
+    assert state["transformations"]["myapp"]["data"] == {"apps": ["myapp"]}
+
+    Runner(path=temp_path).uninstall(MyAppDataTransformation(root_path=temp_path))
+
+    assert settings.read_text() == "INSTALLED_APPS = []\n"
+
+
+def test_record_without_data(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    state = json.loads((temp_path / "django_new" / "state.json").read_text())
+
+    assert "data" not in state["transformations"]["myapp"]
+
+
+def test_is_applied(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    assert State(temp_path).is_applied(MyAppTransformation(root_path=temp_path))
+
+
+def test_is_applied_not_recorded(fake_fs, temp_path):
+    assert not State(temp_path).is_applied(MyAppTransformation(root_path=temp_path))
+
+
+def test_is_applied_file_changed(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    settings.write_text(settings.read_text() + "DEBUG = True\n")
+
+    assert not State(temp_path).is_applied(MyAppTransformation(root_path=temp_path))
+
+
+def test_is_applied_file_removed(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    settings.unlink()
+
+    assert not State(temp_path).is_applied(MyAppTransformation(root_path=temp_path))
+
+
+def test_is_applied_different_version(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    assert not State(temp_path).is_applied(MyAppVersionTwoTransformation(root_path=temp_path))
+
+
+def test_is_applied_invalid_state_file(fake_fs, temp_path):
+    (temp_path / "django_new").mkdir()
+    (temp_path / "django_new" / "state.json").write_text("not json")
+
+    assert not State(temp_path).is_applied(MyAppTransformation(root_path=temp_path))
+
+
+def test_install_skips_applied_transformation(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    runner = Runner(path=temp_path)
+    transformation = MyAppTransformation(root_path=temp_path)
+    runner.install(transformation)
+
+    assert not transformation.forwards_called
+    assert runner.skipped == [transformation]
+    assert settings.read_text() == 'INSTALLED_APPS = ["myapp"]\n'
+
+
+def test_install_reapplies_when_file_changed(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    runner = Runner(path=temp_path)
+    transformation = MyAppTransformation(root_path=temp_path)
+    runner.install(transformation)
+
+    assert transformation.forwards_called
+    assert runner.skipped == []
+    assert settings.read_text() == 'INSTALLED_APPS = ["myapp"]\n'
+
+
+def test_uninstall_removes_transformation(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path).install(MyAppTransformation(root_path=temp_path))
+    Runner(path=temp_path).uninstall(MyAppTransformation(root_path=temp_path))
+
+    state = json.loads((temp_path / "django_new" / "state.json").read_text())
+
+    assert state["transformations"] == {}
+    assert settings.read_text() == "INSTALLED_APPS = []\n"
+
+
+def test_dry_run_does_not_record(fake_fs, temp_path):
+    settings = temp_path / "settings.py"
+    settings.write_text("INSTALLED_APPS = []\n")
+
+    Runner(path=temp_path, dry_run=True).install(MyAppTransformation(root_path=temp_path))
+
+    assert not (temp_path / "django_new" / "state.json").exists()
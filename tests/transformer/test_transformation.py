@@ -1,7 +1,7 @@
 import pytest
 
 from django_new.transformer import Transformation
-from django_new.transformer.operations.python import AppendToList
+from django_new.transformer.operations.python import AppendToList, AssignVariable, Expression
 from django_new.transformer.operations.toml import AddKeyValue
 
 
@@ -23,7 +23,7 @@ def test_transformation_init(fake_fs, temp_path):
     transformation = ConcreteTransformation(root_path=temp_path)
 
     assert transformation.root_path == temp_path
-    assert transformation._changes == []
+    assert transformation.journal.paths == []
 
 
 def test_assert_path_is_valid_with_nonexistent_file(fake_fs, temp_path):
@@ -116,8 +116,8 @@ def test_rollback_changes_multiple_files(fake_fs, temp_path):
     assert file2.read_text() == original2
 
 
-def test_rollback_clears_changes_list(fake_fs, temp_path):
-    """Test that rollback clears the changes list"""
+def test_rollback_clears_journal(fake_fs, temp_path):
+    """Test that rollback clears the journal"""
     transformation = ConcreteTransformation(root_path=temp_path)
 
     test_file = temp_path / "test.py"
@@ -125,11 +125,13 @@ def test_rollback_clears_changes_list(fake_fs, temp_path):
 
     transformation.modify_file(path=test_file, operation=AppendToList(name="TEST_LIST", value='"x"'))
 
-    assert len(transformation._changes) == 1
+    assert len(transformation.journal.paths) == 1
+    assert transformation.journal.exists()
 
     transformation.rollback_changes()
 
-    assert len(transformation._changes) == 0
+    assert len(transformation.journal.paths) == 0
+    assert not transformation.journal.exists()
 
 
 def test_modify_file_with_relative_path(fake_fs, temp_path):
@@ -146,3 +148,78 @@ def test_modify_file_with_relative_path(fake_fs, temp_path):
     # Verify it was modified
     content = test_file.read_text()
     assert '"item"' in content
+
+
+def test_modify_file_without_changes_does_not_write(fake_fs, temp_path):
+    """Test modify_file skips the write when the operation does not change the content"""
+    transformation = ConcreteTransformation(root_path=temp_path)
+
+    test_file = temp_path / "test.py"
+    test_file.write_text("STORAGES = {}\n")
+    mtime = test_file.stat().st_mtime_ns
+
+    transformation.modify_file(path="test.py", operation=AssignVariable(name="STORAGES", value={}))
+
+    assert test_file.read_text() == "STORAGES = {}\n"
+    assert test_file.stat().st_mtime_ns == mtime
+    assert transformation.journal.paths == []
+
+
+def test_commit_changes_removes_journal(fake_fs, temp_path):
+    """Test that commit_changes keeps the modifications and removes the journal"""
+    transformation = ConcreteTransformation(root_path=temp_path)
+
+    test_file = temp_path / "test.py"
+    test_file.write_text("TEST_LIST = []")
+
+    transformation.modify_file(path=test_file, operation=AppendToList(name="TEST_LIST", value='"x"'))
+    transformation.commit_changes()
+
+    assert test_file.read_text() == 'TEST_LIST = ["x"]'
+    assert not transformation.journal.exists()
+    assert not (temp_path / "django_new" / ".journal").exists()
+
+
+def test_get_variable_returns_python_value(fake_fs, temp_path):
+    """Test get_variable returns literal Python values instead of code"""
+    transformation = ConcreteTransformation(root_path=temp_path)
+
+    (temp_path / "settings.py").write_text('INSTALLED_APPS = ["django.contrib.admin"]\n')
+
+    actual = transformation.get_variable("settings.py", "INSTALLED_APPS")
+
+    assert actual == ["django.contrib.admin"]
+
+
+def test_get_variable_returns_expression(fake_fs, temp_path):
+    """Test get_variable returns an Expression for values that are not literals"""
+    transformation = ConcreteTransformation(root_path=temp_path)
+
+    (temp_path / "settings.py").write_text('STATIC_ROOT = BASE_DIR / "static"\n')
+
+    actual = transformation.get_variable("settings.py", "STATIC_ROOT")
+
+    assert isinstance(actual, Expression)
+    assert actual.code == 'BASE_DIR / "static"'
+
+
+def test_get_settings_file_prefers_file_with_installed_apps(fake_fs, temp_path):
+    """Test get_settings_file skips candidates that do not configure INSTALLED_APPS"""
+    transformation = ConcreteTransformation(root_path=temp_path)
+
+    (temp_path / "settings").mkdir()
+    (temp_path / "settings" / "base.py").write_text("DEBUG = True\n")
+    (temp_path / "settings.py").write_text("INSTALLED_APPS = []\n")
+
+    assert transformation.get_settings_file() == temp_path / "settings.py"
+
+
+def test_get_settings_file_falls_back_to_first_candidate(fake_fs, temp_path):
+    """Test get_settings_file returns the first existing candidate when none configure INSTALLED_APPS"""
+    transformation = ConcreteTransformation(root_path=temp_path)
+
+    (temp_path / "settings").mkdir()
+    (temp_path / "settings" / "base.py").write_text("DEBUG = True\n")
+    (temp_path / "settings.py").write_text("DEBUG = False\n")
+
+    assert transformation.get_settings_file() == temp_path / "settings" / "base.py"
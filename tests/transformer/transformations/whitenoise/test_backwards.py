@@ -1,3 +1,4 @@
+from django_new.transformer import Runner
 from django_new.transformer.transformations import WhitenoiseTransformation
 
 
@@ -48,3 +49,59 @@ STORAGES = {}
     # The original apps and middleware should still be there
     assert '"django.contrib.admin"' in settings_content
     assert '"django.middleware.security.SecurityMiddleware"' in settings_content
+
+
+def test_whitenoise_backwards_keeps_other_storages(fake_fs, temp_path):
+    """Test that backwards only removes the static files storage"""
+    (temp_path / "pyproject.toml").write_text("""[project]
+name = "myproject"
+dependencies = ["django>=4.2"]
+""")
+    original_settings = """INSTALLED_APPS = ["django.contrib.admin"]
+MIDDLEWARE = ["django.middleware.security.SecurityMiddleware"]
+STORAGES = {
+    "default": {
+        "BACKEND": "storages.backends.s3.S3Storage",
+    },
+}
+"""
+    (temp_path / "settings.py").write_text(original_settings)
+
+    transformation = WhitenoiseTransformation(root_path=temp_path)
+    transformation.forwards()
+
+    assert (
+        '"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}'
+        in (temp_path / "settings.py").read_text()
+    )
+
+    transformation.backwards()
+
+    assert (temp_path / "settings.py").read_text() == original_settings
+
+
+def test_whitenoise_backwards_in_later_run_restores_storage(fake_fs, temp_path):
+    """Test that uninstalling restores the static files storage that was replaced when whitenoise was installed"""
+    (temp_path / "pyproject.toml").write_text("""[project]
+name = "myproject"
+dependencies = ["django>=4.2"]
+""")
+    original_settings = """INSTALLED_APPS = ["django.contrib.admin"]
+MIDDLEWARE = ["django.middleware.security.SecurityMiddleware"]
+STORAGES = {
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage",
+        "OPTIONS": {"manifest_strict": False},
+    },
+}
+"""
+    (temp_path / "settings.py").write_text(original_settings)
+
+    Runner(path=temp_path).install(WhitenoiseTransformation(root_path=temp_path))
+
+    assert "whitenoise.storage.CompressedManifestStaticFilesStorage" in (temp_path / "settings.py").read_text()
+
+    # A new transformation, like in a later run of `django-new`
+    Runner(path=temp_path).uninstall(WhitenoiseTransformation(root_path=temp_path))
+
+    assert (temp_path / "settings.py").read_text() == original_settings
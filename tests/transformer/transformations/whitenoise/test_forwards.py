@@ -121,6 +121,25 @@ STORAGES = {}
         transformation.forwards()
 
 
+def test_whitenoise_raises_error_if_already_in_dependencies_with_extras(fake_fs, temp_path):
+    """Test that the package name is matched after normalising it"""
+    (temp_path / "pyproject.toml").write_text("""
+[project]
+dependencies = ["django>=4.2", "WhiteNoise[brotli]>=6.0; python_version >= '3.10'"]
+""")
+
+    (temp_path / "settings.py").write_text("""
+INSTALLED_APPS = ["django.contrib.admin"]
+MIDDLEWARE = ["django.middleware.security.SecurityMiddleware"]
+STORAGES = {}
+""")
+
+    transformation = WhitenoiseTransformation(root_path=temp_path)
+
+    with pytest.raises(AssertionError, match="Whitenoise already installed"):
+        transformation.forwards()
+
+
 def test_whitenoise_complete_transformation(fake_fs, temp_path):
     """Test complete whitenoise transformation from minimal setup"""
     # Create minimal Django project files
@@ -186,3 +205,41 @@ STORAGES = {}
 
     # All should be consistent (either all True or rollback worked)
     assert has_whitenoise == has_runserver == has_middleware
+
+
+def test_whitenoise_raises_error_if_already_in_installed_apps(fake_fs, temp_path):
+    """Test that an error is raised if whitenoise is already in INSTALLED_APPS"""
+    (temp_path / "pyproject.toml").write_text("""
+[project]
+dependencies = ["django>=4.2"]
+""")
+
+    (temp_path / "settings.py").write_text("""
+INSTALLED_APPS = ["django.contrib.admin", "whitenoise.runserver_nostatic"]
+MIDDLEWARE = ["django.middleware.security.SecurityMiddleware"]
+STORAGES = {}
+""")
+
+    transformation = WhitenoiseTransformation(root_path=temp_path)
+
+    with pytest.raises(AssertionError, match=r"whitenoise.runserver_nostatic already installed"):
+        transformation.forwards()
+
+
+def test_whitenoise_raises_error_if_already_in_storages(fake_fs, temp_path):
+    """Test that an error is raised if whitenoise is already the static files storage"""
+    (temp_path / "pyproject.toml").write_text("""
+[project]
+dependencies = ["django>=4.2"]
+""")
+
+    (temp_path / "settings.py").write_text("""
+INSTALLED_APPS = ["django.contrib.admin"]
+MIDDLEWARE = ["django.middleware.security.SecurityMiddleware"]
+STORAGES = {"staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+""")
+
+    transformation = WhitenoiseTransformation(root_path=temp_path)
+
+    with pytest.raises(AssertionError, match=r"CompressedManifestStaticFilesStorage already installed"):
+        transformation.forwards()
@@ -0,0 +1,101 @@
+from io import StringIO
+
+from rich.console import Console
+
+from django_new.summarizer import get_tree
+from django_new.walker import build_tree, build_tree_from_paths, render_plain
+
+
+def render_rich(root) -> str:
+    console = Console(file=StringIO(), width=200, color_system=None)
+    console.print(get_tree(root))
+
+    return console.file.getvalue()
+
+
+def test_build_tree_skips_ignored(fake_fs, temp_path):
+    (temp_path / ".gitignore").write_text("*.sqlite3\nlocal/\n")
+    (temp_path / "db.sqlite3").write_text("")
+    (temp_path / "local").mkdir()
+    (temp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (temp_path / "app" / "__pycache__").mkdir(parents=True)
+    (temp_path / "app" / "__init__.py").write_text("")
+    (temp_path / "manage.py").write_text("")
+
+    expected = f"""📂 {temp_path}
+├── 📂 app
+│   └── __init__.py
+└── manage.py
+"""
+
+    actual = render_plain(build_tree(temp_path))
+
+    assert expected == actual
+
+
+def test_build_tree_max_depth(fake_fs, temp_path):
+    (temp_path / "a" / "b" / "c").mkdir(parents=True)
+    (temp_path / "a" / "b" / "c" / "deep.py").write_text("")
+
+    actual = render_plain(build_tree(temp_path, max_depth=2))
+
+    assert "📂 b" in actual
+    assert "📂 c" not in actual
+
+
+def test_build_tree_max_entries(fake_fs, temp_path):
+    (temp_path / "app").mkdir()
+
+    for idx in range(5):
+        (temp_path / "app" / f"{idx}.py").write_text("")
+
+    (temp_path / "manage.py").write_text("")
+
+    expected = f"""📂 {temp_path}
+├── 📂 app
+│   ├── 0.py
+│   ├── 1.py
+│   └── … 3 more
+└── … 1 more
+"""
+
+    actual = render_plain(build_tree(temp_path, max_entries=3))
+
+    assert expected == actual
+
+
+def test_plain_and_rich_renderers_match(fake_fs, temp_path):
+    (temp_path / "config" / "settings").mkdir(parents=True)
+    (temp_path / "config" / "settings" / "base.py").write_text("")
+    (temp_path / "config" / "urls.py").write_text("")
+    (temp_path / "app" / "templates").mkdir(parents=True)
+    (temp_path / "app" / "models.py").write_text("")
+    (temp_path / "manage.py").write_text("")
+
+    root = build_tree(temp_path, max_entries=6)
+
+    assert render_plain(root) == render_rich(root)
+
+
+def test_build_tree_from_paths(fake_fs, temp_path):
+    (temp_path / "static" / "css").mkdir(parents=True)
+    (temp_path / "config").mkdir()
+
+    paths = [
+        temp_path / "config" / "settings.py",
+        temp_path / "static" / "css",
+        temp_path / "README.md",
+        temp_path.parent / "outside.py",
+    ]
+
+    expected = f"""📂 {temp_path}
+├── 📂 config
+│   └── settings.py
+├── 📂 static
+│   └── 📂 css
+└── README.md
+"""
+
+    actual = render_plain(build_tree_from_paths(temp_path, paths))
+
+    assert expected == actual
@@ -0,0 +1,65 @@
+import pytest
+
+from django_new.walker import IgnoreRules, scan_directory
+
+
+@pytest.mark.parametrize(
+    ("patterns", "path", "is_dir", "expected"),
+    [
+        (["*.log"], "debug.log", False, True),
+        (["*.log"], "logs/debug.log", False, True),
+        (["*.log"], "debug.txt", False, False),
+        (["build/"], "build", True, True),
+        (["build/"], "build", False, False),
+        (["/build"], "build", True, True),
+        (["/build"], "app/build", True, False),
+        (["docs/*.md"], "docs/index.md", False, True),
+        (["docs/*.md"], "docs/api/index.md", False, False),
+        (["**/migrations"], "app/migrations", True, True),
+        (["**/migrations"], "migrations", True, True),
+        (["docs/**"], "docs/api/index.md", False, True),
+        (["a/**/b"], "a/x/y/b", True, True),
+        (["debug?.log"], "debug1.log", False, True),
+        (["debug[0-9].log"], "debug1.log", False, True),
+        (["debug[!0-9].log"], "debug1.log", False, False),
+        (["*.log", "!keep.log"], "keep.log", False, False),
+        (["!keep.log", "*.log"], "keep.log", False, True),
+        (["# comment", ""], "# comment", False, False),
+        (["\\#file"], "#file", False, True),
+    ],
+)
+def test_is_ignored(patterns, path, is_dir, expected):
+    rules = IgnoreRules.from_patterns(patterns)
+
+    assert rules.is_ignored(path, is_dir) is expected
+
+
+def test_nested_gitignore_is_relative_to_its_directory(fake_fs, temp_path):
+    (temp_path / "app").mkdir()
+    (temp_path / "app" / ".gitignore").write_text("/local.py\n")
+
+    rules = IgnoreRules().add_gitignore(temp_path / "app", base="app")
+
+    assert rules.is_ignored("app/local.py", False)
+    assert not rules.is_ignored("app/sub/local.py", False)
+    assert not rules.is_ignored("local.py", False)
+
+
+def test_add_gitignore_missing(fake_fs, temp_path):
+    rules = IgnoreRules()
+
+    assert rules.add_gitignore(temp_path, base="") is rules
+
+
+def test_scan_directory(fake_fs, temp_path):
+    (temp_path / "b.py").write_text("")
+    (temp_path / "A.py").write_text("")
+    (temp_path / "debug.log").write_text("")
+    (temp_path / ".env").write_text("")
+    (temp_path / "z").mkdir()
+
+    rules = IgnoreRules.from_patterns(["*.log"])
+
+    actual = [entry.name for entry in scan_directory(temp_path, rules)]
+
+    assert actual == ["z", "A.py", "b.py"]